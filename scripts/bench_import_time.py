@@ -0,0 +1,92 @@
+"""Benchmark package import time (the cold-start cost of a stdio session).
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters
+and reports the median cumulative import time of each module, plus the
+slowest modules it pulls in.  ``--max-ms`` turns it into a regression
+check: the script exits non-zero when a module's median exceeds the budget.
+
+Usage::
+
+    python scripts/bench_import_time.py [--runs 5] [--top 15] [--max-ms 0] \\
+        [staged_rag.server staged_rag.service ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+_SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+_DEFAULT_MODULES = ("staged_rag.server", "staged_rag.service", "staged_rag.core")
+# Optional dependencies that must only be imported on first use.
+_LAZY_MODULES = ("google.genai", "sentence_transformers", "openai", "ollama", "staged_rag.core.kb_manager")
+
+
+def _env() -> dict[str, str]:
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_SRC, os.environ.get("PYTHONPATH")])))
+
+
+def _import_profile(module: str) -> dict[str, int]:
+    """Return ``{imported module: cumulative µs}`` for one cold import of *module*."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_env(),
+        check=True,
+    )
+    profile: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        if name == "site":
+            # Interpreter start-up (site, .pth hooks) precedes the import.
+            profile.clear()
+        elif cumulative.strip().isdigit():
+            profile[name] = int(cumulative)
+    return profile
+
+
+def _loaded_lazy_modules(module: str) -> list[str]:
+    code = f"import sys, {module}; print(' '.join(m for m in {_LAZY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=_env(), check=True)
+    return proc.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(_DEFAULT_MODULES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imported modules to list")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="fail if a median exceeds this (0 = off)")
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.modules:
+        _import_profile(module)  # warm the bytecode cache
+        runs = [_import_profile(module) for _ in range(max(1, args.runs))]
+        totals = [run.get(module, 0) / 1000 for run in runs]
+        median = statistics.median(totals)
+        print(f"{module}: median {median:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}, {len(runs)} runs)")
+
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+        for name, cumulative in [item for item in slowest if item[0] != module][: args.top]:
+            print(f"  {cumulative / 1000:>9.1f} ms  {name}")
+        eager = _loaded_lazy_modules(module)
+        if eager:
+            print(f"  eagerly imported optional modules: {', '.join(eager)}")
+        print()
+        if args.max_ms and median > args.max_ms:
+            over_budget = True
+
+    if over_budget:
+        print(f"Import time budget of {args.max_ms:.0f} ms exceeded", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark DocumentStore save/load time and file size per storage codec.
+
+Usage::
+
+    python scripts/bench_store_codec.py [--docs 50000] [--words 150]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from staged_rag.core import codecs
+from staged_rag.core.document_store import DocumentStore
+
+_WORDS = (
+    "retrieval staged summary vector index document chunk embedding keyword "
+    "collection query agent knowledge base search hybrid score token model "
+    "provider cache latency batch ingest manifest watcher semantic cosine"
+).split()
+
+
+def _make_documents(count: int, words: int) -> dict[str, dict]:
+    rng = random.Random(42)
+    documents: dict[str, dict] = {}
+    for i in range(count):
+        text = " ".join(rng.choice(_WORDS) for _ in range(words))
+        doc_id = f"doc-{i:06d}"
+        documents[doc_id] = {
+            "doc_id": doc_id,
+            "title": f"Document {i}",
+            "source": "bench",
+            "full_text": text,
+            "summary": text[:200],
+            "chunks": [
+                {"chunk_index": 0, "text": text, "token_count": words, "start_char": 0, "end_char": len(text)}
+            ],
+            "tags": ["bench", f"group:{i % 10}"],
+            "collection": "bench",
+            "token_count": words,
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-01T00:00:00+00:00",
+            "metadata": {"index": i},
+        }
+    return documents
+
+
+def _bench_legacy(documents: dict[str, dict], path: Path) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    path.write_text(json.dumps(documents, indent=2))
+    save_s = time.perf_counter() - start
+    start = time.perf_counter()
+    json.loads(path.read_text())
+    load_s = time.perf_counter() - start
+    return save_s, load_s, path.stat().st_size
+
+
+def _bench_codec(name: str, documents: dict[str, dict], store_dir: Path) -> tuple[float, float, int]:
+    store = DocumentStore(store_dir, codec=name)
+    store._cache["bench"] = documents
+    start = time.perf_counter()
+    store._persist("bench")
+    save_s = time.perf_counter() - start
+
+    fresh = DocumentStore(store_dir, codec=name)
+    start = time.perf_counter()
+    loaded = fresh.list("bench")
+    load_s = time.perf_counter() - start
+    assert len(loaded) == len(documents)
+    return save_s, load_s, (store_dir / f"bench{store.codec.extension}").stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=150)
+    args = parser.parse_args()
+
+    documents = _make_documents(args.docs, args.words)
+    print(f"Collection: {args.docs} documents, ~{args.words} words each\n")
+    print(f"{'codec':<18}{'save (s)':>10}{'load (s)':>10}{'size (MB)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        save_s, load_s, size = _bench_legacy(documents, root / "legacy.json")
+        print(f"{'json (indent=2)':<18}{save_s:>10.3f}{load_s:>10.3f}{size / 1e6:>12.1f}")
+        for name in ("json", "marshal", "pickle"):
+            store_dir = root / name
+            save_s, load_s, size = _bench_codec(name, documents, store_dir)
+            label = f"{name} (orjson)" if name == "json" and codecs._orjson is not None else name
+            print(f"{label:<18}{save_s:>10.3f}{load_s:>10.3f}{size / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
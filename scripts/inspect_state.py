@@ -1,13 +1,17 @@
 """Inspect store and index contents."""
-import json
 import os
+from pathlib import Path
+
 import numpy as np
 
+from staged_rag.config import load_settings
+from staged_rag.core.document_store import DocumentStore
+
 os.chdir("d:/Python/MCP_RAG/staged-rag-mcp")
 
 # Store
-with open("data/store/default.json") as f:
-    docs = json.load(f)
+store = DocumentStore(Path("data/store"), codec=load_settings().storage.codec)
+docs = {doc["doc_id"]: doc for doc in store.list("default")}
 print(f"Total docs in store: {len(docs)}")
 for doc_id, d in docs.items():
     title = d.get("title", "?")[:60]
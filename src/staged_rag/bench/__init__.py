@@ -0,0 +1 @@
+"""Benchmarking helpers (stand-in services for offline load testing)."""
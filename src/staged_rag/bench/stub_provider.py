@@ -0,0 +1,287 @@
+"""Local stand-in for the OpenAI ``/v1/embeddings`` API.
+
+Serves deterministic vectors (``utils.deterministic_vector``) with
+configurable injected latency, server errors and 429s, so ingestion and
+search can be benchmarked end-to-end without network access – including
+batching, rate limiting, retries and concurrency.
+
+Point the ``openai`` or ``lmstudio`` provider at it::
+
+    python -m staged_rag.bench.stub_provider --port 8765 --latency-ms 40 \\
+        --per-text-ms 0.5 --error-rate 0.01 --rate-limit-rate 0.05
+
+    embedding:
+      provider: openai
+      model: stub-embedding
+      dimensions: 768
+      provider_config:
+        openai_base_url: http://127.0.0.1:8765/v1
+        api_key: stub
+
+``GET /stats`` returns request counters; ``POST /stats/reset`` clears them.
+Both float and base64 ``encoding_format`` responses are supported.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import numpy as np
+
+from staged_rag.utils import count_tokens, deterministic_vector
+
+
+@dataclass
+class StubConfig:
+    """Fault and latency injection settings."""
+
+    latency_ms: float = 0.0  # fixed latency per request
+    per_text_ms: float = 0.0  # additional latency per input text
+    jitter_ms: float = 0.0  # uniform random extra latency
+    error_rate: float = 0.0  # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # fraction of requests answered with HTTP 429
+    requests_per_minute: int = 0  # hard sliding-window limit (0 = none)
+    retry_after: float = 1.0  # Retry-After header sent with 429s
+    default_dimensions: int = 1536
+    seed: int | None = None
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.texts = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.batch_sizes: list[int] = []
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            served = len(self.batch_sizes)
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "max_in_flight": self.max_in_flight,
+                "avg_batch_size": sum(self.batch_sizes) / served if served else 0.0,
+            }
+
+
+class StubEmbeddingServer:
+    """Threaded HTTP server speaking the OpenAI embeddings API.
+
+    Usable as a context manager in benchmarks and tests; ``port=0`` picks
+    a free port (see ``base_url``).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: StubConfig | None = None) -> None:
+        self.host = host
+        self.config = config or StubConfig()
+        self.stats = _Stats()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._window: deque[float] = deque()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self._httpd.server_port}/v1"
+
+    def start(self) -> "StubEmbeddingServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="stub-embeddings")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "StubEmbeddingServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Fault injection
+    # ------------------------------------------------------------------
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _over_rpm(self) -> bool:
+        if not self.config.requests_per_minute:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] >= 60.0:
+                self._window.popleft()
+            if len(self._window) >= self.config.requests_per_minute:
+                return True
+            self._window.append(now)
+            return False
+
+    def _embed(self, payload: dict[str, Any]) -> tuple[int, dict[str, Any], dict[str, str]]:
+        """Return ``(status, body, headers)`` for an embeddings request."""
+        texts = payload.get("input")
+        if isinstance(texts, str):
+            texts = [texts]
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return 400, _error("'input' must be a string or a list of strings", "invalid_request_error"), {}
+
+        cfg = self.config
+        delay = cfg.latency_ms + cfg.per_text_ms * len(texts) + cfg.jitter_ms * self._roll()
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if self._over_rpm() or self._roll() < cfg.rate_limit_rate:
+            with self.stats._lock:
+                self.stats.rate_limited += 1
+            headers = {"Retry-After": f"{cfg.retry_after:g}"}
+            return 429, _error("Rate limit reached (stub). Please retry later.", "rate_limit_exceeded"), headers
+        if self._roll() < cfg.error_rate:
+            with self.stats._lock:
+                self.stats.errors += 1
+            return 500, _error("Injected server error (stub).", "server_error"), {}
+
+        dimensions = int(payload.get("dimensions") or cfg.default_dimensions)
+        base64_format = payload.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(texts):
+            vector = deterministic_vector(text, dimensions)
+            embedding: Any = (
+                base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii") if base64_format else vector.tolist()
+            )
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        tokens = sum(count_tokens(text) for text in texts)
+        with self.stats._lock:
+            self.stats.texts += len(texts)
+            self.stats.batch_sizes.append(len(texts))
+        body = {
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", "stub-embedding"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+        return 200, body, {}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+            def _send(self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+                raw = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path == "/stats":
+                    self._send(200, server.stats.snapshot())
+                elif self.path.rstrip("/") == "/v1/models":
+                    self._send(200, {"object": "list", "data": [{"id": "stub-embedding", "object": "model"}]})
+                else:
+                    self._send(404, _error(f"Unknown path {self.path}", "not_found"))
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                if self.path == "/stats/reset":
+                    server.stats.reset()
+                    self._send(200, {"status": "reset"})
+                    return
+                if self.path.rstrip("/") != "/v1/embeddings":
+                    self._send(404, _error(f"Unknown path {self.path}", "not_found"))
+                    return
+                try:
+                    payload = json.loads(raw or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, _error("Body must be JSON", "invalid_request_error"))
+                    return
+                stats = server.stats
+                with stats._lock:
+                    stats.requests += 1
+                    stats.in_flight += 1
+                    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+                try:
+                    self._send(*server._embed(payload))
+                finally:
+                    with stats._lock:
+                        stats.in_flight -= 1
+
+        return Handler
+
+
+def _error(message: str, error_type: str) -> dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "param": None, "code": error_type}}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixed latency per request")
+    parser.add_argument("--per-text-ms", type=float, default=0.0, help="extra latency per input text")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of HTTP 429 responses")
+    parser.add_argument("--rpm", type=int, default=0, help="hard requests-per-minute limit (0 = none)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--dimensions", type=int, default=1536, help="dimensions when the request sets none")
+    parser.add_argument("--seed", type=int, default=None, help="seed for injected faults")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        per_text_ms=args.per_text_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        requests_per_minute=args.rpm,
+        retry_after=args.retry_after,
+        default_dimensions=args.dimensions,
+        seed=args.seed,
+    )
+    server = StubEmbeddingServer(args.host, args.port, config)
+    print(f"Stub embedding server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
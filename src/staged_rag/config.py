@@ -7,6 +7,8 @@ from typing import Any
 import yaml
 from dotenv import load_dotenv
 
+from staged_rag.http_pool import HttpPoolConfig
+
 
 @dataclass(frozen=True)
 class ServerConfig:
@@ -23,12 +25,33 @@ class EmbeddingConfig:
     dimensions: int
     batch_size: int
     provider_config: dict
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_retries: int
+    circuit_breaker_threshold: int
+    circuit_breaker_reset_seconds: float
+    max_in_flight: int
+    micro_batch_window_ms: float
+    warm_up: bool
+    failover: list
+    model_family: str | None
+    hedge_percentile: float
+
+
+@dataclass(frozen=True)
+class EmbeddingCacheConfig:
+    enabled: bool
+    path: Path
+    max_size_mb: int
+    query_cache_size: int
 
 
 @dataclass(frozen=True)
 class GenerationConfig:
     model: str
     summary_max_sentences: int
+    summary_cache: bool
+    summary_cache_path: Path
 
 
 @dataclass(frozen=True)
@@ -48,12 +71,22 @@ class RetrievalConfig:
     min_similarity_score: float
 
 
+@dataclass(frozen=True)
+class BM25Config:
+    k1: float
+    b: float
+    stemmer: bool
+    stopwords: bool
+    query_cache_size: int
+
+
 @dataclass(frozen=True)
 class StorageConfig:
     data_dir: Path
     store_dir: Path
     index_dir: Path
     log_dir: Path
+    codec: str
 
 
 @dataclass(frozen=True)
@@ -61,6 +94,12 @@ class IngestionConfig:
     max_document_tokens: int
     max_batch_size: int
     auto_summary: bool
+    reembed_fallbacks: bool
+    reembed_interval: float
+    reembed_batch_size: int
+    deferred_summary: bool
+    deferred_summary_interval: float
+    deferred_summary_batch_size: int
 
 
 @dataclass(frozen=True)
@@ -84,9 +123,12 @@ class KnowledgeBaseConfig:
 class Settings:
     server: ServerConfig
     embedding: EmbeddingConfig
+    embedding_cache: EmbeddingCacheConfig
+    http: HttpPoolConfig
     generation: GenerationConfig
     chunking: ChunkingConfig
     retrieval: RetrievalConfig
+    bm25: BM25Config
     storage: StorageConfig
     ingestion: IngestionConfig
     logging: LoggingConfig
@@ -117,11 +159,48 @@ def load_settings(root: Path | None = None) -> Settings:
     )
     embedding = merged(
         "embedding",
-        {"provider": "gemini", "model": "gemini-embedding-001", "dimensions": 3072, "batch_size": 16, "provider_config": {}},
+        {
+            "provider": "gemini",
+            "model": "gemini-embedding-001",
+            "dimensions": 3072,
+            "batch_size": 16,
+            "provider_config": {},
+            "requests_per_minute": 80,
+            "tokens_per_minute": 0,
+            "max_retries": 4,
+            "circuit_breaker_threshold": 5,
+            "circuit_breaker_reset_seconds": 30,
+            "max_in_flight": 4,
+            "micro_batch_window_ms": 5,
+            "warm_up": True,
+            "failover": [],
+            "model_family": None,
+            "hedge_percentile": 0,
+        },
+    )
+    embedding_cache = merged(
+        "embedding_cache",
+        {"enabled": True, "path": "./data/embedding_cache.sqlite3", "max_size_mb": 512, "query_cache_size": 1024},
+    )
+    http = merged(
+        "http",
+        {
+            "enabled": True,
+            "max_connections": 32,
+            "max_keepalive_connections": 16,
+            "keepalive_expiry": 30.0,
+            "http2": True,
+            "timeout": 60.0,
+        },
     )
     generation = merged(
         "generation",
-        {"model": "gemini-1.5-flash", "summary_max_sentences": 4},
+        {
+            "model": "gemini-1.5-flash",
+            "summary_max_sentences": 4,
+            "summary_cache": True,
+            "summary_cache_path": "./data/summary_cache.sqlite3",
+        },
     )
     chunking = merged(
         "chunking",
@@ -138,6 +217,10 @@ def load_settings(root: Path | None = None) -> Settings:
             "min_similarity_score": 0.0,
         },
     )
+    bm25 = merged(
+        "bm25",
+        {"k1": 1.5, "b": 0.75, "stemmer": True, "stopwords": True, "query_cache_size": 1024},
+    )
     storage = merged(
         "storage",
         {
@@ -145,11 +228,22 @@ def load_settings(root: Path | None = None) -> Settings:
             "store_dir": "./data/store",
             "index_dir": "./data/index",
             "log_dir": "./data/logs",
+            "codec": "pickle",
         },
     )
     ingestion = merged(
         "ingestion",
-        {"max_document_tokens": 50000, "max_batch_size": 50, "auto_summary": True},
+        {
+            "max_document_tokens": 50000,
+            "max_batch_size": 50,
+            "auto_summary": True,
+            "reembed_fallbacks": True,
+            "reembed_interval": 30.0,
+            "reembed_batch_size": 32,
+            "deferred_summary": False,
+            "deferred_summary_interval": 10.0,
+            "deferred_summary_batch_size": 8,
+        },
     )
     logging_cfg = merged(
         "logging",
@@ -172,14 +266,34 @@ def load_settings(root: Path | None = None) -> Settings:
         store_dir=root_path / storage["store_dir"],
         index_dir=root_path / storage["index_dir"],
         log_dir=root_path / storage["log_dir"],
+        codec=str(storage["codec"]),
     )
 
     return Settings(
         server=ServerConfig(**server),
         embedding=EmbeddingConfig(**embedding),
-        generation=GenerationConfig(**generation),
+        embedding_cache=EmbeddingCacheConfig(
+            enabled=bool(embedding_cache["enabled"]),
+            path=root_path / embedding_cache["path"],
+            max_size_mb=int(embedding_cache["max_size_mb"]),
+            query_cache_size=int(embedding_cache["query_cache_size"]),
+        ),
+        http=HttpPoolConfig(**http),
+        generation=GenerationConfig(
+            model=str(generation["model"]),
+            summary_max_sentences=int(generation["summary_max_sentences"]),
+            summary_cache=bool(generation["summary_cache"]),
+            summary_cache_path=root_path / generation["summary_cache_path"],
+        ),
         chunking=ChunkingConfig(**chunking),
         retrieval=RetrievalConfig(**retrieval),
+        bm25=BM25Config(
+            k1=float(bm25["k1"]),
+            b=float(bm25["b"]),
+            stemmer=bool(bm25["stemmer"]),
+            stopwords=bool(bm25["stopwords"]),
+            query_cache_size=int(bm25["query_cache_size"]),
+        ),
         storage=storage_cfg,
         ingestion=IngestionConfig(**ingestion),
         logging=LoggingConfig(
@@ -1,23 +1,49 @@
-"""Core engine components for embeddings, indexing, and chunking."""
-
-from .embeddings import EmbeddingEngine
-from .vector_index import VectorIndex
-from .document_store import DocumentStore
-from .chunk_manager import ChunkManager
-from .summary_generator import SummaryGenerator
-from .bm25 import BM25Scorer
-from .file_watcher import FileWatcher
-from .kb_manifest import KBManifest
-from .kb_manager import KnowledgeBaseManager
-
-__all__ = [
-    "EmbeddingEngine",
-    "VectorIndex",
-    "DocumentStore",
-    "ChunkManager",
-    "SummaryGenerator",
-    "BM25Scorer",
-    "FileWatcher",
-    "KBManifest",
-    "KnowledgeBaseManager",
-]
+"""Core engine components for embeddings, indexing, and chunking.
+
+Submodules are imported on first attribute access, so importing one
+component (e.g. ``staged_rag.core.analyzer``) does not load them all.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analyzer import Analyzer
+    from .bm25 import BM25Scorer
+    from .chunk_manager import ChunkManager
+    from .document_store import DocumentStore
+    from .embeddings import EmbeddingEngine
+    from .file_watcher import FileWatcher
+    from .kb_manager import KnowledgeBaseManager
+    from .kb_manifest import KBManifest
+    from .summary_generator import SummaryGenerator
+    from .vector_index import VectorIndex
+
+_EXPORTS = {
+    "EmbeddingEngine": "embeddings",
+    "VectorIndex": "vector_index",
+    "DocumentStore": "document_store",
+    "ChunkManager": "chunk_manager",
+    "SummaryGenerator": "summary_generator",
+    "Analyzer": "analyzer",
+    "BM25Scorer": "bm25",
+    "FileWatcher": "file_watcher",
+    "KBManifest": "kb_manifest",
+    "KnowledgeBaseManager": "kb_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
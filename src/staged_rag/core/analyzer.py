@@ -0,0 +1,113 @@
+"""Text analysis pipeline for BM25 keyword indexing.
+
+``text → \\w+ tokens → casefold → stopword removal → light suffix stemming``
+
+Splitting on word characters keeps punctuation out of the vocabulary
+("retrieval." and "retrieval" are one term), dropping stopwords removes
+the longest postings lists, and the stemmer folds plural and -ed/-ing
+forms together.  Query analysis is memoised in an LRU cache because
+agents repeat and reformulate the same queries.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Lucene's default English stopword set: short enough not to hurt phrase-like
+# queries, but covers the terms with the longest postings lists.
+ENGLISH_STOPWORDS = frozenset(
+    """a an and are as at be but by for if in into is it no not of on or such
+    that the their then there these they this to was will with""".split()
+)
+
+_VOWELS = frozenset("aeiouy")
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    """Light English suffix stemmer (plurals, -ed, -ing).
+
+    Deliberately conservative: it mostly conflates inflections of the same
+    word and never strips -ed/-ing when that would leave fewer than three
+    characters or a stem without a vowel.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and not token.endswith(("aies", "eies")):
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith(("xes", "zes", "ches", "shes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and not token.endswith("eed"):
+            stem = token[: -len(suffix)]
+            if len(stem) >= 3 and _VOWELS.intersection(stem):
+                # Undouble the final consonant: "running" -> "run".
+                if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in "lsz" and stem[-1] not in _VOWELS:
+                    stem = stem[:-1]
+                return stem
+            break
+    # Drop a silent final "e" so "retrieve" matches "retrieved"/"retrieving".
+    if token.endswith("e") and not token.endswith("ee") and len(token) >= 4:
+        token = token[:-1]
+    return token
+
+
+class Analyzer:
+    """Tokenize, normalise and stem text into BM25 index terms."""
+
+    def __init__(self, stemmer: bool = True, stopwords: bool = True, query_cache_size: int = 1024) -> None:
+        self.stemmer = stemmer
+        self.stopwords = stopwords
+        self._stopwords = ENGLISH_STOPWORDS if stopwords else frozenset()
+        self._cached_query = lru_cache(maxsize=query_cache_size)(self._analyze_query)
+
+    @property
+    def signature(self) -> dict[str, object]:
+        """Settings that determine the produced terms (persisted with an index)."""
+        return {"tokenizer": _TOKEN_RE.pattern, "casefold": True, "stopwords": self.stopwords, "stemmer": self.stemmer}
+
+    def analyze(self, text: str) -> list[str]:
+        """Return the index terms of *text* in order (duplicates kept)."""
+        tokens = _TOKEN_RE.findall(text.casefold())
+        if self._stopwords:
+            tokens = [token for token in tokens if token not in self._stopwords]
+        if self.stemmer:
+            tokens = [_stem(token) for token in tokens]
+        return tokens
+
+    def term_counts(self, text: str) -> Counter[str]:
+        """Return ``{term: frequency}`` for *text*.
+
+        Equivalent to ``Counter(analyze(text))`` but filters and stems each
+        distinct token once, which is what indexing needs.
+        """
+        raw = Counter(_TOKEN_RE.findall(text.casefold()))
+        if not self._stopwords and not self.stemmer:
+            return raw
+        counts: Counter[str] = Counter()
+        for token, count in raw.items():
+            if token in self._stopwords:
+                continue
+            counts[_stem(token) if self.stemmer else token] += count
+        return counts
+
+    def analyze_query(self, query: str) -> tuple[str, ...]:
+        """Return the distinct terms of *query*, served from an LRU cache."""
+        return self._cached_query(query)
+
+    def _analyze_query(self, query: str) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(self.analyze(query)))
+
+    def cache_info(self) -> dict[str, int | None]:
+        """Hit/miss statistics of the analyzed-query cache."""
+        info = self._cached_query.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
@@ -0,0 +1,91 @@
+"""Polling daemon-thread worker for background maintenance jobs.
+
+``BackgroundWorker`` calls a batch function repeatedly while it makes
+progress and waits *poll_interval* seconds whenever it does not (or while
+its dependency is unavailable).  The service runs two of them:
+
+* ``reembed`` – replaces deterministic fallback vectors with real
+  embeddings once the provider is reachable
+  (``RAGService.reembed_fallbacks``).
+* ``summary`` – replaces extractive placeholder summaries with LLM
+  summaries (``RAGService.generate_pending_summaries``).
+
+Both send their embedding calls through the rate limiter's bulk lane, so
+they never compete with interactive queries.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """Run *run_batch* until it reports no progress, then idle.
+
+    Parameters
+    ----------
+    run_batch : callable() -> int
+        Processes one batch and returns how many items were handled.
+    is_ready : callable() -> bool
+        Returns False while the job's dependency is known to be unavailable.
+    poll_interval : float
+        Seconds to wait when there is nothing to do or the dependency is down.
+    name : str
+        Used in the thread name and log messages.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[], int],
+        is_ready: Callable[[], bool] | None = None,
+        poll_interval: float = 30.0,
+        name: str = "background",
+    ) -> None:
+        self._run_batch = run_batch
+        self.name = name
+        self._is_ready = is_ready or (lambda: True)
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> int:
+        """Run one batch if the dependency is ready; return the count handled."""
+        if not self._is_ready():
+            return 0
+        return self._run_batch()
+
+    def _loop(self) -> None:
+        logger.info("%s worker started (interval=%.1fs)", self.name, self.poll_interval)
+        while not self._stop_event.is_set():
+            try:
+                handled = self.run_once()
+            except Exception:
+                logger.exception("%s worker error", self.name)
+                handled = 0
+            # Keep draining while batches succeed; otherwise back off.
+            if not handled:
+                self._stop_event.wait(self.poll_interval)
+        logger.info("%s worker stopped", self.name)
+
+    def start(self) -> None:
+        """Start the worker in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name=f"{self.name}-worker")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the worker to stop and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 2)
+            self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -1,29 +1,512 @@
 from __future__ import annotations
 
-from typing import Iterable
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, NamedTuple
 
-from rank_bm25 import BM25Okapi
+import numpy as np
+
+from staged_rag.core import codecs
+from staged_rag.core.analyzer import Analyzer
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 3
+# Compact the delta log into a new base segment once it holds this many
+# operations, or a tenth of the base size if that is larger.
+_MIN_COMPACT_OPS = 1000
 
 
 class BM25Scorer:
-    """BM25 scorer for keyword-based retrieval."""
+    """Incrementally maintained Okapi BM25 inverted index.
+
+    Every document occupies an integer slot.  Postings are kept per term as
+    ``{slot: tf}`` for cheap incremental updates and are frozen lazily into
+    sorted NumPy arrays (slots + term frequencies) the first time a term is
+    queried after a change.  Scoring is term-at-a-time over the postings of
+    the query terms only, so its cost scales with postings length rather
+    than corpus size.  IDF is computed lazily at query time.
+
+    Top-k queries use MaxScore-style dynamic pruning: terms are processed
+    in decreasing order of their score upper bound, and once the k-th best
+    accumulated score exceeds what the remaining terms could add, no new
+    candidates are admitted and the remaining (typically very common)
+    terms are only looked up for the surviving candidates.
+
+    When *storage_path* is given the index is persisted as a directory:
+
+    * ``segment.meta`` – doc_ids with a hash of their text, vocabulary,
+      the analyzer signature and the active generation (written with the
+      storage codec)
+    * ``segment-<gen>.{offsets,slots,tfs,lengths}.npy`` – an immutable CSR
+      base segment, memory-mapped on load
+    * ``delta-<gen>.log`` – JSON lines of adds/removes applied since the base
+      segment was written, replayed on load
+
+    Both store analyzed term counts, so loading and compaction never
+    re-analyze text.  An index written with different analyzer settings
+    (or BM25 parameters) is discarded and rebuilt by the caller.
+
+    Removing a base document only zeroes its length (base slots are never
+    reused); the delta log is folded into a new base generation once it
+    grows past a fraction of the base size.
+    """
+
+    def __init__(
+        self,
+        storage_path: Path | None = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        codec: str | None = None,
+        analyzer: Analyzer | None = None,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.analyzer = analyzer or Analyzer()
+        self.storage_path = storage_path
+        self._codec = codecs.get_codec(codec)
+        self._lock = threading.Lock()
+        self._reset()
+        if self.storage_path is not None:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def _reset(self) -> None:
+        # Delta: documents added since the base segment was written.
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, Counter[str]] = {}
+        self._arrays: dict[str, _TermArrays] = {}
+        self._doc_ids: list[str | None] = []
+        self._slots: dict[str, int] = {}
+        self._hashes: dict[str, str] = {}
+        self._free_slots: list[int] = []
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._total_length = 0
+        # Base: immutable CSR segment (memory-mapped when loaded from disk).
+        self._base_vocab: dict[str, int] = {}
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._base_slots = np.zeros(0, dtype=np.int32)
+        self._base_tfs = np.zeros(0, dtype=np.int32)
+        self._base_size = 0
+        self._generation = 0
+        self._delta_ops = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._slots
 
-    def __init__(self) -> None:
-        self._bm25: BM25Okapi | None = None
-        self._doc_ids: list[str] = []
+    def doc_ids(self) -> set[str]:
+        """Return the ids of all indexed documents."""
+        with self._lock:
+            return set(self._slots)
+
+    def is_current(self, doc_id: str, text: str) -> bool:
+        """Return True if *doc_id* is indexed with exactly *text*."""
+        with self._lock:
+            return self._hashes.get(doc_id) == _text_hash(text)
 
     def build(self, documents: Iterable[dict[str, str]]) -> None:
-        corpus = []
-        self._doc_ids = []
-        for document in documents:
-            text = document.get("keyword_text", "")
-            corpus.append(text.lower().split())
-            self._doc_ids.append(document["doc_id"])
-        self._bm25 = BM25Okapi(corpus) if corpus else None
-
-    def score(self, query: str) -> list[tuple[str, float]]:
-        if not self._bm25:
-            return []
-        tokenized_query = query.lower().split()
-        scores = self._bm25.get_scores(tokenized_query)
-        return list(zip(self._doc_ids, scores))
+        """Replace the index contents with *documents* (``doc_id`` + ``keyword_text``)."""
+        with self._lock:
+            generation = self._generation
+            self._reset()
+            self._generation = generation
+            for document in documents:
+                self._add(document["doc_id"], document.get("keyword_text", ""))
+            if self.storage_path is not None:
+                self._compact()
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index *text* under *doc_id*, replacing any previous version."""
+        with self._lock:
+            self._remove(doc_id)
+            terms = self._add(doc_id, text)
+            self._append_log({"op": "add", "doc_id": doc_id, "hash": self._hashes[doc_id], "terms": terms})
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop *doc_id* from the index.  Returns False if it was not indexed."""
+        with self._lock:
+            removed = self._remove(doc_id)
+            if removed:
+                self._append_log({"op": "remove", "doc_id": doc_id})
+            return removed
+
+    def _allocate_slot(self, doc_id: str) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._doc_ids[slot] = doc_id
+        else:
+            slot = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            if slot >= len(self._lengths):
+                grown = np.zeros(max(16, 2 * len(self._lengths)), dtype=np.float64)
+                grown[: len(self._lengths)] = self._lengths
+                self._lengths = grown
+        self._slots[doc_id] = slot
+        return slot
+
+    def _add(
+        self, doc_id: str, text: str, terms: dict[str, int] | None = None, text_hash: str | None = None
+    ) -> dict[str, int]:
+        counts = Counter(terms) if terms is not None else self.analyzer.term_counts(text)
+        slot = self._allocate_slot(doc_id)
+        self._hashes[doc_id] = text_hash if text_hash is not None else _text_hash(text)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[slot] = tf
+            self._arrays.pop(term, None)
+        length = sum(counts.values())
+        self._doc_terms[slot] = counts
+        self._lengths[slot] = length
+        self._total_length += length
+        return dict(counts)
+
+    def _remove(self, doc_id: str) -> bool:
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return False
+        self._hashes.pop(doc_id, None)
+        if slot < self._base_size:
+            # Base postings are immutable: a zero length masks the slot out
+            # until the next compaction.  Its terms are unknown here, so
+            # drop every frozen array.
+            self._arrays.clear()
+        else:
+            for term in self._doc_terms.pop(slot):
+                self._arrays.pop(term, None)
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._free_slots.append(slot)
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._doc_ids[slot] = None
+        return True
+
+    def _term_arrays(self, term: str) -> _TermArrays | None:
+        """Return frozen postings arrays for *term*, rebuilding them if stale."""
+        arrays = self._arrays.get(term)
+        if arrays is not None:
+            return arrays
+        slot_parts: list[np.ndarray] = []
+        tf_parts: list[np.ndarray] = []
+        term_id = self._base_vocab.get(term)
+        if term_id is not None:
+            start, end = int(self._base_offsets[term_id]), int(self._base_offsets[term_id + 1])
+            slots = np.asarray(self._base_slots[start:end], dtype=np.int64)
+            alive = self._lengths[slots] > 0
+            slot_parts.append(slots[alive])
+            tf_parts.append(np.asarray(self._base_tfs[start:end], dtype=np.float64)[alive])
+        postings = self._postings.get(term)
+        if postings:
+            slot_parts.append(np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)))
+            tf_parts.append(np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+        if not slot_parts:
+            return None
+        slots, tfs = np.concatenate(slot_parts), np.concatenate(tf_parts)
+        if not len(slots):
+            return None
+        order = np.argsort(slots, kind="stable")
+        slots, tfs = slots[order], tfs[order]
+        arrays = _TermArrays(slots, tfs, float(tfs.max()), float(self._lengths[slots].min()))
+        self._arrays[term] = arrays
+        return arrays
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, generation: int, name: str) -> Path:
+        assert self.storage_path is not None
+        return self.storage_path / f"segment-{generation}.{name}.npy"
+
+    def _log_path(self, generation: int) -> Path:
+        assert self.storage_path is not None
+        return self.storage_path / f"delta-{generation}.log"
+
+    def _load(self) -> None:
+        meta_path = self.storage_path / "segment.meta"  # type: ignore[operator]
+        try:
+            meta = codecs.read_file(meta_path) if meta_path.exists() else None
+            if meta is not None and self._compatible(meta):
+                self._install_base(meta)
+                self._replay_log()
+                return
+            if meta is not None:
+                logger.info("BM25 index at %s has an incompatible format – rebuilding", self.storage_path)
+                # Keep the generation so the empty segment below replaces its files.
+                self._generation = int(meta.get("generation", 0))
+        except Exception:
+            logger.exception("Failed to load BM25 index at %s – rebuilding", self.storage_path)
+            self._reset()
+        # Start from an empty segment so the settings that produced every
+        # logged term are recorded before the first delta is written.
+        self._compact()
+
+    def _compatible(self, meta: dict) -> bool:
+        return (
+            meta.get("version") == _FORMAT_VERSION
+            and meta.get("k1") == self.k1
+            and meta.get("b") == self.b
+            and meta.get("analyzer") == self.analyzer.signature
+        )
+
+    def _install_base(self, meta: dict) -> None:
+        generation = int(meta["generation"])
+        self._reset()
+        self._generation = generation
+        self._base_vocab = {term: term_id for term_id, term in enumerate(meta["vocab"])}
+        self._base_offsets = _load_array(self._segment_path(generation, "offsets"))
+        self._base_slots = _load_array(self._segment_path(generation, "slots"))
+        self._base_tfs = _load_array(self._segment_path(generation, "tfs"))
+        self._doc_ids = list(meta["doc_ids"])
+        self._slots = {doc_id: slot for slot, doc_id in enumerate(self._doc_ids) if doc_id is not None}
+        self._hashes = dict(zip(meta["doc_ids"], meta["hashes"]))
+        self._base_size = len(self._doc_ids)
+        # Lengths change on removal, so keep a writable in-memory copy.
+        self._lengths = np.array(_load_array(self._segment_path(generation, "lengths")), dtype=np.float64)
+        self._total_length = int(self._lengths.sum())
+
+    def _replay_log(self) -> None:
+        log_path = self._log_path(self._generation)
+        if not log_path.exists():
+            return
+        with log_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write.
+                    break
+                self._remove(entry["doc_id"])
+                if entry["op"] == "add":
+                    self._add(entry["doc_id"], "", terms=entry["terms"], text_hash=entry["hash"])
+                self._delta_ops += 1
+
+    def _append_log(self, entry: dict) -> None:
+        if self.storage_path is None:
+            return
+        with self._log_path(self._generation).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+        self._delta_ops += 1
+        if self._delta_ops >= max(_MIN_COMPACT_OPS, self._base_size // 10):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Fold base + delta into a new base generation and reload it memory-mapped."""
+        vocab: dict[str, int] = dict(self._base_vocab)
+        for term in self._postings:
+            vocab.setdefault(term, len(vocab))
+
+        term_parts: list[np.ndarray] = []
+        slot_parts: list[np.ndarray] = []
+        tf_parts: list[np.ndarray] = []
+        if len(self._base_slots):
+            counts: np.ndarray = np.diff(np.asarray(self._base_offsets, dtype=np.int64))
+            term_parts.append(np.repeat(np.arange(len(counts), dtype=np.int64), counts))
+            slot_parts.append(np.asarray(self._base_slots, dtype=np.int64))
+            tf_parts.append(np.asarray(self._base_tfs, dtype=np.int64))
+        for term, postings in self._postings.items():
+            term_parts.append(np.full(len(postings), vocab[term], dtype=np.int64))
+            slot_parts.append(np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)))
+            tf_parts.append(np.fromiter(postings.values(), dtype=np.int64, count=len(postings)))
+        term_ids = np.concatenate(term_parts) if term_parts else np.zeros(0, dtype=np.int64)
+        slots = np.concatenate(slot_parts) if slot_parts else np.zeros(0, dtype=np.int64)
+        tfs = np.concatenate(tf_parts) if tf_parts else np.zeros(0, dtype=np.int64)
+
+        # Drop postings of removed documents and renumber live slots densely.
+        live_slots = np.array(
+            [slot for slot, doc_id in enumerate(self._doc_ids) if doc_id is not None], dtype=np.int64
+        )
+        remap = np.full(len(self._doc_ids), -1, dtype=np.int64)
+        remap[live_slots] = np.arange(len(live_slots))
+        keep = remap[slots] >= 0
+        term_ids, slots, tfs = term_ids[keep], remap[slots[keep]], tfs[keep]
+        order = np.lexsort((slots, term_ids))
+        term_ids, slots, tfs = term_ids[order], slots[order], tfs[order]
+
+        counts = np.bincount(term_ids, minlength=len(vocab))
+        used = counts > 0
+        terms_by_id = list(vocab)
+        offsets = np.concatenate([[0], np.cumsum(counts[used])]).astype(np.int64)
+
+        generation = self._generation + 1
+        np.save(self._segment_path(generation, "offsets"), offsets)
+        np.save(self._segment_path(generation, "slots"), slots.astype(np.int32))
+        np.save(self._segment_path(generation, "tfs"), tfs.astype(np.int32))
+        np.save(self._segment_path(generation, "lengths"), self._lengths[live_slots].astype(np.int32))
+        meta = {
+            "version": _FORMAT_VERSION,
+            "generation": generation,
+            "k1": self.k1,
+            "b": self.b,
+            "analyzer": self.analyzer.signature,
+            "doc_ids": [self._doc_ids[int(slot)] for slot in live_slots],
+            "hashes": [self._hashes[self._doc_ids[int(slot)]] for slot in live_slots],  # type: ignore[index]
+            "vocab": [term for term, is_used in zip(terms_by_id, used) if is_used],
+        }
+        codecs.write_file(self.storage_path / "segment.meta", meta, self._codec)  # type: ignore[operator]
+
+        previous = self._generation
+        self._install_base(meta)
+        self._remove_generation(previous)
+
+    def _remove_generation(self, generation: int) -> None:
+        # Best effort: on Windows the old memory-mapped files may still be
+        # open; they are left behind and ignored.
+        paths = [self._segment_path(generation, name) for name in ("offsets", "slots", "tfs", "lengths")]
+        for path in [*paths, self._log_path(generation)]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                logger.debug("Could not remove stale BM25 file %s", path)
+
+    def _idf(self, df: int, doc_count: int) -> float:
+        # Lucene-style BM25 IDF: always positive, so very common terms still
+        # contribute a little instead of being clamped to an epsilon.
+        return math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def _contributions(self, slots: np.ndarray, tfs: np.ndarray, idf: float, avgdl: float) -> np.ndarray:
+        norm = self.k1 * (1.0 - self.b + self.b * self._lengths[slots] / avgdl)
+        return idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+    def _upper_bound(self, arrays: _TermArrays, idf: float, avgdl: float) -> float:
+        # The BM25 term weight grows with tf and shrinks with document length,
+        # so the largest tf and the shortest document bound every posting.
+        norm = self.k1 * (1.0 - self.b + self.b * arrays.min_length / avgdl)
+        return idf * arrays.max_tf * (self.k1 + 1.0) / (arrays.max_tf + norm)
+
+    def score(self, query: str, top_k: int | None = None, prune: bool = True) -> list[tuple[str, float]]:
+        """Return ``(doc_id, score)`` pairs for documents matching a query term.
+
+        Results are sorted by descending score and truncated to *top_k*
+        when given.  With *prune* (the default) a top-k query skips
+        documents that provably cannot enter the top-k; scores of the
+        returned documents are exact either way.
+        """
+        with self._lock:
+            doc_count = len(self._slots)
+            if not doc_count:
+                return []
+            avgdl = self._total_length / doc_count or 1.0
+            terms: list[tuple[_TermArrays, float]] = []
+            for term in self.analyzer.analyze_query(query):
+                arrays = self._term_arrays(term)
+                if arrays is not None:
+                    terms.append((arrays, self._idf(len(arrays.slots), doc_count)))
+            if not terms:
+                return []
+            if prune and top_k is not None and top_k > 0 and len(terms) > 1:
+                slots, scores = self._score_max_score(terms, top_k, avgdl)
+            else:
+                slots, scores = self._score_exhaustive(terms, avgdl)
+            order = _top_order(scores, slots, top_k)
+            return [(self._doc_ids[int(slots[i])], float(scores[i])) for i in order]  # type: ignore[misc]
+
+    def _score_exhaustive(self, terms: list[tuple[_TermArrays, float]], avgdl: float) -> tuple[np.ndarray, np.ndarray]:
+        slot_parts = [arrays.slots for arrays, _ in terms]
+        score_parts = [self._contributions(arrays.slots, arrays.tfs, idf, avgdl) for arrays, idf in terms]
+        if len(slot_parts) == 1:
+            return slot_parts[0], score_parts[0]
+        slots, inverse = np.unique(np.concatenate(slot_parts), return_inverse=True)
+        return slots, np.bincount(inverse, weights=np.concatenate(score_parts))
+
+    def _score_max_score(
+        self, terms: list[tuple[_TermArrays, float]], top_k: int, avgdl: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        bounded = sorted(
+            ((arrays, idf, self._upper_bound(arrays, idf, avgdl)) for arrays, idf in terms),
+            key=lambda item: item[2],
+            reverse=True,
+        )
+        # remaining[i]: the most that terms after position i can still add.
+        remaining = [sum(bound for _, _, bound in bounded[i + 1 :]) for i in range(len(bounded))]
+        slots: np.ndarray = np.zeros(0, dtype=np.int64)
+        scores: np.ndarray = np.zeros(0, dtype=np.float64)
+        admitting = True
+        for position, (arrays, idf, _) in enumerate(bounded):
+            if admitting:
+                # Essential term: its postings may introduce new candidates.
+                contributions = self._contributions(arrays.slots, arrays.tfs, idf, avgdl)
+                slots, inverse = np.unique(np.concatenate([slots, arrays.slots]), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate([scores, contributions]), minlength=len(slots))
+            else:
+                # Non-essential term: only candidates already admitted can
+                # still reach the top-k, so look them up in its postings.
+                positions = np.minimum(np.searchsorted(arrays.slots, slots), len(arrays.slots) - 1)
+                hit = arrays.slots[positions] == slots
+                if hit.any():
+                    scores[hit] += self._contributions(slots[hit], arrays.tfs[positions[hit]], idf, avgdl)
+            if len(scores) < top_k:
+                continue
+            threshold = float(np.partition(scores, len(scores) - top_k)[len(scores) - top_k])
+            if admitting and remaining[position] < threshold:
+                admitting = False
+            if not admitting:
+                # Tolerance keeps documents tied with the k-th score despite
+                # floating-point differences in accumulation order.
+                keep = scores + remaining[position] >= threshold - 1e-9
+                slots, scores = slots[keep], scores[keep]
+        return slots, scores
+
+    def score_documents(self, query: str, doc_ids: Iterable[str]) -> dict[str, float]:
+        """Return exact BM25 scores for specific documents (0.0 when unmatched)."""
+        with self._lock:
+            wanted = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id in self._slots]
+            doc_count = len(self._slots)
+            if not wanted or not doc_count:
+                return {}
+            avgdl = self._total_length / doc_count or 1.0
+            targets = np.array([self._slots[doc_id] for doc_id in wanted], dtype=np.int64)
+            totals = np.zeros(len(targets), dtype=np.float64)
+            for term in self.analyzer.analyze_query(query):
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                slots, tfs = arrays.slots, arrays.tfs
+                positions = np.minimum(np.searchsorted(slots, targets), len(slots) - 1)
+                hit = slots[positions] == targets
+                if hit.any():
+                    idf = self._idf(len(slots), doc_count)
+                    totals[hit] += self._contributions(targets[hit], tfs[positions[hit]], idf, avgdl)
+            return {doc_id: float(total) for doc_id, total in zip(wanted, totals)}
+
+
+class _TermArrays(NamedTuple):
+    """Frozen postings of one term plus the statistics behind its upper bound."""
+
+    slots: np.ndarray
+    tfs: np.ndarray
+    max_tf: float
+    min_length: float
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_array(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Empty arrays cannot be memory-mapped.
+        return np.load(path)
+
+
+def _top_order(scores: np.ndarray, slots: np.ndarray, top_k: int | None) -> np.ndarray:
+    """Indices of *scores* in descending order (ties by slot), limited to *top_k*."""
+    candidates = np.arange(len(scores))
+    if top_k is not None and 0 < top_k < len(scores):
+        kth = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        candidates = np.flatnonzero(scores >= kth)
+    order = candidates[np.lexsort((slots[candidates], -scores[candidates]))]
+    return order[:top_k] if top_k else order
@@ -0,0 +1,177 @@
+"""Pluggable serialization codecs for on-disk store and manifest files.
+
+Binary codecs prefix their payload with a short magic header so the
+format of any file can be sniffed on read.  Files without the header are
+treated as JSON, which keeps stores written by older versions (pretty
+printed ``json.dumps(..., indent=2)``) readable.
+
+Each codec has its own file extension, so a file's name always describes
+its format.  ``codec_path`` re-encodes a file found under another codec's
+extension (e.g. a legacy ``default.json`` once ``pickle`` is configured)
+the first time it is opened.
+
+Available codecs:
+
+* ``pickle``  – stdlib pickle protocol 5, ``.pickle`` (default; trusted local data only)
+* ``marshal`` – stdlib marshal, ``.marshal`` (plain dict/list/str/number payloads only)
+* ``json``    – compact JSON, ``.json``, using ``orjson`` when installed
+* ``orjson``  – alias of ``json`` that requires ``orjson`` to be installed
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import marshal
+import pickle
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None  # type: ignore[assignment]
+
+# ``\x00`` never starts a JSON document, so the header cannot collide with
+# legacy files.  The fifth byte identifies the binary codec.
+_MAGIC = b"\x00SRC"
+
+DEFAULT_CODEC = "pickle"
+
+logger = logging.getLogger(__name__)
+
+
+class Codec(ABC):
+    """Base class: serialise a JSON-compatible payload to bytes and back."""
+
+    name: str = ""
+    tag: bytes = b""
+    extension: str = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encode *obj* (including any magic header)."""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode bytes produced by ``dumps``."""
+
+
+class JsonCodec(Codec):
+    """Compact JSON (no indentation); uses ``orjson`` when available."""
+
+    name = "json"
+    extension = ".json"
+
+    def dumps(self, obj: Any) -> bytes:
+        if _orjson is not None:
+            return _orjson.dumps(obj)
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        if _orjson is not None:
+            return _orjson.loads(data)
+        return json.loads(data)
+
+
+class PickleCodec(Codec):
+    """Pickle protocol 5.  Only use for files written by this process."""
+
+    name = "pickle"
+    tag = b"P"
+    extension = ".pickle"
+
+    def dumps(self, obj: Any) -> bytes:
+        return _MAGIC + self.tag + pickle.dumps(obj, protocol=5)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data[len(_MAGIC) + 1 :])
+
+
+class MarshalCodec(Codec):
+    """Stdlib marshal; fastest for plain containers, Python-version specific."""
+
+    name = "marshal"
+    tag = b"M"
+    extension = ".marshal"
+
+    def dumps(self, obj: Any) -> bytes:
+        return _MAGIC + self.tag + marshal.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return marshal.loads(data[len(_MAGIC) + 1 :])
+
+
+_CODECS: dict[str, Codec] = {
+    "json": JsonCodec(),
+    "pickle": PickleCodec(),
+    "marshal": MarshalCodec(),
+}
+_BY_TAG: dict[bytes, Codec] = {codec.tag: codec for codec in _CODECS.values() if codec.tag}
+EXTENSIONS: tuple[str, ...] = tuple(codec.extension for codec in _CODECS.values())
+
+
+def get_codec(name: str | None = None) -> Codec:
+    """Return the codec registered under *name* (default: ``pickle``).
+
+    Raises:
+        ValueError: If *name* is unknown, or ``orjson`` is requested but
+            not installed.
+    """
+    name = (name or DEFAULT_CODEC).lower()
+    if name == "orjson":
+        if _orjson is None:
+            raise ValueError("Codec 'orjson' requires the 'orjson' package (pip install orjson)")
+        return _CODECS["json"]
+    codec = _CODECS.get(name)
+    if codec is None:
+        supported = ", ".join(sorted([*_CODECS, "orjson"]))
+        raise ValueError(f"Unsupported storage codec: {name!r}. Supported codecs: {supported}")
+    return codec
+
+
+def sniff_codec(data: bytes) -> Codec:
+    """Return the codec that wrote *data* (JSON if no binary header is present)."""
+    if data.startswith(_MAGIC):
+        codec = _BY_TAG.get(data[len(_MAGIC) : len(_MAGIC) + 1])
+        if codec is None:
+            raise ValueError("Unknown binary codec header")
+        return codec
+    return _CODECS["json"]
+
+
+def loads(data: bytes) -> Any:
+    """Decode *data* written by any registered codec."""
+    return sniff_codec(data).loads(data)
+
+
+def read_file(path: Path) -> Any:
+    """Read and decode *path*, sniffing its format."""
+    return loads(path.read_bytes())
+
+
+def write_file(path: Path, obj: Any, codec: Codec) -> None:
+    """Encode *obj* with *codec* and atomically replace *path*."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(codec.dumps(obj))
+    tmp_path.replace(path)
+
+
+def codec_path(directory: Path, stem: str, codec: Codec) -> Path:
+    """Return the path of *stem* in *directory* for files written by *codec*.
+
+    If only a file with another codec's extension exists, it is re-encoded
+    with *codec* under the new name and the old file is removed.
+    """
+    path = directory / f"{stem}{codec.extension}"
+    if path.exists():
+        return path
+    for extension in EXTENSIONS:
+        old_path = directory / f"{stem}{extension}"
+        if old_path != path and old_path.exists():
+            write_file(path, read_file(old_path), codec)
+            old_path.unlink()
+            logger.info("Migrated %s to %s", old_path.name, path.name)
+            break
+    return path
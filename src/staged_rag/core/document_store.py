@@ -1,37 +1,54 @@
 from __future__ import annotations
 
-import json
 import threading
 from pathlib import Path
 
+from staged_rag.core import codecs
+
 
 class DocumentStore:
-    """JSON-backed document store per collection."""
+    """File-backed document store per collection.
+
+    Files are named ``<collection><codec extension>`` and written with the
+    configured codec (see ``core.codecs``); a collection stored under
+    another codec's extension, such as a legacy ``.json`` store, is
+    converted when it is first loaded.
+    """
 
-    def __init__(self, store_dir: Path) -> None:
+    def __init__(self, store_dir: Path, codec: str | None = None) -> None:
         self.store_dir = store_dir
         self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = codecs.get_codec(codec)
         self._cache: dict[str, dict[str, dict]] = {}
         self._lock = threading.Lock()
 
     def _path_for(self, collection: str) -> Path:
-        return self.store_dir / f"{collection}.json"
+        return self.store_dir / f"{collection}{self.codec.extension}"
+
+    def collections(self) -> list[str]:
+        """Return the names of the collections on disk, in any codec's format."""
+        names = {
+            path.name[: -len(extension)]
+            for extension in codecs.EXTENSIONS
+            for path in self.store_dir.glob(f"*{extension}")
+        }
+        return sorted(names)
 
     def _load(self, collection: str) -> dict[str, dict]:
         if collection in self._cache:
             return self._cache[collection]
-        path = self._path_for(collection)
+        path = codecs.codec_path(self.store_dir, collection, self.codec)
         if not path.exists():
             self._cache[collection] = {}
             return self._cache[collection]
-        data = json.loads(path.read_text())
+        data = codecs.read_file(path)
         self._cache[collection] = {doc_id: doc for doc_id, doc in data.items()}
         return self._cache[collection]
 
     def _persist(self, collection: str) -> None:
         data = self._cache.get(collection, {})
         path = self._path_for(collection)
-        path.write_text(json.dumps(data, indent=2))
+        codecs.write_file(path, data, self.codec)
 
     def save(self, collection: str, document: dict) -> None:
         with self._lock:
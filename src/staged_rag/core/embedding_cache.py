@@ -0,0 +1,213 @@
+"""Caches of embedding vectors.
+
+``EmbeddingCache`` is persistent and content-addressed: vectors are stored
+in a SQLite database keyed by ``sha256(provider, model, dimensions, text)``,
+so re-ingesting unchanged files, ``kb_resync`` and repeated similarity
+lookups never pay for the same provider call twice – even across
+restarts.  Vectors are kept as float32 blobs; when the total blob size
+exceeds ``max_bytes`` the least recently used entries are evicted.
+
+``QueryVectorCache`` is a small in-process LRU for query vectors with
+single-flight de-duplication: concurrent requests for the same query
+share one provider call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# After exceeding the budget, evict down to this fraction of it so that
+# eviction runs once per burst of inserts rather than on every insert.
+_EVICT_TO = 0.9
+# SQLite limits the number of bound parameters per statement.
+_SQL_BATCH = 500
+
+
+def cache_key(provider: str, model: str, dimensions: int, text: str) -> bytes:
+    """Return the content address of *text* embedded by *provider*/*model*."""
+    digest = hashlib.sha256()
+    for part in (provider, model, str(dimensions), text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache with size-based LRU eviction."""
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        self._total_bytes = int(row[0])
+
+    def get_many(self, keys: Iterable[bytes]) -> dict[bytes, np.ndarray]:
+        """Return cached float32 vectors for *keys* (missing keys are omitted)."""
+        wanted = list(dict.fromkeys(keys))
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(wanted), _SQL_BATCH):
+                batch = wanted[start : start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[tuple[bytes, np.ndarray]]) -> None:
+        """Store ``(key, vector)`` pairs, evicting old entries if over budget."""
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items]
+        if not rows:
+            return
+        with self._lock:
+            keys = [key for key, _, _ in rows]
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start : start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                row = self._conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchone()
+                self._total_bytes -= int(row[0])
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+            self._total_bytes += sum(len(blob) for _, blob, _ in rows)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        target = int(self.max_bytes * _EVICT_TO)
+        cursor = self._conn.execute("SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used")
+        doomed: list[bytes] = []
+        freed = 0
+        for key, size in cursor:
+            if self._total_bytes - freed <= target:
+                break
+            doomed.append(key)
+            freed += int(size)
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key in doomed])
+        self._total_bytes -= freed
+        self.evictions += len(doomed)
+        logger.debug("Embedding cache evicted %d entries (%d bytes)", len(doomed), freed)
+
+    def stats(self) -> dict[str, float | int]:
+        """Return entry count, size and hit/miss counters since start-up."""
+        with self._lock:
+            entries = int(self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class QueryVectorCache:
+    """Bounded in-memory LRU of query vectors with single-flight lookups."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._entries: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._in_flight: dict[bytes, Future[np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: bytes, compute: Callable[[], tuple[np.ndarray, bool]]) -> np.ndarray:
+        """Return the vector for *key*, calling *compute* at most once at a time.
+
+        *compute* returns ``(vector, cacheable)``; vectors that should not
+        outlive the call (e.g. fallbacks) are handed to waiting callers but
+        not stored.
+        """
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                self.shared += 1
+            else:
+                self.misses += 1
+                future: Future[np.ndarray] = Future()
+                self._in_flight[key] = future
+        if pending is not None:
+            return pending.result()
+
+        try:
+            vector, cacheable = compute()
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            if cacheable and self.max_entries > 0:
+                self._entries[key] = vector
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(vector)
+        return vector
+
+    def stats(self) -> dict[str, float | int]:
+        """Return size and hit/miss/shared counters since start-up."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.shared
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_in_flight": self.shared,
+                "hit_rate": (self.hits + self.shared) / lookups if lookups else 0.0,
+            }
@@ -1,55 +1,58 @@
 from __future__ import annotations
 
-import collections
 import logging
+import threading
 import time
-from typing import Iterable
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Iterable, TypeVar
 
-from staged_rag.embeddings import EmbedderFactory, EmbeddingBase
-from staged_rag.utils import deterministic_vector
+import numpy as np
 
-try:
-    from google import genai as _genai_module
-except ImportError:  # pragma: no cover
-    _genai_module = None  # type: ignore[assignment]
+from staged_rag.core.embedding_cache import EmbeddingCache, QueryVectorCache, cache_key
+from staged_rag.core.failover import ProviderBackend, validate_chain
+from staged_rag.core.micro_batcher import MicroBatcher
+from staged_rag.core.rate_limiter import BULK, INTERACTIVE, RateLimiter, get_rate_limiter
+from staged_rag.core.resilience import CircuitBreaker, backoff_delay, is_rate_limit_error, retry_after_seconds
+from staged_rag.embeddings import EmbeddingBase
+from staged_rag.utils import deterministic_vectors
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 # Singleton genai client for summary generator (cross-cutting concern)
 _genai_client_instance = None
 
 
 def _get_genai_client(api_key: str):
-    """Return a singleton google.genai.Client for non-embedding uses (e.g. summaries)."""
+    """Return a singleton google.genai.Client for non-embedding uses (e.g. summaries).
+
+    ``google.genai`` is imported here, on first use: it is the slowest
+    import in the package and most sessions never generate a summary.
+    """
     global _genai_client_instance
     if _genai_client_instance is None:
-        if _genai_module is None:
-            raise ImportError("google-genai is not installed")
-        _genai_client_instance = _genai_module.Client(api_key=api_key)
-    return _genai_client_instance
-
-# Light retry
-_MAX_RETRIES = 2
-_RETRY_DELAY = 5  # seconds
-
-# Rate-limiter: pace API requests at ~80 RPM to leave headroom for free tiers.
-_RPM_LIMIT = 80
-_RPM_WINDOW = 60  # seconds
-
-_call_timestamps: collections.deque[float] = collections.deque()
+        try:
+            from google import genai
+        except ImportError as exc:
+            raise ImportError("google-genai is not installed") from exc
+        from staged_rag.http_pool import get_http_client
 
+        http_client = get_http_client()
+        http_options = genai.types.HttpOptions(httpx_client=http_client) if http_client is not None else None
+        _genai_client_instance = genai.Client(api_key=api_key, http_options=http_options)
+    return _genai_client_instance
 
-def _pace_request() -> None:
-    """Block if we've hit the per-minute request budget."""
-    now = time.monotonic()
-    while _call_timestamps and _call_timestamps[0] < now - _RPM_WINDOW:
-        _call_timestamps.popleft()
-    if len(_call_timestamps) >= _RPM_LIMIT:
-        sleep_for = _call_timestamps[0] + _RPM_WINDOW - now + 0.1
-        if sleep_for > 0:
-            logger.info("Embedding rate-limiter: sleeping %.1fs", sleep_for)
-            time.sleep(sleep_for)
-    _call_timestamps.append(time.monotonic())
+# Retry with exponential backoff and full jitter
+_MAX_RETRIES = 4
+_RETRY_BASE_DELAY = 0.5  # seconds
+_RETRY_MAX_DELAY = 30.0  # seconds
+# A user is waiting on interactive calls: retry once, briefly, then fall back.
+_INTERACTIVE_MAX_ATTEMPTS = 2
+_INTERACTIVE_MAX_DELAY = 2.0  # seconds
 
 
 class EmbeddingEngine:
@@ -57,14 +60,51 @@ class EmbeddingEngine:
 
     Wraps an ``EmbeddingBase`` provider (created via ``EmbedderFactory``) and
     adds:
-    * Per-minute rate pacing (80 RPM default)
-    * Light retry on transient failures
-    * Deterministic vector fallback when the API is unavailable
+    * Optional persistent cache: texts embedded before are served from an
+      ``EmbeddingCache`` without a provider call
+    * Optional query LRU: ``encode_query`` serves repeated queries from
+      memory and shares one provider call between concurrent duplicates
+    * Batching: ``encode`` sends up to ``batch_size`` texts per provider call
+    * Bounded concurrency: at most ``max_in_flight`` provider calls run at
+      once across all callers; ``encode`` fans its batches out on a thread
+      pool and results keep input order
+    * Micro-batching: concurrent single-text interactive requests arriving
+      within ``micro_batch_window`` seconds share one provider call
+    * Per-provider token-bucket rate limiting (requests and tokens per
+      minute) with an interactive lane for queries that preempts bulk
+      ingestion
+    * Retry with exponential backoff and jitter that honours Retry-After
+      on 429s, and a circuit breaker that skips the provider while it is
+      down
+    * Failover: an ordered chain of providers (``failover``) that must
+      share one model family and dimension; a failing or open-circuit
+      provider hands the batch to the next one.  With ``hedge_percentile``
+      set, an interactive request slower than that percentile of its
+      provider's recent latencies is also sent to the next provider, and
+      the first answer wins
+    * Deterministic vector fallback when the API is unavailable; callers
+      that persist vectors use ``encode_with_fallback`` to learn which
+      ones must be re-embedded later
 
     The engine is provider-agnostic — it delegates the actual embedding call
     to whichever provider is configured (Gemini, OpenAI, Ollama, etc.).
+
+    The provider is constructed on first use, not in ``__init__``: loading a
+    local model or checking an Ollama server can take seconds, and the MCP
+    server must answer before that.  ``warm_up`` builds it in a background
+    thread; ``status`` reports progress.
+
+    Vectors are returned as contiguous float32 NumPy arrays: ``encode``
+    gives an ``(n, dimension)`` matrix and ``encode_query`` a 1-D row.
+    Provider output is converted once, at the provider boundary.
     """
 
+    # Provider construction states (see status)
+    PENDING = ProviderBackend.PENDING
+    LOADING = ProviderBackend.LOADING
+    READY = ProviderBackend.READY
+    FAILED = ProviderBackend.FAILED
+
     def __init__(
         self,
         provider: str = "gemini",
@@ -72,9 +112,38 @@ class EmbeddingEngine:
         model_name: str | None = None,
         dimension: int = 3072,
         provider_config: dict | None = None,
+        batch_size: int = 16,
+        cache: EmbeddingCache | None = None,
+        query_cache: QueryVectorCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = _MAX_RETRIES,
+        circuit_breaker: CircuitBreaker | None = None,
+        max_in_flight: int = 1,
+        micro_batch_window: float = 0.0,
+        failover: list[dict] | None = None,
+        model_family: str | None = None,
+        hedge_percentile: float = 0.0,
     ) -> None:
         self.provider_name = provider
         self.dimension = dimension
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.query_cache = query_cache
+        self.max_retries = max(1, int(max_retries))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.hedge_percentile = float(hedge_percentile)
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._worker_state = threading.local()
+        self.micro_batcher = (
+            MicroBatcher(lambda texts: self._embed_with_retry(texts, INTERACTIVE), self.batch_size, micro_batch_window)
+            if micro_batch_window > 0
+            else None
+        )
 
         # Build provider config dict from explicit args + extra config
         cfg: dict = dict(provider_config or {})
@@ -85,62 +154,331 @@ class EmbeddingEngine:
         if dimension:
             cfg.setdefault("embedding_dims", dimension)
 
-        # Create the provider via factory (lazy import)
-        try:
-            self._provider: EmbeddingBase | None = EmbedderFactory.create(provider, cfg)
-            logger.info(
-                "Embedding engine initialised: provider=%s, model=%s, dims=%d",
-                provider, self._provider.config.model, dimension,
+        # Providers are created via the factory on first use (see provider)
+        circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._backends = [
+            ProviderBackend(
+                provider,
+                cfg,
+                dimension,
+                circuit_breaker,
+                rate_limiter or get_rate_limiter(provider),
+                model_family,
             )
-        except Exception as exc:
-            logger.warning(
-                "Failed to initialise %s embedding provider (%s) – "
-                "will use deterministic fallback only",
-                provider, exc,
+        ]
+        for position, entry in enumerate(failover or [], start=1):
+            entry_cfg = dict(entry.get("provider_config") or {})
+            if entry.get("model"):
+                entry_cfg.setdefault("model", entry["model"])
+            entry_cfg.setdefault("embedding_dims", dimension)
+            self._backends.append(
+                ProviderBackend(
+                    entry["provider"],
+                    entry_cfg,
+                    int(entry.get("dimensions") or dimension),
+                    CircuitBreaker(circuit_breaker.failure_threshold, circuit_breaker.reset_timeout),
+                    # Keyed by chain position: a backup may use the same
+                    # provider as the primary (another endpoint) but never
+                    # shares or reconfigures its budget.
+                    get_rate_limiter(
+                        f"{entry['provider']}#failover{position}",
+                        entry.get("requests_per_minute", 0),
+                        entry.get("tokens_per_minute", 0),
+                    ),
+                    entry.get("model_family"),
+                )
             )
-            self._provider = None
+        validate_chain(self._backends)
 
     @property
     def provider(self) -> EmbeddingBase | None:
-        """The underlying embedding provider instance."""
-        return self._provider
+        """The primary embedding provider instance, created on first access.
+
+        ``None`` if construction failed; the engine then uses the failover
+        providers, or deterministic fallback vectors.
+        """
+        return self._backends[0].provider
 
-    def _embed_with_retry(self, text: str) -> list[float]:
-        """Call the provider's embed() with a light retry on transient errors."""
-        if self._provider is None:
-            return deterministic_vector(text, self.dimension)
+    @provider.setter
+    def provider(self, provider: EmbeddingBase | None) -> None:
+        """Install *provider* directly (``None`` forces the deterministic fallback)."""
+        self._backends[0].provider = provider
 
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """The primary provider's circuit breaker."""
+        return self._backends[0].circuit_breaker
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The primary provider's rate limiter."""
+        return self._backends[0].rate_limiter
+
+    @property
+    def provider_state(self) -> str:
+        """``pending``, ``loading``, ``ready`` or ``failed`` (never blocks)."""
+        return self._backends[0].state
+
+    @property
+    def available(self) -> bool:
+        """True if some provider in the chain may be called (never blocks)."""
+        return any(backend.usable for backend in self._backends)
+
+    def warm_up(self) -> threading.Thread | None:
+        """Construct the providers in a daemon thread; no-op once attempted."""
+        if self.provider_state != self.PENDING:
+            return None
+
+        def build() -> None:
+            for backend in self._backends:
+                backend.provider
+
+        thread = threading.Thread(target=build, daemon=True, name="embedding-warm-up")
+        thread.start()
+        return thread
+
+    def status(self) -> dict[str, object]:
+        """Return the providers' readiness without triggering construction."""
+        primary = self._backends[0].status()
+        payload: dict[str, object] = {"provider": primary.pop("provider"), "model": primary.pop("model")}
+        payload.update(dimension=self.dimension, **primary)
+        if len(self._backends) > 1:
+            payload["failover"] = [backend.status() for backend in self._backends[1:]]
+            payload["hedging"] = {
+                "percentile": self.hedge_percentile,
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+            }
+        return payload
+
+    def _embed_with_retry(self, texts: list[str], priority: str = BULK) -> tuple[np.ndarray, bool]:
+        """Embed *texts* through the provider chain, retrying transient errors with backoff.
+
+        Each attempt tries the providers in order, skipping those whose
+        circuit is open, so a failing primary fails over to the next one
+        immediately.  Interactive requests may be hedged (see ``_hedged``).
+        Returns the vectors and whether they came from a provider (False
+        when the deterministic fallback was used).
+        """
+        interactive = priority == INTERACTIVE
+        attempts = min(self.max_retries, _INTERACTIVE_MAX_ATTEMPTS) if interactive else self.max_retries
         last_exc: Exception | None = None
-        for attempt in range(_MAX_RETRIES):
-            try:
-                _pace_request()
-                return self._provider.embed(text)
-            except Exception as exc:
-                last_exc = exc
-                if attempt < _MAX_RETRIES - 1:
-                    logger.warning(
-                        "Embedding attempt %d/%d failed – retrying in %ds: %s",
-                        attempt + 1, _MAX_RETRIES, _RETRY_DELAY, exc,
-                    )
-                    time.sleep(_RETRY_DELAY)
+        for attempt in range(attempts):
+            tried = blocked = False
+            for index, backend in enumerate(self._backends):
+                if backend.provider is None:
+                    continue
+                if not backend.circuit_breaker.allow():
+                    blocked = True
+                    continue
+                tried = True
+                try:
+                    if interactive and self.hedge_percentile > 0:
+                        return self._hedged(backend, self._backends[index + 1 :], texts, priority), True
+                    return backend.embed_batch(texts, priority, self._in_flight), True
+                except Exception as exc:
+                    last_exc = exc
+                    if index + 1 < len(self._backends):
+                        logger.warning("Embedding provider %s failed – failing over: %s", backend.name, exc)
+            if not tried:
+                if blocked:
+                    logger.warning("Embedding circuit open for %s – using deterministic fallback", self.provider_name)
+                return deterministic_vectors(texts, self.dimension), False
+            if attempt == attempts - 1 or not self.available:
+                break
+            retry_after = (
+                retry_after_seconds(last_exc) if last_exc is not None and is_rate_limit_error(last_exc) else None
+            )
+            if interactive and retry_after is not None and retry_after > _INTERACTIVE_MAX_DELAY:
+                break
+            delay = backoff_delay(
+                attempt,
+                _RETRY_BASE_DELAY,
+                _INTERACTIVE_MAX_DELAY if interactive else _RETRY_MAX_DELAY,
+                retry_after,
+            )
+            logger.warning(
+                "Embedding attempt %d/%d failed – retrying in %.1fs: %s",
+                attempt + 1, attempts, delay, last_exc,
+            )
+            time.sleep(delay)
 
         logger.error(
             "Embedding failed after %d attempt(s), using deterministic fallback: %s",
-            _MAX_RETRIES, last_exc,
+            attempt + 1, last_exc,
         )
-        return deterministic_vector(text, self.dimension)
+        return deterministic_vectors(texts, self.dimension), False
 
-    def encode(self, texts: Iterable[str]) -> list[list[float]]:
-        """Return embedding vectors for a batch of texts.
+    def _hedged(
+        self, backend: ProviderBackend, alternates: list[ProviderBackend], texts: list[str], priority: str
+    ) -> np.ndarray:
+        """Call *backend*; if it is slower than its ``hedge_percentile`` latency, race an alternate.
 
-        Uses the configured provider, falling back to deterministic vectors
-        if the provider is unavailable or all API calls fail.
+        The first successful response wins.  The slower request is not
+        cancelled (the SDKs are synchronous) but its result is discarded.
+        The hedge duplicates a request that already holds one of the
+        ``max_in_flight`` slots and takes none itself, so hedging works
+        even when the bound is 1.
         """
-        texts_list = list(texts)
+        delay = backend.latency_percentile(self.hedge_percentile)
+        if delay is None or not any(alternate.usable for alternate in alternates):
+            return backend.embed_batch(texts, priority, self._in_flight)
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(2 * self.max_in_flight, thread_name_prefix="embedding-hedge")
+        first = self._hedge_executor.submit(backend.embed_batch, texts, priority, self._in_flight)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        for alternate in alternates:
+            if alternate.provider is not None and alternate.circuit_breaker.allow():
+                second = self._hedge_executor.submit(alternate.embed_batch, texts, priority)
+                break
+        else:
+            return first.result()
+        with self._executor_lock:
+            self.hedged_requests += 1
+        error: Exception | None = None
+        for future in as_completed((first, second)):
+            try:
+                vectors = future.result()
+            except Exception as exc:
+                error = exc
+                continue
+            if future is second:
+                with self._executor_lock:
+                    self.hedge_wins += 1
+            return vectors
+        assert error is not None
+        raise error
+
+    def _cache_key(self, text: str) -> bytes:
+        # Keyed by the configured primary model, whichever backend serves
+        # the request: the chain shares one model family, and the key must
+        # not change when the primary fails to construct.
+        model = self._backends[0].config.get("model")
+        return cache_key(self.provider_name, model or "", self.dimension, text)
+
+    def _map(self, func: Callable[[_T], _R], items: list[_T]) -> list[_R]:
+        """Apply *func* to *items* with at most ``max_in_flight`` running at once.
+
+        Results keep the order of *items*.  Calls made from a pool worker
+        run inline so nested fan-out cannot exhaust the pool.
+        """
+        if self.max_in_flight == 1 or len(items) <= 1 or getattr(self._worker_state, "active", False):
+            return [func(item) for item in items]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="embedding")
+
+        def run(item: _T) -> _R:
+            self._worker_state.active = True
+            try:
+                return func(item)
+            finally:
+                self._worker_state.active = False
+
+        return list(self._executor.map(run, items))
+
+    def _encode_batches(
+        self, texts: list[str], keys: list[bytes] | None = None, priority: str = BULK
+    ) -> tuple[np.ndarray, list[bool]]:
+        def embed(start: int) -> tuple[np.ndarray, bool]:
+            batch_texts = texts[start : start + self.batch_size]
+            if self.micro_batcher is not None and priority == INTERACTIVE and len(batch_texts) == 1:
+                vector, from_provider = self.micro_batcher.submit(batch_texts[0])
+                batch_vectors = vector[None, :]
+            else:
+                batch_vectors, from_provider = self._embed_with_retry(batch_texts, priority)
+            # Fallback vectors are never cached, so the real embedding is
+            # fetched once the provider recovers.
+            if from_provider and keys is not None and self.cache is not None:
+                self.cache.put_many(zip(keys[start : start + self.batch_size], batch_vectors))
+            return batch_vectors, from_provider
+
+        batches = self._map(embed, list(range(0, len(texts), self.batch_size)))
+        fallback: list[bool] = []
+        for batch_vectors, from_provider in batches:
+            fallback.extend([not from_provider] * len(batch_vectors))
+        vectors = batches[0][0] if len(batches) == 1 else np.concatenate([batch for batch, _ in batches])
+        return vectors, fallback
+
+    def encode(self, texts: Iterable[str], priority: str = BULK) -> np.ndarray:
+        """Return a ``(len(texts), dimension)`` float32 matrix of embeddings.
+
+        Cached texts are served from the embedding cache; the rest are
+        de-duplicated and sent to the provider in requests of at most
+        ``batch_size``.  Uses the provider chain, falling back to
+        deterministic vectors if no provider could be built or all API
+        calls for a batch fail.
+
+        *priority* selects the rate-limiter lane: ``"bulk"`` (default) for
+        ingestion, ``"interactive"`` for work a user is waiting on.
+        """
+        return self._encode(list(texts), priority)[0]
+
+    def encode_lists(self, texts: Iterable[str], priority: str = BULK) -> list[list[float]]:
+        """Compatibility shim for the old ``list[list[float]]`` contract of ``encode``."""
+        warnings.warn(
+            "EmbeddingEngine.encode now returns a float32 ndarray; encode_lists() is deprecated.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.encode(texts, priority).tolist()
+
+    def encode_with_fallback(
+        self, texts: Iterable[str], priority: str = BULK
+    ) -> tuple[np.ndarray, list[bool]]:
+        """Like ``encode`` but also return, per text, whether its vector is a fallback.
+
+        Use this when the vectors are persisted, so that fallback vectors
+        can be flagged in the index and re-embedded later.
+        """
+        return self._encode(list(texts), priority)
+
+    def encode_queries(self, texts: list[str]) -> np.ndarray:
+        """Return the embeddings of several search queries, fetched concurrently."""
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack(self._map(self.encode_query, texts))
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Return the embedding of a search query as a read-only float32 row.
+
+        Served from the in-memory query LRU when configured; concurrent
+        calls for the same text wait for a single provider request.
+        """
+        if self.query_cache is None:
+            return self.encode([text], INTERACTIVE)[0]
+
+        def compute() -> tuple[np.ndarray, bool]:
+            vectors, fallback = self._encode([text], INTERACTIVE)
+            # Shared between callers through the LRU: keep it immutable.
+            vector = vectors[0]
+            vector.flags.writeable = False
+            return vector, not fallback[0]
+
+        return self.query_cache.get_or_compute(self._cache_key(text), compute)
+
+    def _encode(self, texts_list: list[str], priority: str = BULK) -> tuple[np.ndarray, list[bool]]:
+        """Encode *texts_list*; the flags mark deterministic fallback vectors."""
         if not texts_list:
-            return []
+            return np.empty((0, self.dimension), dtype=np.float32), []
+
+        if all(backend.provider is None for backend in self._backends):
+            return deterministic_vectors(texts_list, self.dimension), [True] * len(texts_list)
 
-        if self._provider is None:
-            return [deterministic_vector(t, self.dimension) for t in texts_list]
+        if self.cache is None:
+            return self._encode_batches(texts_list, priority=priority)
 
-        return [self._embed_with_retry(t) for t in texts_list]
+        keys = [self._cache_key(text) for text in texts_list]
+        vectors = self.cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts_list) if key not in vectors}
+        fallback_keys: set[bytes] = set()
+        if missing:
+            miss_keys = list(missing)
+            miss_vectors, miss_fallback = self._encode_batches(list(missing.values()), miss_keys, priority)
+            vectors.update(zip(miss_keys, miss_vectors))
+            fallback_keys = {key for key, flag in zip(miss_keys, miss_fallback) if flag}
+        return np.stack([vectors[key] for key in keys]), [key in fallback_keys for key in keys]
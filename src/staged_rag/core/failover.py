@@ -0,0 +1,174 @@
+"""Embedding providers in an ordered failover chain.
+
+``EmbeddingEngine`` holds one ``ProviderBackend`` per configured provider:
+the primary first, then the ``embedding.failover`` entries.  Each backend
+builds its provider lazily (through ``EmbedderFactory.create``) and has
+its own circuit breaker, rate limiter and a window of recent call
+latencies, which the engine uses to decide when to hedge a slow request.
+
+Vectors from different backends are stored side by side in the same
+index, so every backend must produce the same dimensions from the same
+model family.  ``validate_chain`` rejects mismatched configurations up
+front; each backend also checks the dimensions of its provider when it is
+built and of every response.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any
+
+import numpy as np
+
+from staged_rag.core.rate_limiter import RateLimiter
+from staged_rag.core.resilience import CircuitBreaker
+from staged_rag.embeddings import EmbedderFactory, EmbeddingBase
+from staged_rag.utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per backend, and how many are needed before hedging.
+_LATENCY_WINDOW = 200
+_MIN_LATENCY_SAMPLES = 20
+
+
+class ProviderBackend:
+    """One embedding provider with its own breaker, limiter and latency history."""
+
+    # Provider construction states (see EmbeddingEngine.status)
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        name: str,
+        config: dict[str, Any],
+        dimension: int,
+        circuit_breaker: CircuitBreaker,
+        rate_limiter: RateLimiter,
+        model_family: str | None = None,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.dimension = dimension
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.model_family = model_family or config.get("model") or ""
+        self.state = self.PENDING
+        self.error: str | None = None
+        self.init_seconds: float | None = None
+        self._provider: EmbeddingBase | None = None
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    @property
+    def provider(self) -> EmbeddingBase | None:
+        """The provider instance, created on first access (``None`` if that failed)."""
+        if self.state in (self.READY, self.FAILED):
+            return self._provider
+        with self._lock:
+            if self.state in (self.READY, self.FAILED):
+                return self._provider
+            self.state = self.LOADING
+            started = time.perf_counter()
+            try:
+                provider = EmbedderFactory.create(self.name, self.config)
+                dims = provider.config.embedding_dims
+                if dims and int(dims) != self.dimension:
+                    raise ValueError(f"provider produces {dims}-dimensional vectors, index expects {self.dimension}")
+                self._provider = provider
+                self.state = self.READY
+                logger.info(
+                    "Embedding provider initialised: provider=%s, model=%s, dims=%d",
+                    self.name, provider.config.model, self.dimension,
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Failed to initialise %s embedding provider (%s) – it will be skipped",
+                    self.name, exc,
+                )
+                self._provider = None
+                self.error = f"{type(exc).__name__}: {exc}"
+                self.state = self.FAILED
+            self.init_seconds = time.perf_counter() - started
+            return self._provider
+
+    @provider.setter
+    def provider(self, provider: EmbeddingBase | None) -> None:
+        with self._lock:
+            self._provider = provider
+            self.state = self.READY if provider is not None else self.FAILED
+
+    @property
+    def usable(self) -> bool:
+        """False once construction failed or while the circuit is open (never blocks)."""
+        return self.state != self.FAILED and self.circuit_breaker.state != CircuitBreaker.OPEN
+
+    def embed_batch(
+        self, texts: list[str], priority: str, slot: AbstractContextManager[Any] | None = None
+    ) -> np.ndarray:
+        """Embed *texts* through this provider; failures are recorded and re-raised.
+
+        *slot* (the engine's ``max_in_flight`` semaphore) is entered only
+        once the rate limiter has admitted the request, so a request
+        waiting for budget never holds a concurrency slot.
+        """
+        provider = self.provider
+        if provider is None:
+            raise RuntimeError(f"Embedding provider {self.name} is unavailable: {self.error}")
+        try:
+            self.rate_limiter.acquire(sum(count_tokens(text) for text in texts), priority)
+            started = time.perf_counter()
+            with slot if slot is not None else nullcontext():
+                vectors = np.asarray(provider.embed_batch(texts), dtype=np.float32)
+            if vectors.ndim != 2 or len(vectors) != len(texts):
+                raise ValueError(f"Provider returned {len(vectors)} vectors for {len(texts)} texts")
+            if vectors.shape[1] != self.dimension:
+                raise ValueError(f"Provider returned {vectors.shape[1]}-dimensional vectors, expected {self.dimension}")
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        self._latencies.append(time.perf_counter() - started)
+        self.circuit_breaker.record_success()
+        return vectors
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Return the *percentile* of recent call latencies, or ``None`` with too few samples."""
+        samples = list(self._latencies)
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return None
+        return float(np.percentile(samples, percentile))
+
+    def status(self) -> dict[str, Any]:
+        model = self._provider.config.model if self._provider is not None else self.config.get("model")
+        return {
+            "provider": self.name,
+            "model": model,
+            "state": self.state,
+            "error": self.error,
+            "init_seconds": round(self.init_seconds, 3) if self.init_seconds is not None else None,
+            "circuit": self.circuit_breaker.state,
+        }
+
+
+def validate_chain(backends: list[ProviderBackend]) -> None:
+    """Raise ``ValueError`` unless all *backends* share one model family and dimension."""
+    primary = backends[0]
+    for backend in backends[1:]:
+        if backend.dimension != primary.dimension:
+            raise ValueError(
+                f"Failover provider {backend.name} has {backend.dimension} dimensions, "
+                f"primary {primary.name} has {primary.dimension}"
+            )
+        if backend.model_family != primary.model_family:
+            raise ValueError(
+                f"Failover provider {backend.name} uses model family {backend.model_family!r}, "
+                f"primary {primary.name} uses {primary.model_family!r}; vectors would not be comparable. "
+                "Set the same model_family on both if they serve the same model under different names."
+            )
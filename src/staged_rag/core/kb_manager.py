@@ -173,13 +173,14 @@ class KnowledgeBaseManager:
         poll_interval: float = 5.0,
         max_file_size: int = DEFAULT_MAX_FILE_SIZE,
         auto_summary: bool = True,
+        codec: str | None = None,
     ) -> None:
         self.kb_dir = kb_dir.resolve()
         self.collection = collection
         self.max_file_size = max_file_size
         self.auto_summary = auto_summary
 
-        self.manifest = KBManifest(manifest_path, self.kb_dir)
+        self.manifest = KBManifest(manifest_path, self.kb_dir, codec=codec)
 
         self.watcher = FileWatcher(
             watch_dir=self.kb_dir,
@@ -8,12 +8,13 @@ server restarts without re-scanning the vector store.
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from staged_rag.core import codecs
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,10 +74,13 @@ class ManifestEntry:
 
 
 class KBManifest:
-    """JSON-backed manifest that tracks knowledge-base file → doc_id mappings.
+    """File-backed manifest that tracks knowledge-base file → doc_id mappings.
 
     The manifest file is stored alongside the data directory so that it
-    persists across server restarts.
+    persists across server restarts.  It is written with the configured
+    storage codec under that codec's extension (``kb_manifest.pickle`` for
+    a configured ``kb_manifest.json``); a manifest in another format is
+    converted on load.
 
     Schema::
 
@@ -98,9 +102,10 @@ class KBManifest:
 
     VERSION = 1
 
-    def __init__(self, manifest_path: Path, kb_dir: Path) -> None:
-        self.manifest_path = manifest_path
+    def __init__(self, manifest_path: Path, kb_dir: Path, codec: str | None = None) -> None:
         self.kb_dir = kb_dir
+        self.codec = codecs.get_codec(codec)
+        self.manifest_path = manifest_path.with_name(manifest_path.stem + self.codec.extension)
         self._entries: dict[str, ManifestEntry] = {}
         self._load()
 
@@ -109,10 +114,14 @@ class KBManifest:
     # ------------------------------------------------------------------
 
     def _load(self) -> None:
+        try:
+            codecs.codec_path(self.manifest_path.parent, self.manifest_path.stem, self.codec)
+        except Exception:
+            logger.exception("Failed to convert the KB manifest to %s", self.manifest_path.name)
         if not self.manifest_path.exists():
             return
         try:
-            raw = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            raw = codecs.read_file(self.manifest_path)
             for rel_path, entry_data in raw.get("files", {}).items():
                 self._entries[rel_path] = ManifestEntry.from_dict(entry_data)
             logger.info("Loaded KB manifest with %d entries", len(self._entries))
@@ -136,7 +145,7 @@ class KBManifest:
                 "last_scan": datetime.now(timezone.utc).isoformat(),
             },
         }
-        self.manifest_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        codecs.write_file(self.manifest_path, payload, self.codec)
 
     # ------------------------------------------------------------------
     # CRUD
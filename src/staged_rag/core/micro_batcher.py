@@ -0,0 +1,96 @@
+"""Coalesce concurrent single-text embedding requests into batch calls.
+
+Under the streamable-HTTP transport many agents search at once, and each
+query embedding is a one-text provider call.  ``MicroBatcher`` collects
+requests that arrive within a short window (or until ``max_batch`` are
+waiting) and sends them as one ``embed_batch`` call, which is far cheaper
+per text for local models and costs one rate-limit slot for hosted APIs.
+
+There is no background thread: the first waiting caller becomes the
+leader, waits out the window, sends the batch and scatters the results;
+the others block on their futures.  Leadership passes on as soon as a
+batch is taken, so while it is in flight the next waiter collects and
+sends the following batch (the engine's ``max_in_flight`` bounds how
+many run at once).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+EmbedBatch = Callable[[list[str]], tuple[np.ndarray, bool]]
+
+
+class MicroBatcher:
+    """Batch concurrent ``submit`` calls into ``embed_batch`` calls.
+
+    *embed_batch* returns ``(vectors, from_provider)`` for a list of texts;
+    ``submit`` returns ``(vector, from_provider)`` for one text.
+    """
+
+    def __init__(self, embed_batch: EmbedBatch, max_batch: int = 16, window: float = 0.005) -> None:
+        self._embed_batch = embed_batch
+        self.max_batch = max(1, int(max_batch))
+        self.window = max(0.0, float(window))
+        self._pending: list[tuple[str, Future[tuple[np.ndarray, bool]]]] = []
+        self._leading = False
+        self._cond = threading.Condition()
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, text: str) -> tuple[np.ndarray, bool]:
+        """Embed *text*, possibly together with concurrent callers' texts."""
+        future: Future[tuple[np.ndarray, bool]] = Future()
+        entry = (text, future)
+        with self._cond:
+            self._pending.append(entry)
+            self.requests += 1
+            # Wake a leader waiting for its batch to fill.
+            self._cond.notify_all()
+        while True:
+            with self._cond:
+                while self._leading and entry in self._pending:
+                    self._cond.wait()
+                if entry not in self._pending:
+                    # Taken by a leader; the batch may still be in flight.
+                    break
+                self._leading = True
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+                self.batches += 1
+                # Hand over leadership before the provider call, so the next
+                # batch can be collected (and sent) while this one is in flight.
+                self._leading = False
+                self._cond.notify_all()
+            self._run(batch)
+        return future.result()
+
+    def _run(self, batch: list[tuple[str, Future[tuple[np.ndarray, bool]]]]) -> None:
+        try:
+            vectors, from_provider = self._embed_batch([text for text, _ in batch])
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result((vector, from_provider))
+        except BaseException as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def stats(self) -> dict[str, float | int]:
+        """Return request/batch counters since start-up."""
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            }
@@ -0,0 +1,155 @@
+"""Per-provider token-bucket rate limiting with priority lanes.
+
+Each embedding provider gets one ``RateLimiter`` (see ``get_rate_limiter``)
+shared by every engine that talks to it.  The limiter refills two buckets
+continuously – requests per minute and, optionally, input tokens per
+minute – and callers block until their request fits.
+
+Two lanes share the buckets:
+
+* ``interactive`` – query-time embeddings (``search_summaries`` etc.).
+  They are served first and may use the whole bucket.
+* ``bulk`` – ingestion and re-embedding.  Bulk callers yield whenever an
+  interactive caller is waiting and never draw the buckets below a
+  reserve kept for interactive traffic, so a KB resync cannot make a
+  user's search wait for its backlog.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Fraction of each bucket that bulk requests may not consume.
+_DEFAULT_INTERACTIVE_RESERVE = 0.2
+
+
+class RateLimiter:
+    """Thread-safe token bucket over requests/min and tokens/min.
+
+    A limit of 0 disables that bucket.  Bucket capacity equals one minute
+    of budget, matching the burst a sliding one-minute window allows.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 80,
+        tokens_per_minute: float = 0,
+        interactive_reserve: float = _DEFAULT_INTERACTIVE_RESERVE,
+    ) -> None:
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute)
+        self.interactive_reserve = min(max(float(interactive_reserve), 0.0), 0.9)
+        self._requests = self.requests_per_minute
+        self._tokens = self.tokens_per_minute
+        self._updated = time.monotonic()
+        self._interactive_waiting = 0
+        self._cond = threading.Condition()
+        self.waited_seconds = {INTERACTIVE: 0.0, BULK: 0.0}
+
+    def acquire(self, tokens: int = 0, priority: str = BULK) -> float:
+        """Block until one request of *tokens* input tokens may be sent.
+
+        Returns the number of seconds spent waiting.
+        """
+        if priority not in (INTERACTIVE, BULK):
+            raise ValueError(f"Unknown priority lane: {priority!r}")
+        start = time.monotonic()
+        with self._cond:
+            if priority == INTERACTIVE:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    wait = self._wait_time(tokens, priority)
+                    if wait == 0.0:
+                        self._requests -= 1 if self.requests_per_minute else 0
+                        self._tokens -= self._token_cost(tokens) if self.tokens_per_minute else 0
+                        break
+                    self._cond.wait(wait)
+            finally:
+                if priority == INTERACTIVE:
+                    self._interactive_waiting -= 1
+                    # Let bulk waiters re-check once the interactive lane drains.
+                    self._cond.notify_all()
+            waited = time.monotonic() - start
+            self.waited_seconds[priority] += waited
+        if waited >= 1.0:
+            logger.info("Embedding rate-limiter: %s request waited %.1fs", priority, waited)
+        return waited
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60.0)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60.0)
+
+    def _token_cost(self, tokens: int) -> float:
+        # A single request larger than the bucket could never be admitted;
+        # charge it the most the bulk lane can hold (the bucket minus the
+        # interactive reserve) instead.
+        return min(float(tokens), self.tokens_per_minute * (1.0 - self.interactive_reserve))
+
+    def _wait_time(self, tokens: int, priority: str) -> float | None:
+        """Seconds until the request fits (0.0 = now, None = until notified)."""
+        if priority == BULK and self._interactive_waiting:
+            return None
+        reserve = self.interactive_reserve if priority == BULK else 0.0
+        wait = 0.0
+        if self.requests_per_minute:
+            needed = 1 + reserve * self.requests_per_minute
+            wait = max(wait, (needed - self._requests) * 60.0 / self.requests_per_minute)
+        if self.tokens_per_minute and tokens:
+            needed = self._token_cost(tokens) + reserve * self.tokens_per_minute
+            wait = max(wait, (needed - self._tokens) * 60.0 / self.tokens_per_minute)
+        return wait if wait > 0.0 else 0.0
+
+    def stats(self) -> dict[str, float]:
+        with self._cond:
+            self._refill()
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available_requests": round(self._requests, 2),
+                "available_tokens": round(self._tokens, 2),
+                "interactive_waited_seconds": round(self.waited_seconds[INTERACTIVE], 3),
+                "bulk_waited_seconds": round(self.waited_seconds[BULK], 3),
+            }
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str, requests_per_minute: float | None = None, tokens_per_minute: float | None = None
+) -> RateLimiter:
+    """Return the shared limiter for *provider*, creating it on first use.
+
+    Limits that are passed explicitly are applied to an existing limiter
+    in place, so that a reloaded configuration takes effect; omitted
+    limits leave it unchanged (a new limiter then uses the defaults).
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = RateLimiter(
+                80 if requests_per_minute is None else requests_per_minute,
+                0 if tokens_per_minute is None else tokens_per_minute,
+            )
+        else:
+            with limiter._cond:
+                if requests_per_minute is not None and limiter.requests_per_minute != requests_per_minute:
+                    limiter.requests_per_minute = limiter._requests = float(requests_per_minute)
+                if tokens_per_minute is not None and limiter.tokens_per_minute != tokens_per_minute:
+                    limiter.tokens_per_minute = limiter._tokens = float(tokens_per_minute)
+        return limiter
@@ -0,0 +1,122 @@
+"""Retry and circuit-breaker helpers for provider API calls.
+
+* ``is_rate_limit_error`` / ``retry_after_seconds`` classify a provider
+  exception and extract any server-supplied retry delay (``Retry-After``
+  header, Gemini ``retryDelay``, "retry in Ns" messages).
+* ``backoff_delay`` implements exponential backoff with full jitter that
+  never retries earlier than the server asked.
+* ``CircuitBreaker`` stops calling a provider after repeated failures and
+  lets a single probe through once the reset timeout has passed.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+
+_RETRY_IN_RE = re.compile(r"retry(?:ing)?\s+(?:in|after)\s+([\d.]+)\s*(ms|s|sec|seconds?)?", re.IGNORECASE)
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?([\d.]+)s", re.IGNORECASE)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return True if *exc* looks like a provider rate-limit (429) error."""
+    msg = str(exc).lower()
+    type_name = type(exc).__name__.lower()
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    return (
+        status == 429
+        or "429" in msg
+        or "resource exhausted" in msg
+        or "rate limit" in msg
+        or "quota" in msg
+        or "too many requests" in msg
+        or "resourceexhausted" in type_name
+        or "toomanyrequests" in type_name
+        or "ratelimit" in type_name
+    )
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the retry delay the server asked for, if *exc* carries one."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                pass
+    value = getattr(exc, "retry_after", None)
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    message = str(exc)
+    match = _RETRY_DELAY_RE.search(message)
+    if match:
+        return float(match.group(1))
+    match = _RETRY_IN_RE.search(message)
+    if match:
+        seconds = float(match.group(1))
+        return seconds / 1000.0 if (match.group(2) or "").lower() == "ms" else seconds
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: float | None = None) -> float:
+    """Full-jitter exponential backoff for retry number *attempt* (0-based)."""
+    delay = random.uniform(0.0, min(cap, base * (2**attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+class CircuitBreaker:
+    """Closed → open after *failure_threshold* consecutive failures.
+
+    While open, ``allow()`` returns False until *reset_timeout* seconds
+    have passed; then one caller is let through (half-open) and its
+    outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Let exactly one probe through.
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,81 @@
+"""Persistent cache of LLM-generated summaries.
+
+Summaries are keyed by ``sha256(model, max_sentences, sha256(text))``, so
+re-ingesting an unchanged file, a ``kb_resync`` or a duplicate document
+reuses the summary instead of paying for another generation call – even
+across restarts.  Only summaries produced by the LLM are stored; the
+extractive fallback is cheap to recompute and must not shadow a real
+summary once the API is reachable again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+def summary_key(model: str, max_sentences: int, text: str) -> bytes:
+    """Return the content address of the summary of *text* by *model*."""
+    digest = hashlib.sha256()
+    for part in (model, str(max_sentences), hashlib.sha256(text.encode("utf-8")).hexdigest()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+class SummaryCache:
+    """SQLite-backed summary cache (entries are a few hundred bytes; no eviction)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key BLOB PRIMARY KEY,"
+            " summary TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: bytes) -> str | None:
+        """Return the cached summary for *key*, or ``None``."""
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return str(row[0])
+
+    def put(self, key: bytes, summary: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                (key, summary, time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict[str, float | int]:
+        """Return the entry count and hit/miss counters since start-up."""
+        with self._lock:
+            entries = int(self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0])
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,31 +2,13 @@ from __future__ import annotations
 
 import logging
 
+from staged_rag.core.resilience import is_rate_limit_error
+from staged_rag.core.summary_cache import SummaryCache, summary_key
 from staged_rag.utils import extract_key_sentences, split_sentences
 
-try:
-    from google import genai
-except ImportError:  # pragma: no cover
-    genai = None
-
 logger = logging.getLogger(__name__)
 
 
-def _is_rate_limit_error(exc: Exception) -> bool:
-    """Return True if *exc* looks like a Gemini rate-limit (429) error."""
-    msg = str(exc).lower()
-    type_name = type(exc).__name__.lower()
-    return (
-        "429" in msg
-        or "resource exhausted" in msg
-        or "rate limit" in msg
-        or "quota" in msg
-        or "too many requests" in msg
-        or "resourceexhausted" in type_name
-        or "toomanyrequests" in type_name
-    )
-
-
 class SummaryGenerator:
     """Generate short summaries using Gemini with a local fallback.
 
@@ -34,12 +16,19 @@ class SummaryGenerator:
     The SDK has built-in tenacity retry.  This class tries once and falls back
     to a high-quality extractive summary if the API call fails, so the server
     never blocks for minutes due to exhausted free-tier quotas.
+
+    With a ``SummaryCache``, generated summaries are looked up by content
+    hash before any API call.  ``generate`` returns ``None`` instead of
+    falling back, for callers that retry later (deferred summaries).
     """
 
-    def __init__(self, api_key: str | None, model_name: str, max_sentences: int) -> None:
+    def __init__(
+        self, api_key: str | None, model_name: str, max_sentences: int, cache: SummaryCache | None = None
+    ) -> None:
         self.api_key = api_key
         self.model_name = model_name
         self.max_sentences = max_sentences
+        self.cache = cache
 
     def _local_fallback(self, text: str) -> str:
         """Extract the most informative sentences as an extractive summary.
@@ -49,27 +38,66 @@ class SummaryGenerator:
         """
         return extract_key_sentences(text, max_sentences=self.max_sentences)
 
+    @property
+    def can_generate(self) -> bool:
+        """True when an API key is configured (otherwise summaries are extractive)."""
+        return bool(self.api_key)
+
+    def extractive(self, text: str) -> str:
+        """Return the local extractive summary of *text* (no API call)."""
+        text = text.strip()
+        return self._local_fallback(text) if text else ""
+
+    def cached(self, text: str) -> str | None:
+        """Return the cached LLM summary of *text* without calling the API."""
+        text = text.strip()
+        if not text or self.cache is None:
+            return None
+        return self.cache.get(summary_key(self.model_name, self.max_sentences, text))
+
     def summarize(self, text: str) -> str:
         text = text.strip()
         if not text:
             return ""
-        if not genai or not self.api_key:
-            return self._local_fallback(text)
+        summary = self.generate(text)
+        return self._local_fallback(text) if summary is None else summary
+
+    def generate(self, text: str) -> str | None:
+        """Return the LLM summary of *text*, or ``None`` if it could not be generated."""
+        text = text.strip()
+        if not text or not self.api_key:
+            return None
+        key = summary_key(self.model_name, self.max_sentences, text)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
 
         prompt = (
             "Summarize the following document in 2-4 sentences, focusing on the key facts and intent.\n\n"
             f"DOCUMENT:\n{text}\n"
         )
         from staged_rag.core.embeddings import _get_genai_client
-        client = _get_genai_client(self.api_key)
+        try:
+            client = _get_genai_client(self.api_key)
+        except ImportError:
+            return None
         try:
             response = client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
             )
-            return str(response.text).strip()
+            if response.text is None:
+                # Safety block or empty candidate; not a summary to cache.
+                raise ValueError("model returned no text")
+            summary = str(response.text).strip()
         except Exception as exc:
             logger.warning(
-                "Summary generation failed, using local fallback: %s", exc,
+                "Summary generation %s, using local fallback: %s",
+                "rate-limited" if is_rate_limit_error(exc) else "failed", exc,
             )
-            return self._local_fallback(text)
+            return None
+        # Only LLM summaries are cached; an empty answer is not worth keeping.
+        if self.cache is not None and summary:
+            self.cache.put(key, summary)
+        return summary
@@ -9,13 +9,18 @@ from staged_rag.utils import normalize_vectors
 
 
 class VectorIndex:
-    """Persisted vector index with cosine similarity search."""
+    """Persisted vector index with cosine similarity search.
+
+    Documents whose vector is a deterministic fallback (the embedding
+    provider was unavailable) are flagged so they can be re-embedded.
+    """
 
     def __init__(self, storage_path: Path) -> None:
         self.storage_path = storage_path
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self._doc_ids: list[str] = []
         self._vectors: np.ndarray | None = None
+        self._fallback: set[str] = set()
         self._lock = threading.Lock()
         self._load()
 
@@ -24,16 +29,29 @@ class VectorIndex:
             return
         data = np.load(self.storage_path, allow_pickle=True)
         self._doc_ids = list(data["doc_ids"])
-        self._vectors = data["vectors"]
+        # Older indexes were saved as float64.
+        self._vectors = np.ascontiguousarray(data["vectors"], dtype=np.float32)
+        # Indexes written before fallback tracking have no flags.
+        if "fallback" in data.files:
+            self._fallback = {doc_id for doc_id, flag in zip(self._doc_ids, data["fallback"]) if flag}
 
     def _persist(self) -> None:
         if self._vectors is None:
             return
-        np.savez_compressed(self.storage_path, doc_ids=np.array(self._doc_ids), vectors=self._vectors)
+        np.savez_compressed(
+            self.storage_path,
+            doc_ids=np.array(self._doc_ids),
+            vectors=self._vectors,
+            fallback=np.array([doc_id in self._fallback for doc_id in self._doc_ids], dtype=bool),
+        )
 
-    def upsert(self, doc_id: str, vector: list[float]) -> None:
+    def upsert(self, doc_id: str, vector: np.ndarray | list[float], fallback: bool = False) -> None:
         with self._lock:
-            vector_array = np.array(vector, dtype=float)
+            if fallback:
+                self._fallback.add(doc_id)
+            else:
+                self._fallback.discard(doc_id)
+            vector_array = np.asarray(vector, dtype=np.float32)
             if self._vectors is None:
                 self._doc_ids = [doc_id]
                 self._vectors = vector_array.reshape(1, -1)
@@ -51,6 +69,7 @@ class VectorIndex:
                 return
             index = self._doc_ids.index(doc_id)
             self._doc_ids.pop(index)
+            self._fallback.discard(doc_id)
             self._vectors = np.delete(self._vectors, index, axis=0) if self._vectors.size else None
             if self._vectors is None or not self._doc_ids:
                 if self.storage_path.exists():
@@ -58,12 +77,35 @@ class VectorIndex:
             else:
                 self._persist()
 
-    def search(self, query_vector: list[float], top_k: int) -> list[tuple[str, float]]:
+    def fallback_doc_ids(self) -> list[str]:
+        """Return the ids of documents indexed with a fallback vector."""
+        with self._lock:
+            return [doc_id for doc_id in self._doc_ids if doc_id in self._fallback]
+
+    def replace_fallbacks(self, vectors: dict[str, np.ndarray]) -> int:
+        """Overwrite the vectors of still-flagged documents; return how many changed.
+
+        Documents that were deleted or re-indexed since they were flagged
+        are left alone.  The index is persisted once for the whole batch.
+        """
+        with self._lock:
+            replaced = 0
+            for doc_id, vector in vectors.items():
+                if doc_id not in self._fallback or self._vectors is None:
+                    continue
+                self._vectors[self._doc_ids.index(doc_id)] = vector
+                self._fallback.discard(doc_id)
+                replaced += 1
+            if replaced:
+                self._persist()
+            return replaced
+
+    def search(self, query_vector: np.ndarray | list[float], top_k: int) -> list[tuple[str, float]]:
         with self._lock:
             if self._vectors is None or not self._doc_ids:
                 return []
             matrix = normalize_vectors(self._vectors)
-            query = normalize_vectors(np.array(query_vector, dtype=float).reshape(1, -1))
+            query = normalize_vectors(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))
             scores = matrix @ query.T
             scores = scores.flatten()
             top_indices = np.argsort(scores)[::-1][:top_k]
@@ -7,7 +7,7 @@ Provides a pluggable embedding system inspired by mem0ai/mem0:
 * **Factory** – ``EmbedderFactory`` (lazy-import factory mapping provider
   names to implementation classes)
 * **Providers** – Gemini, OpenAI, Ollama, HuggingFace, Azure OpenAI,
-  Together, LM Studio
+  Together, LM Studio, and an offline hashed-feature provider
 
 Usage::
 
@@ -36,6 +36,7 @@ class AzureOpenAIEmbedding(EmbeddingBase):
             azure_endpoint=azure_endpoint,
             api_version=api_version,
             api_key=api_key,
+            http_client=self._http_client(),
         )
 
     def embed(self, text: str) -> list[float]:
@@ -45,3 +46,11 @@ class AzureOpenAIEmbedding(EmbeddingBase):
             input=[text],
             model=self.config.model,
         ).data[0].embedding
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``embeddings.create`` request."""
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model=self.config.model,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
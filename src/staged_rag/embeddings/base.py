@@ -2,12 +2,15 @@
 
 Inspired by mem0ai/mem0's EmbeddingBase pattern.
 Every provider must implement the ``embed`` method that converts a single
-text string into a fixed-dimension float vector.
+text string into a fixed-dimension float vector, and should override
+``embed_batch`` when its API accepts several texts per request.
 """
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
+
+import numpy as np
 
 from staged_rag.embeddings.configs import BaseEmbedderConfig
 
@@ -25,6 +28,18 @@ class EmbeddingBase(ABC):
         else:
             self.config = config
 
+    def _http_client(self) -> Any:
+        """Return the ``httpx.Client`` to hand to the provider SDK.
+
+        ``config.http_client`` when set, otherwise the process-wide pool;
+        ``None`` (SDK default client) when pooling is disabled.
+        """
+        if self.config.http_client is not None:
+            return self.config.http_client
+        from staged_rag.http_pool import get_http_client
+
+        return get_http_client()
+
     @abstractmethod
     def embed(self, text: str) -> list[float]:
         """Return the embedding vector for *text*.
@@ -36,3 +51,20 @@ class EmbeddingBase(ABC):
             A list of floats representing the embedding vector.
         """
         ...
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]] | np.ndarray:
+        """Return embedding vectors for *texts*, in input order.
+
+        The default implementation calls :meth:`embed` once per text;
+        providers with a native batch API override it to send a single
+        request.  Providers that already hold a NumPy array may return it
+        directly as an ``(n, dims)`` array; the engine converts to float32
+        once either way.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            One embedding vector per input text (rows of an array are fine).
+        """
+        return [self.embed(text) for text in texts]
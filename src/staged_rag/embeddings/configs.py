@@ -31,6 +31,8 @@ class BaseEmbedderConfig:
     model: Optional[str] = None
     api_key: Optional[str] = None
     embedding_dims: Optional[int] = None
+    # httpx.Client for SDK requests; None uses the shared pool (staged_rag.http_pool)
+    http_client: Optional[Any] = None
 
     # Ollama specific
     ollama_base_url: Optional[str] = None
@@ -41,6 +43,9 @@ class BaseEmbedderConfig:
     # HuggingFace specific
     model_kwargs: Optional[Dict[str, Any]] = field(default_factory=dict)
     huggingface_base_url: Optional[str] = None
+    huggingface_batch_size: Optional[int] = None  # texts per local forward pass
+    huggingface_workers: Optional[int] = None  # >1 starts a multi-process pool
+    huggingface_threads_per_worker: Optional[int] = None  # torch/BLAS threads each
 
     # Azure OpenAI specific
     azure_kwargs: Optional[Dict[str, Any]] = field(default_factory=dict)
@@ -62,6 +67,7 @@ SUPPORTED_PROVIDERS = (
     "azure_openai",
     "together",
     "lmstudio",
+    "hashing",
 )
 
 
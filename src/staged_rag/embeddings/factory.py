@@ -47,6 +47,7 @@ class EmbedderFactory:
         "azure_openai": "staged_rag.embeddings.azure_openai.AzureOpenAIEmbedding",
         "together": "staged_rag.embeddings.together.TogetherEmbedding",
         "lmstudio": "staged_rag.embeddings.lmstudio.LMStudioEmbedding",
+        "hashing": "staged_rag.embeddings.hashing.HashingEmbedding",
     }
 
     @classmethod
@@ -59,7 +60,8 @@ class EmbedderFactory:
 
         Args:
             provider_name: One of the registered provider keys
-                           (gemini, openai, ollama, huggingface, azure_openai, together, lmstudio).
+                           (gemini, openai, ollama, huggingface, azure_openai, together, lmstudio,
+                           hashing).
             config: Optional dict of config values passed to ``BaseEmbedderConfig``.
 
         Returns:
@@ -26,7 +26,8 @@ class GeminiEmbedding(EmbeddingBase):
     def __init__(self, config: Optional[BaseEmbedderConfig] = None) -> None:
         super().__init__(config)
 
-        self.config.model = self.config.model or "gemini-embedding-001"
+        self.model: str = self.config.model or "gemini-embedding-001"
+        self.config.model = self.model
         self.config.embedding_dims = (
             self.config.embedding_dims
             or self.config.output_dimensionality
@@ -34,7 +35,9 @@ class GeminiEmbedding(EmbeddingBase):
         )
 
         api_key = self.config.api_key or os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        self.client = genai.Client(api_key=api_key)
+        http_client = self._http_client()
+        http_options = types.HttpOptions(httpx_client=http_client) if http_client is not None else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
 
     def embed(self, text: str) -> list[float]:
         """Get embedding for *text* using Google Gemini."""
@@ -43,8 +46,21 @@ class GeminiEmbedding(EmbeddingBase):
             output_dimensionality=self.config.embedding_dims,
         )
         response = self.client.models.embed_content(
-            model=self.config.model,
+            model=self.model,
             contents=text,
             config=cfg,
         )
         return list(response.embeddings[0].values)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``embed_content`` request."""
+        cfg = types.EmbedContentConfig(
+            output_dimensionality=self.config.embedding_dims,
+        )
+        response = self.client.models.embed_content(
+            model=self.model,
+            contents=[text.replace("\n", " ") for text in texts],
+            config=cfg,
+        )
+        # Missing embeddings or values surface as a shape error in the engine.
+        return [list(embedding.values or []) for embedding in response.embeddings or []]
@@ -0,0 +1,113 @@
+"""Offline hashed-feature embedding provider (no model, no network).
+
+Each text is turned into word and character n-gram features with the
+hashing trick, weighted by sublinear term frequency, and mapped to
+``embedding_dims`` dimensions with a fixed sparse random projection:
+every feature adds ``±weight`` to a handful of hash-selected dimensions.
+The projection is derived from hashes, so no matrix is stored and the
+vectors are identical across processes and machines.
+
+Texts that share words or word fragments get similar vectors, which
+gives meaningful lexical retrieval in air-gapped deployments and a
+fast, realistic stand-in for benchmarks and tests.  It does not capture
+synonyms the way a trained model does.
+
+There is no IDF weighting: features are weighted by term frequency
+only.  IDF needs corpus statistics, which would make a text's vector
+depend on what had been ingested before it, so vectors stored at
+different times (and cached ones) would stop being comparable.  The
+keyword side of hybrid search (BM25) supplies IDF instead.
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from staged_rag.embeddings.base import EmbeddingBase
+from staged_rag.embeddings.configs import BaseEmbedderConfig
+
+_NON_WORD_RE = re.compile(r"\W+")
+_NGRAM_SIZES = (3, 4, 5)
+# Dimensions each feature is projected onto (very sparse random projection).
+_PROJECTIONS = 8
+_WORD_WEIGHT = 2.0
+_MASK64 = (1 << 64) - 1
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finaliser over a uint64 array (wrap-around arithmetic)."""
+    values = (values ^ (values >> np.uint64(30))) * _M1
+    values = (values ^ (values >> np.uint64(27))) * _M2
+    return values ^ (values >> np.uint64(31))
+
+
+def _ngram_powers(n: int) -> np.ndarray:
+    return np.array([pow(257, n - 1 - i, 1 << 64) for i in range(n)], dtype=np.uint64)
+
+
+_POWERS = {n: _ngram_powers(n) for n in _NGRAM_SIZES}
+_SALTS = np.array([(_GOLDEN * (j + 1)) & _MASK64 for j in range(_PROJECTIONS)], dtype=np.uint64)
+
+
+class HashingEmbedding(EmbeddingBase):
+    """CPU-only hashing-trick embeddings with a fixed random projection."""
+
+    def __init__(self, config: Optional[BaseEmbedderConfig] = None) -> None:
+        super().__init__(config)
+
+        # The model name versions the feature scheme (it is part of the
+        # embedding cache key).
+        self.config.model = self.config.model or "hashing-ngram-v1"
+        self.dims = int(self.config.embedding_dims or 384)
+        self.config.embedding_dims = self.dims
+
+    def _features(self, text: str) -> np.ndarray:
+        """Return the uint64 feature hashes of *text* (duplicates kept)."""
+        normalized = _NON_WORD_RE.sub(" ", text.casefold()).strip()
+        if not normalized:
+            return np.empty(0, dtype=np.uint64)
+        data = np.frombuffer(f" {normalized} ".encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        parts = []
+        with np.errstate(over="ignore"):
+            for n in _NGRAM_SIZES:
+                if data.size < n:
+                    continue
+                windows = np.lib.stride_tricks.sliding_window_view(data, n)
+                parts.append(_mix(windows @ _POWERS[n] + np.uint64(n)))
+        words = np.array([zlib.crc32(word.encode("utf-8")) for word in normalized.split(" ")], dtype=np.uint64)
+        # Tag word features in the top bit so they never collide with n-grams.
+        parts.append(words | np.uint64(1 << 63))
+        return np.concatenate(parts)
+
+    def _vector(self, text: str) -> np.ndarray:
+        dims = self.dims
+        features, counts = np.unique(self._features(text), return_counts=True)
+        vector = np.zeros(dims, dtype=np.float64)
+        if features.size == 0:
+            return vector
+        weights = 1.0 + np.log(counts)
+        weights[features >> np.uint64(63) == 1] *= _WORD_WEIGHT
+        with np.errstate(over="ignore"):
+            hashed = _mix(features[:, None] ^ _SALTS[None, :])
+        indexes = (hashed % np.uint64(dims)).astype(np.int64).ravel()
+        signs = np.where((hashed >> np.uint64(63)) == 1, -1.0, 1.0).ravel()
+        vector += np.bincount(indexes, weights=signs * np.repeat(weights, _PROJECTIONS), minlength=dims)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed(self, text: str) -> list[float]:
+        """Return the hashed-feature embedding of *text*."""
+        return self._vector(text).tolist()
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed *texts* into one ``(len(texts), dims)`` float32 array."""
+        matrix = np.empty((len(texts), self.dims), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self._vector(text)
+        return matrix
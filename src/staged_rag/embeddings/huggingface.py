@@ -2,11 +2,22 @@
 
 Supports both local ``sentence-transformers`` models and the HuggingFace
 Inference API (when ``huggingface_base_url`` is set).
+
+Local models encode a whole batch per ``encode`` call.  With
+``huggingface_workers > 1`` large batches are spread over a
+sentence-transformers multi-process pool (one CPU process per worker,
+each limited to ``huggingface_threads_per_worker`` torch/BLAS threads so
+the workers do not oversubscribe the cores).
 """
 from __future__ import annotations
 
+import atexit
+import logging
 import os
-from typing import Optional
+import threading
+from typing import Any, Optional
+
+import numpy as np
 
 from staged_rag.embeddings.base import EmbeddingBase
 from staged_rag.embeddings.configs import BaseEmbedderConfig
@@ -21,6 +32,14 @@ try:
 except ImportError:
     SentenceTransformer = None  # type: ignore[assignment,misc]
 
+logger = logging.getLogger(__name__)
+
+_DEFAULT_BATCH_SIZE = 32
+# Environment variables read by torch/OpenMP/BLAS when a worker starts.
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+# Serialises the temporary environment change around pool start-up.
+_THREAD_ENV_LOCK = threading.Lock()
+
 
 class HuggingFaceEmbedding(EmbeddingBase):
     """HuggingFace embedding provider (local or API)."""
@@ -42,6 +61,7 @@ class HuggingFaceEmbedding(EmbeddingBase):
             self.client = OpenAI(
                 api_key=api_key,
                 base_url=self.config.huggingface_base_url,
+                http_client=self._http_client(),
             )
             self._local_model = None
         else:
@@ -57,6 +77,68 @@ class HuggingFaceEmbedding(EmbeddingBase):
             )
             self.client = None  # type: ignore[assignment]
 
+        self.batch_size = int(self.config.huggingface_batch_size or _DEFAULT_BATCH_SIZE)
+        self.workers = int(self.config.huggingface_workers or 1)
+        self.threads_per_worker = self.config.huggingface_threads_per_worker
+        self._pool: dict | None = None
+        self._pool_lock = threading.Lock()
+        if self._local_model is not None and self.workers > 1:
+            atexit.register(self.close)
+        if self._local_model is not None and self.workers <= 1 and self.threads_per_worker:
+            try:
+                import torch
+
+                torch.set_num_threads(int(self.threads_per_worker))
+            except ImportError:
+                pass
+
+    def _get_pool(self) -> dict:
+        """Start the multi-process pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self._start_pool()
+                logger.info(
+                    "Started sentence-transformers pool: workers=%d, threads_per_worker=%s",
+                    self.workers, self.threads_per_worker or "default",
+                )
+            return self._pool
+
+    def _start_pool(self) -> dict:
+        model = self._model()
+        if not self.threads_per_worker:
+            return model.start_multi_process_pool(["cpu"] * self.workers)
+        # sentence-transformers spawns the workers itself and takes no
+        # per-worker environment or initializer, so the limits have to be in
+        # os.environ while they start (the parent's torch/BLAS thread pools
+        # are already initialised and unaffected).  The change is scoped to
+        # the start call and serialised across providers, so concurrent
+        # start-ups cannot leave each other's values behind.
+        with _THREAD_ENV_LOCK:
+            saved = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+            for name in _THREAD_ENV_VARS:
+                os.environ[name] = str(int(self.threads_per_worker))
+            try:
+                return model.start_multi_process_pool(["cpu"] * self.workers)
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+
+    def _model(self) -> Any:
+        """Return the local model (``RuntimeError`` in Inference API mode)."""
+        if self._local_model is None:
+            raise RuntimeError("No local sentence-transformers model: using the HuggingFace Inference API")
+        return self._local_model
+
+    def close(self) -> None:
+        """Stop the multi-process pool, if one was started (it restarts on demand)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._model().stop_multi_process_pool(self._pool)
+                self._pool = None
+
     def embed(self, text: str) -> list[float]:
         """Get embedding for *text* using HuggingFace."""
         if self.client is not None and self.config.huggingface_base_url:
@@ -69,4 +151,23 @@ class HuggingFaceEmbedding(EmbeddingBase):
             return response.data[0].embedding
         else:
             # Local sentence-transformers
-            return self._local_model.encode(text, convert_to_numpy=True).tolist()
+            return self._model().encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]] | np.ndarray:
+        """Embed *texts* in one API request or one local ``encode`` call.
+
+        Locally, batches larger than ``huggingface_batch_size`` go to the
+        multi-process pool when ``huggingface_workers > 1``.  The model's
+        float32 array is returned as is (no list boxing).
+        """
+        if self.client is not None and self.config.huggingface_base_url:
+            response = self.client.embeddings.create(
+                input=texts,
+                model=self.config.model,
+                **(self.config.model_kwargs or {}),
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        model = self._model()
+        if self.workers > 1 and len(texts) > self.batch_size:
+            return model.encode_multi_process(texts, self._get_pool(), batch_size=self.batch_size)
+        return model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
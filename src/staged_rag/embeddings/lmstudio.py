@@ -28,7 +28,7 @@ class LMStudioEmbedding(EmbeddingBase):
         self.config.embedding_dims = self.config.embedding_dims or 768
 
         base_url = self.config.openai_base_url or "http://localhost:1234/v1"
-        self.client = OpenAI(api_key="lm-studio", base_url=base_url)
+        self.client = OpenAI(api_key="lm-studio", base_url=base_url, http_client=self._http_client())
 
     def embed(self, text: str) -> list[float]:
         """Get embedding for *text* using LM Studio."""
@@ -38,3 +38,11 @@ class LMStudioEmbedding(EmbeddingBase):
             model=self.config.model,
         )
         return response.data[0].embedding
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``embeddings.create`` request."""
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model=self.config.model,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -46,3 +46,17 @@ class OllamaEmbedding(EmbeddingBase):
             prompt=text,
         )
         return response["embedding"]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``/api/embed`` request.
+
+        Falls back to one request per text on ``ollama`` clients that
+        predate the batch ``embed`` endpoint.
+        """
+        if not hasattr(self.client, "embed"):
+            return [self.embed(text) for text in texts]
+        response = self.client.embed(
+            model=self.config.model,
+            input=texts,
+        )
+        return [list(vector) for vector in response["embeddings"]]
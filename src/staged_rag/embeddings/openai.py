@@ -45,7 +45,7 @@ class OpenAIEmbedding(EmbeddingBase):
             )
             base_url = base_url or os.environ["OPENAI_API_BASE"]
 
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=self._http_client())
 
     def embed(self, text: str) -> list[float]:
         """Get embedding for *text* using OpenAI."""
@@ -56,3 +56,12 @@ class OpenAIEmbedding(EmbeddingBase):
             dimensions=self.config.embedding_dims,
         )
         return response.data[0].embedding
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``embeddings.create`` request."""
+        response = self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts],
+            model=self.config.model,
+            dimensions=self.config.embedding_dims,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -1,6 +1,7 @@
 """Together AI embedding provider."""
 from __future__ import annotations
 
+import inspect
 import os
 from typing import Optional
 
@@ -26,7 +27,11 @@ class TogetherEmbedding(EmbeddingBase):
         self.config.embedding_dims = self.config.embedding_dims or 768
 
         api_key = self.config.api_key or os.getenv("TOGETHER_API_KEY")
-        self.client = Together(api_key=api_key)
+        kwargs = {}
+        # Older SDK releases (requests-based) do not accept an httpx client.
+        if "http_client" in inspect.signature(Together).parameters:
+            kwargs["http_client"] = self._http_client()
+        self.client = Together(api_key=api_key, **kwargs)
 
     def embed(self, text: str) -> list[float]:
         """Get embedding for *text* using Together AI."""
@@ -35,3 +40,11 @@ class TogetherEmbedding(EmbeddingBase):
             model=self.config.model,
             input=text,
         ).data[0].embedding
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts* with a single ``embeddings.create`` request."""
+        response = self.client.embeddings.create(
+            model=self.config.model,
+            input=[text.replace("\n", " ") for text in texts],
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -0,0 +1,100 @@
+"""Process-wide pooled HTTP client shared by the hosted API SDKs.
+
+The OpenAI, Azure OpenAI, Together and Gemini SDKs each create their own
+``httpx.Client`` with default limits when none is given, so every
+provider instance (and the summarizer) keeps a separate connection pool
+and pays a new TLS handshake per burst.  ``get_http_client`` returns one
+shared client whose limits, keep-alive and HTTP/2 support come from the
+``http`` settings section; providers pass it to their SDK.
+
+HTTP/2 is only enabled when the ``h2`` package is installed
+(``pip install httpx[http2]``).
+"""
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """Connection limits of the shared client."""
+
+    enabled: bool = True
+    max_connections: int = 32  # open connections across all hosts
+    max_keepalive_connections: int = 16  # idle connections kept for reuse
+    keepalive_expiry: float = 30.0  # seconds an idle connection stays open
+    http2: bool = True  # used when the h2 package is installed
+    timeout: float = 60.0  # seconds, unless the SDK sets its own per request
+
+
+_config = HttpPoolConfig()
+_client: httpx.Client | None = None
+_lock = threading.Lock()
+
+
+def configure_http_pool(config: HttpPoolConfig) -> None:
+    """Set the pool limits used by the next ``get_http_client`` call.
+
+    A client that is already open is left to the SDKs holding it (closing
+    it would break them); new providers get a client with the new limits.
+    """
+    global _config, _client
+    with _lock:
+        if config != _config:
+            _config = config
+            _client = None
+
+
+def get_http_client() -> httpx.Client | None:
+    """Return the shared client, or ``None`` when pooling is disabled or httpx is missing."""
+    global _client
+    if not _config.enabled:
+        return None
+    with _lock:
+        if _client is None:
+            try:
+                import httpx
+            except ImportError:
+                return None
+            http2 = _config.http2 and importlib.util.find_spec("h2") is not None
+            _client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=_config.max_connections,
+                    max_keepalive_connections=_config.max_keepalive_connections,
+                    keepalive_expiry=_config.keepalive_expiry,
+                ),
+                timeout=_config.timeout,
+                http2=http2,
+                follow_redirects=True,
+            )
+            logger.info(
+                "Shared HTTP pool: max_connections=%d, keepalive=%d, http2=%s",
+                _config.max_connections, _config.max_keepalive_connections, http2,
+            )
+        return _client
+
+
+def close_http_pool() -> None:
+    """Close the shared client (it is recreated on next use)."""
+    with _lock:
+        _close_locked()
+
+
+def _close_locked() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+atexit.register(close_http_pool)
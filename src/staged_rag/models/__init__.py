@@ -2,12 +2,14 @@
 
 from .audit import AuditLogEntry
 from .document import Document, DocumentChunk
-from .search import SearchResponse, SummaryResult
+from .search import ChunkResult, ChunkSearchResponse, SearchResponse, SummaryResult
 
 __all__ = [
     "Document",
     "DocumentChunk",
     "SummaryResult",
     "SearchResponse",
+    "ChunkResult",
+    "ChunkSearchResponse",
     "AuditLogEntry",
 ]
@@ -7,6 +7,12 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+# Document.summary_status values
+SUMMARY_PENDING = "pending"  # extractive placeholder, LLM summary not generated yet
+SUMMARY_FINAL = "final"
+SUMMARY_FAILED = "failed"  # LLM summary given up on, extractive summary kept
+
+
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -24,6 +30,11 @@ class Document(BaseModel):
     source: str = Field(description="Origin path, URL, or label")
     full_text: str
     summary: str = Field(description="2-4 sentence summary for Level 1 retrieval")
+    summary_status: str = Field(
+        default=SUMMARY_FINAL,
+        description="'pending' while an extractive placeholder awaits its LLM summary, "
+        "'failed' if that was given up on, else 'final'",
+    )
     chunks: list[DocumentChunk] = Field(default_factory=list)
     tags: list[str] = Field(default_factory=list)
     collection: str = Field(default="default")
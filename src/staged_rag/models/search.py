@@ -10,9 +10,26 @@ class SummaryResult(BaseModel):
     token_count: int
     tags: list[str] = Field(default_factory=list)
     collection: str
+    best_chunk_index: int | None = Field(default=None, description="Chunk with the strongest keyword match (hybrid search)")
 
 class SearchResponse(BaseModel):
     query: str
     results: list[SummaryResult]
     total_candidates: int = Field(default=0)
     search_time_ms: float = Field(default=0.0)
+
+class ChunkResult(BaseModel):
+    doc_id: str
+    title: str
+    chunk_index: int
+    total_chunks: int
+    text: str
+    token_count: int
+    similarity_score: float = Field(ge=0.0, le=1.0)
+    collection: str
+
+class ChunkSearchResponse(BaseModel):
+    query: str
+    results: list[ChunkResult]
+    total_candidates: int = Field(default=0)
+    search_time_ms: float = Field(default=0.0)
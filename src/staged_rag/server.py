@@ -105,9 +105,13 @@ def hybrid_search(
     collection: str = "default",
     semantic_weight: float = 0.7,
     keyword_weight: float = 0.3,
+    granularity: str = "document",
 ) -> dict:
-    """Combine keyword and embedding searches for tighter recall."""
-    return rag_tools.hybrid_search(query, top_k, collection, semantic_weight, keyword_weight)
+    """Combine keyword and embedding searches for tighter recall.
+
+    granularity="chunk" ranks individual passages instead of documents.
+    """
+    return rag_tools.hybrid_search(query, top_k, collection, semantic_weight, keyword_weight, granularity)
 
 @server.tool()
 @_safe_tool
@@ -167,6 +171,18 @@ def collection_stats(collection: str = "default") -> dict:
     """Return collection sizes and token counts."""
     return rag_tools.collection_stats(collection)
 
+@server.tool()
+@_safe_tool
+def embedding_cache_stats() -> dict:
+    """Report embedding cache sizes and hit rates."""
+    return rag_tools.embedding_cache_stats()
+
+@server.tool()
+@_safe_tool
+def server_status() -> dict:
+    """Report whether the embedding provider is loaded and ready."""
+    return rag_tools.server_status()
+
 @server.tool()
 @_safe_tool
 def list_collections() -> dict:
@@ -227,10 +243,26 @@ def start_server() -> None:
             "Knowledge-base watcher active – monitoring %s", settings.knowledge_base.kb_dir
         )
 
+    # Load the embedding provider off the startup path, then replace
+    # fallback vectors once it is reachable and placeholder summaries
+    # with generated ones
+    from staged_rag.service import (
+        start_embedding_warm_up,
+        start_reembed_worker,
+        start_summary_worker,
+        stop_reembed_worker,
+        stop_summary_worker,
+    )
+    start_embedding_warm_up(settings)
+    start_reembed_worker(settings)
+    start_summary_worker(settings)
+
     if hasattr(server, "run"):
         try:
             server.run(transport=settings.server.transport, host=settings.server.host, port=settings.server.port)
         finally:
+            stop_summary_worker()
+            stop_reembed_worker()
             stop_kb_manager()
         return
     raise RuntimeError("MCP server cannot start with current fastmcp version")
@@ -1,20 +1,36 @@
 from __future__ import annotations
 
+import logging
+import threading
 import time
 import uuid
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
+
+import numpy as np
 
 from staged_rag.config import Settings, load_settings
+from staged_rag.core.analyzer import Analyzer
+from staged_rag.core.background_worker import BackgroundWorker
 from staged_rag.core.bm25 import BM25Scorer
 from staged_rag.core.chunk_manager import ChunkManager
 from staged_rag.core.document_store import DocumentStore
+from staged_rag.core.embedding_cache import EmbeddingCache, QueryVectorCache
 from staged_rag.core.embeddings import EmbeddingEngine
+from staged_rag.core.rate_limiter import BULK, INTERACTIVE, get_rate_limiter
+from staged_rag.core.resilience import CircuitBreaker
+from staged_rag.core.summary_cache import SummaryCache
 from staged_rag.core.summary_generator import SummaryGenerator
 from staged_rag.core.vector_index import VectorIndex
+from staged_rag.http_pool import configure_http_pool
 from staged_rag.logging.audit import AuditLogger
-from staged_rag.models.document import Document, DocumentChunk
-from staged_rag.models.search import SearchResponse, SummaryResult
-from staged_rag.utils import count_tokens
+from staged_rag.models.document import SUMMARY_FAILED, SUMMARY_FINAL, SUMMARY_PENDING, Document, DocumentChunk
+from staged_rag.models.search import ChunkResult, ChunkSearchResponse, SearchResponse, SummaryResult
+from staged_rag.utils import count_tokens, normalize_vectors
+
+logger = logging.getLogger(__name__)
+
+# Failed LLM attempts before a deferred summary keeps its extractive text.
+_SUMMARY_MAX_ATTEMPTS = 5
 
 
 class RAGService:
@@ -22,23 +38,82 @@ class RAGService:
 
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
-        self.store = DocumentStore(settings.storage.store_dir)
+        configure_http_pool(settings.http)
+        self.store = DocumentStore(settings.storage.store_dir, codec=settings.storage.codec)
         self.audit = AuditLogger(settings.logging.audit_file, settings.logging.max_log_entries)
         self.chunker = ChunkManager()
+        cache_settings = settings.embedding_cache
+        self.embedding_cache = (
+            EmbeddingCache(cache_settings.path, max_bytes=cache_settings.max_size_mb * 1024 * 1024)
+            if cache_settings.enabled
+            else None
+        )
+        self.query_cache = QueryVectorCache(cache_settings.query_cache_size) if cache_settings.query_cache_size > 0 else None
         self.embedding = EmbeddingEngine(
             provider=settings.embedding.provider,
             api_key=_read_api_key(),
             model_name=settings.embedding.model,
             dimension=settings.embedding.dimensions,
             provider_config=settings.embedding.provider_config,
+            batch_size=settings.embedding.batch_size,
+            cache=self.embedding_cache,
+            query_cache=self.query_cache,
+            rate_limiter=get_rate_limiter(
+                settings.embedding.provider,
+                settings.embedding.requests_per_minute,
+                settings.embedding.tokens_per_minute,
+            ),
+            max_retries=settings.embedding.max_retries,
+            circuit_breaker=CircuitBreaker(
+                settings.embedding.circuit_breaker_threshold,
+                settings.embedding.circuit_breaker_reset_seconds,
+            ),
+            max_in_flight=settings.embedding.max_in_flight,
+            micro_batch_window=settings.embedding.micro_batch_window_ms / 1000.0,
+            failover=settings.embedding.failover,
+            model_family=settings.embedding.model_family,
+            hedge_percentile=settings.embedding.hedge_percentile,
+        )
+        self.summary_cache = (
+            SummaryCache(settings.generation.summary_cache_path) if settings.generation.summary_cache else None
         )
         self.summarizer = SummaryGenerator(
             api_key=_read_api_key(),
             model_name=settings.generation.model,
             max_sentences=settings.generation.summary_max_sentences,
+            cache=self.summary_cache,
         )
-        self._bm25: dict[str, BM25Scorer] = {}
+        self.analyzer = Analyzer(
+            stemmer=settings.bm25.stemmer,
+            stopwords=settings.bm25.stopwords,
+            query_cache_size=settings.bm25.query_cache_size,
+        )
+        self._bm25: dict[tuple[str, str], BM25Scorer] = {}
+        self._bm25_lock = threading.Lock()
         self._indexes: dict[str, VectorIndex] = {}
+        self._indexes_lock = threading.Lock()
+        self._reembedded: dict[str, int] = {}
+        self._reembed_last: str | None = None  # collection of the last re-embed batch
+        # Started by the server (see start_reembed_worker), not here.
+        self.reembed_worker = BackgroundWorker(
+            self.reembed_fallbacks,
+            is_ready=self._provider_ready,
+            poll_interval=settings.ingestion.reembed_interval,
+            name="reembed",
+        )
+        self._summaries_generated: dict[str, int] = {}
+        # collection -> doc_ids awaiting an LLM summary (loaded on first use)
+        self._pending_summaries: dict[str, set[str]] = {}
+        # doc_id -> (failed attempts, monotonic time of the next attempt)
+        self._summary_retries: dict[str, tuple[int, float]] = {}
+        self._summaries_lock = threading.Lock()
+        # Started by the server (see start_summary_worker), not here.
+        self.summary_worker = BackgroundWorker(
+            self.generate_pending_summaries,
+            is_ready=lambda: self.summarizer.can_generate,
+            poll_interval=settings.ingestion.deferred_summary_interval,
+            name="summary",
+        )
 
     def _log(self, tool: str, params: dict[str, Any], result_count: int, doc_ids: Iterable[str], latency_ms: float) -> None:
         self.audit.record(
@@ -52,25 +127,56 @@ class RAGService:
         )
 
     def _index_for(self, collection: str) -> VectorIndex:
-        if collection not in self._indexes:
-            index_path = self.settings.storage.index_dir / f"{collection}.npz"
-            self._indexes[collection] = VectorIndex(index_path)
-        return self._indexes[collection]
-
-    def _bm25_for(self, collection: str) -> BM25Scorer:
-        if collection not in self._bm25:
-            self._bm25[collection] = BM25Scorer()
-            self._rebuild_bm25(collection)
-        return self._bm25[collection]
-
-    def _rebuild_bm25(self, collection: str) -> None:
-        scorer = self._bm25.setdefault(collection, BM25Scorer())
-        documents = []
-        for doc in self.store.list(collection):
-            # Include title, summary, AND full_text for better keyword coverage
-            keyword_text = f"{doc.get('title', '')} {doc.get('summary', '')} {doc.get('full_text', '')}"
-            documents.append({"doc_id": doc["doc_id"], "keyword_text": keyword_text})
-        scorer.build(documents)
+        with self._indexes_lock:
+            if collection not in self._indexes:
+                index_path = self.settings.storage.index_dir / f"{collection}.npz"
+                self._indexes[collection] = VectorIndex(index_path)
+            return self._indexes[collection]
+
+    def _bm25_for(self, collection: str, granularity: str = "document") -> BM25Scorer:
+        """Return the document- or chunk-level BM25 index of *collection*."""
+        key = (collection, granularity)
+        with self._bm25_lock:
+            if key not in self._bm25:
+                suffix = "bm25" if granularity == "document" else "chunks.bm25"
+                scorer = BM25Scorer(
+                    self.settings.storage.index_dir / f"{collection}.{suffix}",
+                    k1=self.settings.bm25.k1,
+                    b=self.settings.bm25.b,
+                    codec=self.settings.storage.codec,
+                    analyzer=self.analyzer,
+                )
+                entries: dict[str, str] = {}
+                for doc in self.store.list(collection):
+                    if granularity == "document":
+                        entries[doc["doc_id"]] = _keyword_text(doc)
+                    else:
+                        entries.update(_chunk_entries(doc))
+                if not len(scorer):
+                    scorer.build({"doc_id": key_id, "keyword_text": text} for key_id, text in entries.items())
+                else:
+                    # Reconcile a persisted index with the store (e.g. after a
+                    # crash between the two writes or a lost delta log); only
+                    # new or changed entries are tokenized.
+                    for key_id in scorer.doc_ids() - entries.keys():
+                        scorer.remove(key_id)
+                    for key_id, text in entries.items():
+                        if not scorer.is_current(key_id, text):
+                            scorer.add(key_id, text)
+                self._bm25[key] = scorer
+            return self._bm25[key]
+
+    def _update_bm25(self, collection: str, doc: dict[str, Any], chunks_changed: bool = True) -> None:
+        self._bm25_for(collection).add(doc["doc_id"], _keyword_text(doc))
+        if chunks_changed:
+            chunk_bm25 = self._bm25_for(collection, "chunk")
+            _remove_chunks(chunk_bm25, doc["doc_id"])
+            for key_id, text in _chunk_entries(doc).items():
+                chunk_bm25.add(key_id, text)
+
+    def _remove_from_bm25(self, collection: str, doc_id: str) -> None:
+        self._bm25_for(collection).remove(doc_id)
+        _remove_chunks(self._bm25_for(collection, "chunk"), doc_id)
 
     def ingest_document(
         self,
@@ -83,6 +189,23 @@ class RAGService:
         summary: str | None,
     ) -> dict[str, Any]:
         start_time = time.time()
+        document = self._prepare_document(title, text, source, collection, tags, metadata, summary)
+        if isinstance(document, dict):
+            return document
+        embeddings, fallback = self.embedding.encode_with_fallback([_embedding_text(document)])
+        return self._commit_document(document, embeddings[0], start_time, fallback[0])
+
+    def _prepare_document(
+        self,
+        title: str,
+        text: str,
+        source: str,
+        collection: str,
+        tags: list[str] | None,
+        metadata: dict[str, Any] | None,
+        summary: str | None,
+    ) -> Document | dict[str, Any]:
+        """Validate, summarise and chunk a new document (an error dict on failure)."""
         if not title or not title.strip():
             return {"status": "error", "error": "Title must not be empty"}
         if not text or not text.strip():
@@ -92,7 +215,7 @@ class RAGService:
             return {"status": "error", "error": "Document exceeds max tokens"}
 
         doc_id = str(uuid.uuid4())
-        summary_text = summary or (self.summarizer.summarize(text) if self.settings.ingestion.auto_summary else "")
+        summary_text, summary_status = (summary, SUMMARY_FINAL) if summary else self._auto_summary(text)
         chunk_metadata = self.chunker.chunk(
             text,
             self.settings.chunking.chunk_size,
@@ -101,12 +224,13 @@ class RAGService:
         )
         chunks = [DocumentChunk(**chunk) for chunk in chunk_metadata]
 
-        document = Document(
+        return Document(
             doc_id=doc_id,
             title=title,
             source=source,
             full_text=text,
             summary=summary_text,
+            summary_status=summary_status,
             chunks=chunks,
             tags=tags or [],
             collection=collection,
@@ -114,27 +238,54 @@ class RAGService:
             metadata=metadata or {},
         )
 
-        self.store.save(collection, document.model_dump(mode="json"))
-        embedding = self.embedding.encode([summary_text])[0] if summary_text else self.embedding.encode([title])[0]
-        self._index_for(collection).upsert(doc_id, embedding)
-        self._rebuild_bm25(collection)
+    def _auto_summary(self, text: str) -> tuple[str, str]:
+        """Return the summary of *text* and its ``summary_status``.
+
+        With ``ingestion.deferred_summary`` a cached LLM summary is used if
+        there is one; otherwise the extractive summary is used as a
+        placeholder and the LLM summary is left to the summary worker, so
+        ingest does not wait for a generation round trip.
+        """
+        if not self.settings.ingestion.auto_summary:
+            return "", SUMMARY_FINAL
+        if self.settings.ingestion.deferred_summary and self.summarizer.can_generate:
+            cached = self.summarizer.cached(text)
+            if cached is not None:
+                return cached, SUMMARY_FINAL
+            return self.summarizer.extractive(text), SUMMARY_PENDING
+        return self.summarizer.summarize(text), SUMMARY_FINAL
+
+    def _commit_document(
+        self, document: Document, embedding: np.ndarray, start_time: float, fallback: bool = False
+    ) -> dict[str, Any]:
+        """Persist a prepared document with its embedding and index its keywords.
+
+        *fallback* marks a deterministic fallback vector for re-embedding.
+        """
+        collection = document.collection
+        record = document.model_dump(mode="json")
+        self.store.save(collection, record)
+        self._track_summary(collection, document.doc_id, document.summary_status)
+        self._index_for(collection).upsert(document.doc_id, embedding, fallback=fallback)
+        self._update_bm25(collection, record)
 
         elapsed_ms = (time.time() - start_time) * 1000
         self._log(
             "ingest_document",
-            {"title": title, "source": source, "collection": collection},
+            {"title": document.title, "source": document.source, "collection": collection},
             1,
-            [doc_id],
+            [document.doc_id],
             elapsed_ms,
         )
 
         return {
-            "doc_id": doc_id,
-            "title": title,
+            "doc_id": document.doc_id,
+            "title": document.title,
             "collection": collection,
-            "chunk_count": len(chunks),
-            "token_count": token_count,
-            "summary": summary_text,
+            "chunk_count": len(document.chunks),
+            "token_count": document.token_count,
+            "summary": document.summary,
+            "summary_status": document.summary_status,
             "status": "indexed",
         }
 
@@ -148,17 +299,14 @@ class RAGService:
                 "total_tokens_indexed": 0,
             }
         start_time = time.time()
-        results = []
-        succeeded = 0
-        failed = 0
-        total_tokens = 0
-        for payload in documents:
+        results: list[dict[str, Any]] = [{} for _ in documents]
+        prepared: list[tuple[int, Document]] = []
+        for position, payload in enumerate(documents):
             try:
                 if "title" not in payload or "text" not in payload:
-                    failed += 1
-                    results.append({"title": payload.get("title", "<missing>"), "status": "error", "error": "Missing required 'title' or 'text' field"})
+                    results[position] = {"title": payload.get("title", "<missing>"), "status": "error", "error": "Missing required 'title' or 'text' field"}
                     continue
-                result = self.ingest_document(
+                document = self._prepare_document(
                     title=payload["title"],
                     text=payload["text"],
                     source=payload.get("source", "batch"),
@@ -167,16 +315,30 @@ class RAGService:
                     metadata=payload.get("metadata"),
                     summary=payload.get("summary"),
                 )
-                if result.get("status") == "indexed":
-                    succeeded += 1
-                    total_tokens += int(result.get("token_count", 0))
-                    results.append({"doc_id": result["doc_id"], "title": result["title"], "status": "indexed"})
+                if isinstance(document, dict):
+                    results[position] = {"title": payload.get("title", ""), "status": "error", "error": document.get("error")}
                 else:
-                    failed += 1
-                    results.append({"title": payload.get("title", ""), "status": "error", "error": result.get("error")})
+                    prepared.append((position, document))
+            except Exception as exc:
+                results[position] = {"title": payload.get("title", ""), "status": "error", "error": str(exc)}
+
+        # A single encode call: the engine groups texts into provider batches
+        # of embedding.batch_size and sends up to embedding.max_in_flight of
+        # them concurrently, instead of one request per document.
+        embeddings, fallback = self.embedding.encode_with_fallback(
+            [_embedding_text(document) for _, document in prepared]
+        )
+        succeeded = 0
+        total_tokens = 0
+        for (position, document), embedding, is_fallback in zip(prepared, embeddings, fallback):
+            try:
+                result = self._commit_document(document, embedding, time.time(), is_fallback)
+                succeeded += 1
+                total_tokens += int(result.get("token_count", 0))
+                results[position] = {"doc_id": result["doc_id"], "title": result["title"], "status": "indexed"}
             except Exception as exc:
-                failed += 1
-                results.append({"title": payload.get("title", ""), "status": "error", "error": str(exc)})
+                results[position] = {"title": document.title, "status": "error", "error": str(exc)}
+        failed = len(documents) - succeeded
 
         payload = {
             "total": len(documents),
@@ -201,13 +363,15 @@ class RAGService:
         collection: str,
         min_score: float,
         tags_filter: list[str] | None,
+        query_vector: np.ndarray | None = None,
     ) -> dict[str, Any]:
         start_time = time.time()
         if not query or not query.strip():
             return SearchResponse(query=query or "", results=[], total_candidates=0, search_time_ms=0.0).model_dump()
         top_k = max(1, min(top_k, self.settings.retrieval.max_top_k))
         index = self._index_for(collection)
-        query_vector = self.embedding.encode([query])[0]
+        if query_vector is None:
+            query_vector = self.embedding.encode_query(query)
         scored = index.search(query_vector, top_k)
         documents = {doc["doc_id"]: doc for doc in self.store.list(collection)}
 
@@ -312,16 +476,12 @@ class RAGService:
                 "has_next": chunk_index < len(chunks) - 1,
             }
 
-        query_vector = self.embedding.encode([chunk_query or ""])[0]
+        query_vector = self.embedding.encode_query(chunk_query or "")
         chunk_texts = [chunk["text"] for chunk in chunks]
-        chunk_vectors = self.embedding.encode(chunk_texts)
-        index_scores = []
-        for idx, vector in enumerate(chunk_vectors):
-            query_norm = sum(a * a for a in query_vector) ** 0.5 or 1.0
-            vec_norm = sum(a * a for a in vector) ** 0.5 or 1.0
-            score = sum(a * b for a, b in zip(query_vector, vector)) / (query_norm * vec_norm)
-            index_scores.append((idx, score))
-        best_idx, best_score = max(index_scores, key=lambda item: item[1])
+        chunk_vectors = self.embedding.encode(chunk_texts, INTERACTIVE)
+        scores = _cosine_scores(chunk_vectors, query_vector)
+        best_idx = int(np.argmax(scores))
+        best_score = scores[best_idx]
         chunk = chunks[best_idx]
         self._log(
             "get_document_chunk",
@@ -366,7 +526,7 @@ class RAGService:
             return {"query": doc_id, "results": [], "total_candidates": 0, "search_time_ms": 0.0}
         index = self._index_for(collection)
         summary_text = doc.get("summary", "") or doc.get("title", "")
-        query_vector = self.embedding.encode([summary_text])[0]
+        query_vector = self.embedding.encode([summary_text], INTERACTIVE)[0]
         scored = index.search(query_vector, top_k + 1)
         documents = {doc["doc_id"]: doc for doc in self.store.list(collection)}
 
@@ -414,6 +574,9 @@ class RAGService:
     ) -> dict[str, Any]:
         rankings: list[list[str]] = []
         scores_lookup: dict[str, float] = {}
+        # Embed all reformulations concurrently, then search with each vector.
+        searchable = [query for query in queries if query and query.strip()]
+        query_vectors = dict(zip(searchable, self.embedding.encode_queries(searchable)))
         for query in queries:
             response = self.search_summaries(
                 query=query,
@@ -421,6 +584,7 @@ class RAGService:
                 collection=collection,
                 min_score=self.settings.retrieval.min_similarity_score,
                 tags_filter=None,
+                query_vector=query_vectors.get(query),
             )
             docs = [item["doc_id"] for item in response["results"]]
             rankings.append(docs)
@@ -471,7 +635,10 @@ class RAGService:
         collection: str,
         semantic_weight: float,
         keyword_weight: float,
+        granularity: str = "document",
     ) -> dict[str, Any]:
+        if granularity not in ("document", "chunk"):
+            return {"error": "granularity must be 'document' or 'chunk'"}
         semantic_results = self.search_summaries(
             query=query,
             top_k=top_k,
@@ -480,8 +647,6 @@ class RAGService:
             tags_filter=None,
         )["results"]
         semantic_scores = {item["doc_id"]: item["similarity_score"] for item in semantic_results}
-        bm25 = self._bm25_for(collection)
-        bm25_scores = dict(bm25.score(query))
 
         # Normalise weights and scores to keep similarity_score within [0, 1].
         # Vector similarity is expected to already be in [0, 1], but we clamp defensively.
@@ -493,27 +658,29 @@ class RAGService:
         semantic_w /= weight_sum
         keyword_w /= weight_sum
 
-        max_bm25 = max(bm25_scores.values(), default=0.0)
-        bm25_norm = {
-            doc_id: (score / max_bm25 if max_bm25 > 0.0 else 0.0)
-            for doc_id, score in bm25_scores.items()
-        }
+        documents = {doc["doc_id"]: doc for doc in self.store.list(collection)}
+        if granularity == "chunk":
+            return self._hybrid_chunk_search(query, top_k, collection, documents, semantic_scores, semantic_w, keyword_w)
+
+        bm25 = self._bm25_for(collection)
+        # Keyword candidates come straight from the postings as a top-k list;
+        # semantic hits outside it still get their exact keyword score.
+        bm25_scores = dict(bm25.score(query, top_k))
+        bm25_scores.update(bm25.score_documents(query, semantic_scores))
+        bm25_norm = _normalize_scores(bm25_scores)
 
         combined_scores: dict[str, float] = {}
         for doc_id in set(semantic_scores) | set(bm25_norm):
-            sem = float(semantic_scores.get(doc_id, 0.0))
-            sem = 0.0 if sem < 0.0 else (1.0 if sem > 1.0 else sem)
-            kw = float(bm25_norm.get(doc_id, 0.0))
-            kw = 0.0 if kw < 0.0 else (1.0 if kw > 1.0 else kw)
-            combined_scores[doc_id] = (semantic_w * sem) + (keyword_w * kw)
+            combined_scores[doc_id] = _fuse(
+                semantic_scores.get(doc_id, 0.0), bm25_norm.get(doc_id, 0.0), semantic_w, keyword_w
+            )
 
         ranked = sorted(combined_scores.items(), key=lambda pair: pair[1], reverse=True)[:top_k]
-        documents = {doc["doc_id"]: doc for doc in self.store.list(collection)}
+        ranked = [(doc_id, score) for doc_id, score in ranked if doc_id in documents]
+        best_chunks = self._best_chunks(query, collection, [documents[doc_id] for doc_id, _ in ranked])
         results = []
         for doc_id, score in ranked:
-            doc = documents.get(doc_id)
-            if not doc:
-                continue
+            doc = documents[doc_id]
             results.append(
                 SummaryResult(
                     doc_id=doc_id,
@@ -523,6 +690,7 @@ class RAGService:
                     token_count=doc.get("token_count", 0),
                     tags=doc.get("tags", []),
                     collection=doc.get("collection", collection),
+                    best_chunk_index=best_chunks[doc_id][0] if doc_id in best_chunks else None,
                 )
             )
 
@@ -536,10 +704,84 @@ class RAGService:
         )
         return response.model_dump()
 
+    def _best_chunks(self, query: str, collection: str, docs: list[dict[str, Any]]) -> dict[str, tuple[int, float]]:
+        """Map each doc_id to ``(chunk_index, score)`` of its best keyword-matching chunk."""
+        keys = [key for doc in docs for key in _chunk_entries(doc)]
+        best: dict[str, tuple[int, float]] = {}
+        for key, score in self._bm25_for(collection, "chunk").score_documents(query, keys).items():
+            doc_id, chunk_index = _split_chunk_key(key)
+            if score > 0.0 and score > best.get(doc_id, (0, 0.0))[1]:
+                best[doc_id] = (chunk_index, score)
+        return best
+
+    def _hybrid_chunk_search(
+        self,
+        query: str,
+        top_k: int,
+        collection: str,
+        documents: dict[str, dict[str, Any]],
+        semantic_scores: dict[str, float],
+        semantic_w: float,
+        keyword_w: float,
+    ) -> dict[str, Any]:
+        # Chunks inherit the semantic score of their document's summary; the
+        # keyword side scores passages directly.  Each semantic hit contributes
+        # its best keyword chunk (or its first chunk when none match).
+        bm25 = self._bm25_for(collection, "chunk")
+        bm25_scores = dict(bm25.score(query, top_k))
+        semantic_docs = [documents[doc_id] for doc_id in semantic_scores if doc_id in documents]
+        best_chunks = self._best_chunks(query, collection, semantic_docs)
+        for doc in semantic_docs:
+            if doc.get("chunks"):
+                chunk_index, score = best_chunks.get(doc["doc_id"], (doc["chunks"][0]["chunk_index"], 0.0))
+                bm25_scores.setdefault(_chunk_key(doc["doc_id"], chunk_index), score)
+        bm25_norm = _normalize_scores(bm25_scores)
+
+        combined_scores = {
+            key: _fuse(semantic_scores.get(_split_chunk_key(key)[0], 0.0), kw, semantic_w, keyword_w)
+            for key, kw in bm25_norm.items()
+        }
+        ranked = sorted(combined_scores.items(), key=lambda pair: pair[1], reverse=True)
+        results = []
+        for key, score in ranked:
+            doc_id, chunk_index = _split_chunk_key(key)
+            if doc_id not in documents:
+                continue
+            doc = documents[doc_id]
+            chunks = doc.get("chunks", [])
+            if chunk_index >= len(chunks):
+                continue
+            chunk = chunks[chunk_index]
+            results.append(
+                ChunkResult(
+                    doc_id=doc_id,
+                    title=doc.get("title", ""),
+                    chunk_index=chunk_index,
+                    total_chunks=len(chunks),
+                    text=chunk["text"],
+                    token_count=chunk.get("token_count", 0),
+                    similarity_score=float(score),
+                    collection=doc.get("collection", collection),
+                )
+            )
+            if len(results) == top_k:
+                break
+
+        response = ChunkSearchResponse(query=query, results=results, total_candidates=len(bm25), search_time_ms=0.0)
+        self._log(
+            "hybrid_search",
+            {"query": query, "top_k": top_k, "collection": collection, "granularity": "chunk"},
+            len(results),
+            [result.doc_id for result in results],
+            0.0,
+        )
+        return response.model_dump()
+
     def delete_document(self, doc_id: str, collection: str) -> dict[str, Any]:
         deleted = self.store.delete(collection, doc_id)
+        self._track_summary(collection, doc_id, None)
         self._index_for(collection).delete(doc_id)
-        self._rebuild_bm25(collection)
+        self._remove_from_bm25(collection, doc_id)
         self._log(
             "delete_document",
             {"doc_id": doc_id, "collection": collection},
@@ -583,16 +825,19 @@ class RAGService:
                 self.settings.chunking.min_chunk_size,
             )
             doc["chunks"] = chunk_metadata
-            doc["summary"] = summary or (self.summarizer.summarize(text) if self.settings.ingestion.auto_summary else "")
-            embedding = self.embedding.encode([doc["summary"]])[0] if doc["summary"] else self.embedding.encode([doc["title"]])[0]
-            self._index_for(collection).upsert(doc_id, embedding)
-            self._rebuild_bm25(collection)
+            doc["summary"], doc["summary_status"] = (summary, SUMMARY_FINAL) if summary else self._auto_summary(text)
+            embeddings, fallback = self.embedding.encode_with_fallback([doc["summary"] or doc["title"]])
+            self._index_for(collection).upsert(doc_id, embeddings[0], fallback=fallback[0])
         elif summary is not None:
             doc["summary"] = summary
-            embedding = self.embedding.encode([summary])[0]
-            self._index_for(collection).upsert(doc_id, embedding)
+            doc["summary_status"] = SUMMARY_FINAL
+            embeddings, fallback = self.embedding.encode_with_fallback([summary])
+            self._index_for(collection).upsert(doc_id, embeddings[0], fallback=fallback[0])
 
         self.store.save(collection, doc)
+        self._track_summary(collection, doc_id, doc.get("summary_status"))
+        if text is not None or title is not None or summary is not None:
+            self._update_bm25(collection, doc, chunks_changed=text is not None)
         self._log(
             "update_document",
             {"doc_id": doc_id, "collection": collection},
@@ -602,6 +847,174 @@ class RAGService:
         )
         return {"doc_id": doc_id, "status": "updated"}
 
+    def _provider_ready(self) -> bool:
+        """False while every provider failed to load or has its circuit open.
+
+        Does not construct the providers; the first re-embed batch does.
+        """
+        return self.embedding.available
+
+    def reembed_fallbacks(self, batch_size: int | None = None) -> int:
+        """Re-embed one batch of documents indexed with fallback vectors.
+
+        Takes up to *batch_size* flagged documents from the next collection
+        that has any, embeds them in the bulk lane and replaces the vectors
+        that now come from the provider.  Collections are visited round
+        robin, and one whose batch replaces nothing is passed over for the
+        next, so a failing collection cannot starve the others.  Returns
+        the number replaced.
+        """
+        batch_size = batch_size or self.settings.ingestion.reembed_batch_size
+        collections = sorted(index_path.stem for index_path in self.settings.storage.index_dir.glob("*.npz"))
+        start = collections.index(self._reembed_last) + 1 if self._reembed_last in collections else 0
+        for collection in collections[start:] + collections[:start]:
+            index = self._index_for(collection)
+            pending = index.fallback_doc_ids()
+            if not pending:
+                continue
+            texts: dict[str, str] = {}
+            for doc_id in pending[:batch_size]:
+                doc = self.store.get(collection, doc_id)
+                if doc:
+                    texts[doc_id] = doc.get("summary") or doc.get("title", "")
+            if not texts:
+                continue
+            vectors, fallback = self.embedding.encode_with_fallback(list(texts.values()), BULK)
+            fixed = {doc_id: vector for doc_id, vector, flag in zip(texts, vectors, fallback) if not flag}
+            replaced = index.replace_fallbacks(fixed)
+            self._reembed_last = collection
+            if replaced:
+                self._reembedded[collection] = self._reembedded.get(collection, 0) + replaced
+                logger.info("Re-embedded %d fallback vector(s) in %s", replaced, collection)
+                return replaced
+        return 0
+
+    def _pending_summary_ids(self, collection: str) -> set[str]:
+        """Return the pending doc_ids of *collection* (caller holds ``_summaries_lock``)."""
+        if collection not in self._pending_summaries:
+            self._pending_summaries[collection] = {
+                doc["doc_id"] for doc in self.store.list(collection) if doc.get("summary_status") == SUMMARY_PENDING
+            }
+        return self._pending_summaries[collection]
+
+    def _track_summary(self, collection: str, doc_id: str, status: str | None) -> None:
+        """Record the summary status of a saved (or, with ``None``, deleted) document."""
+        with self._summaries_lock:
+            pending = self._pending_summary_ids(collection)
+            if status == SUMMARY_PENDING:
+                pending.add(doc_id)
+            else:
+                pending.discard(doc_id)
+            self._summary_retries.pop(doc_id, None)
+
+    def _due_summaries(self, batch_size: int) -> list[tuple[str, str]]:
+        """Return up to *batch_size* ``(collection, doc_id)`` pairs not backing off."""
+        now = time.monotonic()
+        due: list[tuple[str, str]] = []
+        with self._summaries_lock:
+            for collection in self.store.collections():
+                for doc_id in self._pending_summary_ids(collection):
+                    retry = self._summary_retries.get(doc_id)
+                    if retry is None or retry[1] <= now:
+                        due.append((collection, doc_id))
+                        if len(due) >= batch_size:
+                            return due
+        return due
+
+    def _unchanged_pending(self, collection: str, doc_id: str, text: str) -> dict[str, Any] | None:
+        """Return the stored document if it is still pending with *text*, else ``None``.
+
+        The document may have been updated or deleted while its summary was
+        being generated.  *text* must be the ``full_text`` read before the
+        LLM call: ``update_document`` edits the stored dict in place.
+        """
+        current = self.store.get(collection, doc_id)
+        if not current or current.get("summary_status") != SUMMARY_PENDING or current.get("full_text", "") != text:
+            return None
+        return current
+
+    def _summary_failed(self, collection: str, doc_id: str, text: str) -> None:
+        """Back off before retrying *doc_id*; give up after ``_SUMMARY_MAX_ATTEMPTS``."""
+        with self._summaries_lock:
+            attempts = self._summary_retries.get(doc_id, (0, 0.0))[0] + 1
+            delay = self.settings.ingestion.deferred_summary_interval * 4 ** attempts
+            self._summary_retries[doc_id] = (attempts, time.monotonic() + delay)
+        if attempts < _SUMMARY_MAX_ATTEMPTS:
+            return
+        current = self._unchanged_pending(collection, doc_id, text)
+        if current is None:
+            return
+        logger.warning("Giving up on the LLM summary of %s after %d attempts; keeping the extractive one", doc_id, attempts)
+        self.store.save(collection, {**current, "summary_status": SUMMARY_FAILED})
+        self._track_summary(collection, doc_id, SUMMARY_FAILED)
+
+    def generate_pending_summaries(self, batch_size: int | None = None) -> int:
+        """Replace one batch of placeholder summaries with LLM summaries.
+
+        Takes up to *batch_size* pending documents across all collections
+        and generates their summaries.  Each document is saved only if it
+        is still pending with the same text (it may have been updated
+        during the LLM calls); the saved ones are then re-embedded in the
+        bulk lane and the keyword index is updated.  A document whose
+        generation fails is skipped and retried with exponential backoff;
+        after ``_SUMMARY_MAX_ATTEMPTS`` it keeps its extractive summary and
+        is marked ``"failed"``.  Returns the number replaced.
+        """
+        batch_size = batch_size or self.settings.ingestion.deferred_summary_batch_size
+        generated: dict[str, list[tuple[str, str, str]]] = {}
+        for collection, doc_id in self._due_summaries(batch_size):
+            doc = self.store.get(collection, doc_id)
+            if not doc or doc.get("summary_status") != SUMMARY_PENDING:
+                self._track_summary(collection, doc_id, doc.get("summary_status") if doc else None)
+                continue
+            text = doc.get("full_text", "")
+            summary = self.summarizer.generate(text)
+            if summary is None:
+                self._summary_failed(collection, doc_id, text)
+                continue
+            generated.setdefault(collection, []).append((doc_id, text, summary))
+
+        replaced = 0
+        for collection, results in generated.items():
+            docs: list[dict[str, Any]] = []
+            for doc_id, text, summary in results:
+                current = self._unchanged_pending(collection, doc_id, text)
+                if current is None:
+                    continue
+                current = {**current, "summary": summary or current.get("summary", ""), "summary_status": SUMMARY_FINAL}
+                self.store.save(collection, current)
+                docs.append(current)
+            if not docs:
+                continue
+            vectors, fallback = self.embedding.encode_with_fallback([doc["summary"] or doc["title"] for doc in docs], BULK)
+            index = self._index_for(collection)
+            for doc, vector, is_fallback in zip(docs, vectors, fallback):
+                self._track_summary(collection, doc["doc_id"], SUMMARY_FINAL)
+                index.upsert(doc["doc_id"], vector, fallback=is_fallback)
+                self._update_bm25(collection, doc, chunks_changed=False)
+            self._summaries_generated[collection] = self._summaries_generated.get(collection, 0) + len(docs)
+            logger.info("Replaced %d placeholder summaries in %s", len(docs), collection)
+            replaced += len(docs)
+        return replaced
+
+    def _summary_progress(self, collection: str, documents: list[dict[str, Any]]) -> dict[str, Any]:
+        with self._summaries_lock:
+            pending = len(self._pending_summary_ids(collection))
+        return {
+            "pending": pending,
+            "generated": self._summaries_generated.get(collection, 0),
+            "failed": sum(1 for doc in documents if doc.get("summary_status") == SUMMARY_FAILED),
+            "worker_running": self.summary_worker.is_running,
+        }
+
+    def _reembed_progress(self, collection: str) -> dict[str, Any]:
+        pending = len(self._index_for(collection).fallback_doc_ids())
+        return {
+            "pending": pending,
+            "reembedded": self._reembedded.get(collection, 0),
+            "worker_running": self.reembed_worker.is_running,
+        }
+
     def collection_stats(self, collection: str) -> dict[str, Any]:
         documents = self.store.list(collection)
         if not documents:
@@ -616,6 +1029,8 @@ class RAGService:
                 "oldest_document": None,
                 "newest_document": None,
                 "index_size_bytes": 0,
+                "fallback_vectors": self._reembed_progress(collection),
+                "deferred_summaries": self._summary_progress(collection, documents),
             }
             self._log("collection_stats", {"collection": collection}, 0, [], 0.0)
             return stats
@@ -644,14 +1059,15 @@ class RAGService:
             "oldest_document": min(doc.get("created_at", "") for doc in documents),
             "newest_document": max(doc.get("created_at", "") for doc in documents),
             "index_size_bytes": index_size,
+            "fallback_vectors": self._reembed_progress(collection),
+            "deferred_summaries": self._summary_progress(collection, documents),
         }
         self._log("collection_stats", {"collection": collection}, len(documents), [doc["doc_id"] for doc in documents], 0.0)
         return stats
 
     def list_collections(self) -> dict[str, Any]:
         collections = []
-        for path in self.settings.storage.store_dir.glob("*.json"):
-            name = path.stem
+        for name in self.store.collections():
             stats = self.collection_stats(name)
             collections.append(
                 {
@@ -668,18 +1084,17 @@ class RAGService:
         return payload
 
     def explain_retrieval(self, query: str, doc_ids: list[str], collection: str) -> dict[str, Any]:
-        query_vector = self.embedding.encode([query])[0]
+        query_vector = self.embedding.encode_query(query)
+        bm25_scores = self._bm25_for(collection).score_documents(query, doc_ids)
+        docs = [doc for doc in (self.store.get(collection, doc_id) for doc_id in doc_ids) if doc]
+        doc_vectors = self.embedding.encode([doc.get("summary", "") for doc in docs], INTERACTIVE)
+        similarities = _cosine_scores(doc_vectors, query_vector)
         explanations = []
-        for doc_id in doc_ids:
-            doc = self.store.get(collection, doc_id)
-            if not doc:
-                continue
-            doc_vector = self.embedding.encode([doc.get("summary", "")])[0]
-            cosine_similarity = sum(a * b for a, b in zip(query_vector, doc_vector))
-            bm25_scores = dict(self._bm25_for(collection).score(query))
+        for doc, cosine_similarity in zip(docs, similarities):
+            doc_id = doc["doc_id"]
             bm25_score = bm25_scores.get(doc_id, 0.0)
-            query_terms = set(query.lower().split())
-            doc_terms = set(doc.get("summary", "").lower().split())
+            query_terms = set(self.analyzer.analyze_query(query))
+            doc_terms = set(self.analyzer.analyze(doc.get("summary", "")))
             overlap = len(query_terms & doc_terms)
             overlap_ratio = overlap / max(1, len(query_terms))
             explanations.append(
@@ -688,7 +1103,7 @@ class RAGService:
                     "title": doc.get("title", ""),
                     "cosine_similarity": float(cosine_similarity),
                     "bm25_score": float(bm25_score),
-                    "top_matching_terms": query.lower().split()[:5],
+                    "top_matching_terms": [term for term in self.analyzer.analyze_query(query) if term in doc_terms][:5],
                     "query_doc_term_overlap": float(overlap_ratio),
                     "explanation_text": "Combined semantic and keyword scores to rank this document.",
                 }
@@ -697,6 +1112,40 @@ class RAGService:
         self._log("explain_retrieval", {"query": query, "doc_ids": doc_ids}, len(explanations), doc_ids, 0.0)
         return payload
 
+    def embedding_cache_stats(self) -> dict[str, Any]:
+        payload = {
+            "query_cache": {
+                "enabled": self.query_cache is not None,
+                **(self.query_cache.stats() if self.query_cache else {}),
+            },
+            "embedding_cache": {
+                "enabled": self.embedding_cache is not None,
+                **(self.embedding_cache.stats() if self.embedding_cache else {}),
+            },
+            "micro_batcher": {
+                "enabled": self.embedding.micro_batcher is not None,
+                **(self.embedding.micro_batcher.stats() if self.embedding.micro_batcher else {}),
+            },
+            "summary_cache": {
+                "enabled": self.summary_cache is not None,
+                **(self.summary_cache.stats() if self.summary_cache else {}),
+            },
+        }
+        self._log("embedding_cache_stats", {}, 1, [], 0.0)
+        return payload
+
+    def server_status(self) -> dict[str, Any]:
+        """Report readiness without waiting for (or triggering) provider loading."""
+        embedding = self.embedding.status()
+        payload = {
+            "ready": embedding["state"] == EmbeddingEngine.READY,
+            "embedding": embedding,
+            "reembed_worker_running": self.reembed_worker.is_running,
+            "summary_worker_running": self.summary_worker.is_running,
+        }
+        self._log("server_status", {}, 1, [], 0.0)
+        return payload
+
     def retrieval_log(self, last_n: int, tool_filter: str | None, session_id: str | None) -> dict[str, Any]:
         entries = self.audit.read(last_n, tool_filter=tool_filter, session_id=session_id)
         payload = {"entries": entries, "total_entries": len(entries)}
@@ -704,6 +1153,55 @@ class RAGService:
         return payload
 
 
+def _keyword_text(doc: dict[str, Any]) -> str:
+    # Include title, summary, AND full_text for better keyword coverage
+    return f"{doc.get('title', '')} {doc.get('summary', '')} {doc.get('full_text', '')}"
+
+
+def _embedding_text(document: Document) -> str:
+    # Summaries drive Level 1 retrieval; fall back to the title when empty.
+    return document.summary or document.title
+
+
+def _cosine_scores(matrix: np.ndarray, query_vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row of *matrix* with *query_vector*."""
+    if not len(matrix):
+        return np.empty(0, dtype=np.float32)
+    return normalize_vectors(matrix) @ normalize_vectors(query_vector.reshape(1, -1))[0]
+
+
+def _normalize_scores(scores: dict[str, float]) -> dict[str, float]:
+    # Divide by the best score so keyword scores land in [0, 1].
+    top = max(scores.values(), default=0.0)
+    return {key: (score / top if top > 0.0 else 0.0) for key, score in scores.items()}
+
+
+def _fuse(semantic: float, keyword: float, semantic_w: float, keyword_w: float) -> float:
+    semantic = min(1.0, max(0.0, float(semantic)))
+    keyword = min(1.0, max(0.0, float(keyword)))
+    return (semantic_w * semantic) + (keyword_w * keyword)
+
+
+def _chunk_key(doc_id: str, chunk_index: int) -> str:
+    return f"{doc_id}#{chunk_index}"
+
+
+def _split_chunk_key(key: str) -> tuple[str, int]:
+    doc_id, _, chunk_index = key.rpartition("#")
+    return doc_id, int(chunk_index)
+
+
+def _chunk_entries(doc: dict[str, Any]) -> dict[str, str]:
+    return {_chunk_key(doc["doc_id"], chunk["chunk_index"]): chunk["text"] for chunk in doc.get("chunks", [])}
+
+
+def _remove_chunks(scorer: BM25Scorer, doc_id: str) -> None:
+    # Chunk indexes are contiguous from 0, so stop at the first gap.
+    chunk_index = 0
+    while scorer.remove(_chunk_key(doc_id, chunk_index)):
+        chunk_index += 1
+
+
 def _read_api_key() -> str | None:
     import os
 
@@ -723,7 +1221,9 @@ def get_service() -> RAGService:
 # ---------------------------------------------------------------------------
 # Knowledge-base manager singleton
 # ---------------------------------------------------------------------------
-from staged_rag.core.kb_manager import KnowledgeBaseManager as _KBManager
+# Imported on first use: only servers with knowledge_base.enabled need it.
+if TYPE_CHECKING:
+    from staged_rag.core.kb_manager import KnowledgeBaseManager as _KBManager
 
 _kb_manager: _KBManager | None = None
 
@@ -749,6 +1249,8 @@ def start_kb_manager(settings=None) -> _KBManager | None:
     if not kb_cfg.enabled:
         return None
 
+    from staged_rag.core.kb_manager import KnowledgeBaseManager as _KBManager
+
     _kb_manager = _KBManager(
         kb_dir=kb_cfg.kb_dir,
         manifest_path=kb_cfg.manifest_file,
@@ -756,11 +1258,58 @@ def start_kb_manager(settings=None) -> _KBManager | None:
         poll_interval=kb_cfg.poll_interval,
         max_file_size=kb_cfg.max_file_size,
         auto_summary=settings.ingestion.auto_summary,
+        codec=settings.storage.codec,
     )
     _kb_manager.start()
     return _kb_manager
 
 
+def start_reembed_worker(settings=None) -> BackgroundWorker | None:
+    """Start re-embedding fallback vectors in the background.
+
+    Returns the worker, or ``None`` if ``ingestion.reembed_fallbacks`` is off.
+    """
+    service = get_service()
+    settings = settings or service.settings
+    if not settings.ingestion.reembed_fallbacks:
+        return None
+    service.reembed_worker.start()
+    return service.reembed_worker
+
+
+def start_summary_worker(settings=None) -> BackgroundWorker | None:
+    """Start generating deferred LLM summaries in the background.
+
+    Returns the worker, or ``None`` if ``ingestion.deferred_summary`` is off.
+    """
+    service = get_service()
+    settings = settings or service.settings
+    if not settings.ingestion.deferred_summary:
+        return None
+    service.summary_worker.start()
+    return service.summary_worker
+
+
+def start_embedding_warm_up(settings=None) -> None:
+    """Load the embedding provider in the background if ``embedding.warm_up`` is on."""
+    service = get_service()
+    settings = settings or service.settings
+    if settings.embedding.warm_up:
+        service.embedding.warm_up()
+
+
+def stop_reembed_worker() -> None:
+    """Stop the re-embed worker if the service was created."""
+    if _service is not None:
+        _service.reembed_worker.stop()
+
+
+def stop_summary_worker() -> None:
+    """Stop the deferred summary worker if the service was created."""
+    if _service is not None:
+        _service.summary_worker.stop()
+
+
 def stop_kb_manager() -> None:
     """Stop the knowledge-base watcher."""
     global _kb_manager
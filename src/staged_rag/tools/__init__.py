@@ -3,7 +3,14 @@
 from .advanced import find_similar, hybrid_search, multi_query_search
 from .management import delete_document, ingest_batch, ingest_document, kb_resync, kb_status, update_document
 from .metadata import get_document_metadata
-from .observability import collection_stats, explain_retrieval, list_collections, retrieval_log
+from .observability import (
+    collection_stats,
+    embedding_cache_stats,
+    explain_retrieval,
+    list_collections,
+    retrieval_log,
+    server_status,
+)
 from .retrieval import get_document_chunk, get_documents, search_summaries
 
 __all__ = [
@@ -22,6 +29,8 @@ __all__ = [
     "get_document_metadata",
     "retrieval_log",
     "collection_stats",
+    "embedding_cache_stats",
+    "server_status",
     "list_collections",
     "explain_retrieval",
 ]
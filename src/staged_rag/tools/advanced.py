@@ -26,7 +26,8 @@ def hybrid_search(
     collection: str = "default",
     semantic_weight: float = 0.7,
     keyword_weight: float = 0.3,
+    granularity: str = "document",
 ) -> dict:
     """Blend keyword and semantic search traces for precise recall."""
     service = get_service()
-    return service.hybrid_search(query, top_k, collection, semantic_weight, keyword_weight)
+    return service.hybrid_search(query, top_k, collection, semantic_weight, keyword_weight, granularity)
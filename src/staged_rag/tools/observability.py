@@ -15,6 +15,18 @@ def collection_stats(collection: str = "default") -> dict:
     return service.collection_stats(collection)
 
 
+def server_status() -> dict:
+    """Report embedding provider readiness and background workers."""
+    service = get_service()
+    return service.server_status()
+
+
+def embedding_cache_stats() -> dict:
+    """Report query-vector and persistent embedding cache hit rates."""
+    service = get_service()
+    return service.embedding_cache_stats()
+
+
 def list_collections() -> dict:
     """Enumerate available collections."""
     service = get_service()
@@ -179,9 +179,18 @@ def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
     return vectors / norms
 
 
-def deterministic_vector(text: str, dimension: int) -> list[float]:
+def deterministic_vector(text: str, dimension: int) -> np.ndarray:
+    """Return a unit float32 vector seeded by the SHA-256 of *text*."""
     seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % (2**32)
     rng = np.random.default_rng(seed)
     vector = rng.normal(size=dimension)
     norm = math.sqrt(float(np.dot(vector, vector))) or 1.0
-    return (vector / norm).astype(float).tolist()
+    return (vector / norm).astype(np.float32)
+
+
+def deterministic_vectors(texts: list[str], dimension: int) -> np.ndarray:
+    """Return ``deterministic_vector`` of each text as a ``(n, dimension)`` float32 matrix."""
+    matrix = np.empty((len(texts), dimension), dtype=np.float32)
+    for row, text in enumerate(texts):
+        matrix[row] = deterministic_vector(text, dimension)
+    return matrix
@@ -0,0 +1,38 @@
+"""Fake embedding providers shared by the test modules."""
+
+import threading
+import time
+
+from staged_rag.embeddings import EmbeddingBase
+
+
+class LengthProvider(EmbeddingBase):
+    """Embeds a text as ``[len(text)] * dims`` and records every batch it is sent.
+
+    With *delay* each batch sleeps that long; ``peak`` is the largest
+    number of batches seen in flight at once.
+    """
+
+    def __init__(self, dims: int = 4, delay: float = 0.0) -> None:
+        super().__init__()
+        self.dims = dims
+        self.delay = delay
+        self.requests: list[list[str]] = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> list[float]:
+        raise AssertionError("embed_batch should be used")
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.requests.append(list(texts))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.running -= 1
+        return [[float(len(text))] * self.dims for text in texts]
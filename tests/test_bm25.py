@@ -0,0 +1,102 @@
+import random
+
+from staged_rag.core.analyzer import Analyzer
+from staged_rag.core.bm25 import BM25Scorer
+
+
+def test_bm25_incremental_updates_match_full_build() -> None:
+    documents = [
+        {"doc_id": "a", "keyword_text": "staged retrieval with summaries"},
+        {"doc_id": "b", "keyword_text": "keyword retrieval using bm25 postings"},
+        {"doc_id": "c", "keyword_text": "vector index cosine similarity"},
+    ]
+    built = BM25Scorer()
+    built.build(documents)
+
+    incremental = BM25Scorer()
+    incremental.add("x", "temporary document about retrieval")
+    for document in documents:
+        incremental.add(document["doc_id"], document["keyword_text"])
+    incremental.add("c", "stale text")
+    incremental.add("c", "vector index cosine similarity")
+    assert incremental.remove("x")
+    assert not incremental.remove("missing")
+
+    assert len(incremental) == 3
+    assert sorted(incremental.score("retrieval postings")) == sorted(built.score("retrieval postings"))
+    assert {doc_id for doc_id, _ in built.score("retrieval")} == {"a", "b"}
+
+
+def test_bm25_top_k_and_document_scores_agree() -> None:
+    scorer = BM25Scorer()
+    scorer.build(
+        {"doc_id": f"doc-{i}", "keyword_text": "common " * (i + 1) + ("rare" if i % 3 == 0 else "")}
+        for i in range(10)
+    )
+    full = scorer.score("common rare")
+    assert [score for _, score in full] == sorted((score for _, score in full), reverse=True)
+    assert scorer.score("common rare", top_k=3) == full[:3]
+    exact = scorer.score_documents("common rare", ["doc-0", "doc-1", "missing"])
+    assert exact == {doc_id: score for doc_id, score in full if doc_id in exact}
+
+
+def test_bm25_max_score_pruning_matches_exhaustive() -> None:
+    rng = random.Random(3)
+    vocab = [f"t{i}" for i in range(200)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    scorer = BM25Scorer()
+    scorer.build(
+        {"doc_id": f"doc-{i}", "keyword_text": " ".join(rng.choices(vocab, weights, k=rng.randint(5, 40)))}
+        for i in range(500)
+    )
+    for query in ["t0 t1 t50", "t2 t3 t120 t150", "t0 t199"]:
+        pruned = scorer.score(query, top_k=5)
+        exhaustive = scorer.score(query, top_k=5, prune=False)
+        assert [doc_id for doc_id, _ in pruned] == [doc_id for doc_id, _ in exhaustive]
+        assert all(abs(a - b) < 1e-9 for (_, a), (_, b) in zip(pruned, exhaustive))
+
+
+def test_bm25_persists_and_replays_delta_log(tmp_path) -> None:
+    path = tmp_path / "default.bm25"
+    scorer = BM25Scorer(path)
+    scorer.build([{"doc_id": "a", "keyword_text": "alpha beta"}, {"doc_id": "b", "keyword_text": "beta gamma"}])
+    scorer.add("c", "gamma delta")
+    scorer.remove("a")
+    expected = scorer.score("beta gamma delta")
+
+    reloaded = BM25Scorer(path)
+    assert reloaded.doc_ids() == {"b", "c"}
+    assert reloaded.score("beta gamma delta") == expected
+    assert reloaded.is_current("b", "beta gamma") and reloaded.is_current("c", "gamma delta")
+    assert not reloaded.is_current("c", "gamma epsilon") and not reloaded.is_current("a", "alpha beta")
+
+    reloaded.build([{"doc_id": "z", "keyword_text": "omega"}])
+    assert BM25Scorer(path).doc_ids() == {"z"}
+    assert sorted(p.name for p in path.iterdir() if p.name.startswith("delta")) == []
+
+
+def test_analyzer_normalizes_punctuation_stopwords_and_inflections() -> None:
+    analyzer = Analyzer()
+    assert analyzer.analyze("The Retrieval. Indexes, indexed; RETRIEVING summaries!") == [
+        "retrieval",
+        "index",
+        "index",
+        "retriev",
+        "summary",
+    ]
+    assert analyzer.term_counts("Indexes, indexed documents") == {"index": 2, "document": 1}
+    assert analyzer.analyze_query("indexing the summary") == ("index", "summary")
+    analyzer.analyze_query("indexing the summary")
+    assert analyzer.cache_info()["hits"] == 1
+
+    scorer = BM25Scorer(analyzer=analyzer)
+    scorer.build([{"doc_id": "a", "keyword_text": "Retrieved documents."}, {"doc_id": "b", "keyword_text": "the vector"}])
+    assert [doc_id for doc_id, _ in scorer.score("document retrieval")] == ["a"]
+    assert scorer.score("the") == []
+
+
+def test_bm25_analyzer_change_discards_persisted_index(tmp_path) -> None:
+    path = tmp_path / "default.bm25"
+    BM25Scorer(path).build([{"doc_id": "a", "keyword_text": "indexed documents"}])
+    assert BM25Scorer(path).doc_ids() == {"a"}
+    assert len(BM25Scorer(path, analyzer=Analyzer(stemmer=False))) == 0
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+from conftest import LengthProvider
+
+from staged_rag import service as service_module
+from staged_rag.config import load_settings
+from staged_rag.core import embeddings as engine_module
+from staged_rag.service import RAGService
+
+
+def test_placeholder_summary_is_replaced_in_the_background(tmp_path, monkeypatch) -> None:
+    failing = True
+
+    def generate_content(model: str, contents: str) -> SimpleNamespace:
+        if failing or "Blocked" in contents:
+            raise RuntimeError("429 resource exhausted")
+        return SimpleNamespace(text="A zebra crossing guide.")
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    monkeypatch.setattr(engine_module, "_get_genai_client", lambda api_key: client)
+    # No retry backoff, so failed documents are due again immediately.
+    (tmp_path / "config.yaml").write_text("ingestion:\n  deferred_summary: true\n  deferred_summary_interval: 0\n")
+    service = RAGService(load_settings(root=tmp_path))
+    service.summarizer.api_key = "key"
+    service.embedding.provider = LengthProvider(service.embedding.dimension)
+
+    text = "Pedestrians should cross the road at marked crossings. Look both ways before stepping out."
+    result = service.ingest_document("Crossings", text, "test", "c", None, None, None)
+    assert result["summary_status"] == "pending"
+    assert result["summary"] == service.summarizer.extractive(text)
+    assert service.collection_stats("c")["deferred_summaries"]["pending"] == 1
+
+    # A failed generation leaves the placeholder for the next run.
+    assert service.summary_worker.run_once() == 0
+    assert service.store.get("c", result["doc_id"])["summary_status"] == "pending"
+
+    # A document that always fails does not hold up the others.
+    blocked = service.ingest_document("Blocked", "Blocked content. " + text, "test", "c", None, None, None)
+    failing = False
+    assert service.summary_worker.run_once() == 1
+    for _ in range(5):
+        assert service.summary_worker.run_once() == 0
+    blocked_doc = service.store.get("c", blocked["doc_id"])
+    assert (blocked_doc["summary"], blocked_doc["summary_status"]) == (blocked["summary"], "failed")
+    doc = RAGService(load_settings(root=tmp_path)).store.get("c", result["doc_id"])
+    assert (doc["summary"], doc["summary_status"]) == ("A zebra crossing guide.", "final")
+    assert service._bm25_for("c").score_documents("zebra", [result["doc_id"]])[result["doc_id"]] > 0
+    progress = service.collection_stats("c")["deferred_summaries"]
+    assert (progress["pending"], progress["generated"], progress["failed"]) == (0, 1, 1)
+
+    # Re-ingesting the same text reuses the cached summary at once.
+    again = service.ingest_document("Crossings", text, "test", "c", None, None, None)
+    assert (again["summary"], again["summary_status"]) == ("A zebra crossing guide.", "final")
+
+
+def test_documents_updated_during_generation_keep_their_update(tmp_path, monkeypatch) -> None:
+    calls: list[str] = []
+    edits: dict[int, str] = {}
+    failing = False
+
+    def generate_content(model: str, contents: str) -> SimpleNamespace:
+        calls.append(contents)
+        if len(calls) in edits:
+            # An update lands while this batch is still being generated.
+            doc_id = next(doc_id for text, doc_id in doc_ids.items() if text in calls[0])
+            service.update_document(doc_id, "c", edits[len(calls)], None, None, None, None)
+        if failing:
+            raise RuntimeError("429 resource exhausted")
+        return SimpleNamespace(text="An LLM summary.")
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    monkeypatch.setattr(engine_module, "_get_genai_client", lambda api_key: client)
+    monkeypatch.setattr(service_module, "_SUMMARY_MAX_ATTEMPTS", 1)
+    (tmp_path / "config.yaml").write_text("ingestion:\n  deferred_summary: true\n  deferred_summary_interval: 0\n")
+    service = RAGService(load_settings(root=tmp_path))
+    service.summarizer.api_key = "key"
+    service.embedding.provider = LengthProvider(service.embedding.dimension)
+    texts = ["Bicycles need lights after dark. Reflectors help too.", "Trains run on rails. Stations have platforms."]
+    doc_ids = {text: service.ingest_document("Doc", text, "test", "c", None, None, None)["doc_id"] for text in texts}
+
+    # The document generated first is edited during the second LLM call.
+    edits[2] = "Edited text. It is pending again."
+    assert service.summary_worker.run_once() == 1
+    edited = service.store.get("c", doc_ids[next(text for text in texts if text in calls[0])])
+    assert (edited["full_text"], edited["summary_status"]) == (edits[2], "pending")
+
+    # A document edited during its last failing attempt is not marked failed.
+    calls.clear()
+    edits.clear()
+    edits[1] = "Edited again. Still pending."
+    doc_ids = {edited["full_text"]: edited["doc_id"]}
+    failing = True
+    assert service.summary_worker.run_once() == 0
+    edited = service.store.get("c", edited["doc_id"])
+    assert (edited["full_text"], edited["summary_status"]) == (edits[1], "pending")
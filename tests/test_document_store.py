@@ -1,3 +1,5 @@
+import json
+
 from staged_rag.core.document_store import DocumentStore
 
 
@@ -6,3 +8,18 @@ def test_document_store_save_and_get(tmp_path) -> None:
     document = {"doc_id": "test", "title": "Demo"}
     store.save("default", document)
     assert store.get("default", "test") == document
+
+
+def test_document_store_migrates_legacy_json_to_codec_extension(tmp_path) -> None:
+    legacy = {"legacy": {"doc_id": "legacy", "title": "Old"}}
+    (tmp_path / "default.json").write_text(json.dumps(legacy, indent=2))
+    store = DocumentStore(tmp_path, codec="pickle")
+    assert store.get("default", "legacy") == legacy["legacy"]
+    assert not (tmp_path / "default.json").exists()
+
+    store.save("default", {"doc_id": "new", "title": "New"})
+    assert (tmp_path / "default.pickle").read_bytes()[:1] == b"\x00"
+    assert store.collections() == ["default"]
+    reloaded = DocumentStore(tmp_path, codec="json")
+    assert {doc["doc_id"] for doc in reloaded.list("default")} == {"legacy", "new"}
+    assert json.loads((tmp_path / "default.json").read_text())["new"]["title"] == "New"
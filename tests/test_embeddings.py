@@ -1,4 +1,21 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from conftest import LengthProvider
+
+from staged_rag.core import embeddings as engine_module
+from staged_rag.core.embedding_cache import EmbeddingCache, QueryVectorCache
 from staged_rag.core.embeddings import EmbeddingEngine
+from staged_rag.core.micro_batcher import MicroBatcher
+from staged_rag.core.rate_limiter import INTERACTIVE, RateLimiter, get_rate_limiter
+from staged_rag.core.resilience import CircuitBreaker
+from staged_rag.embeddings import EmbedderFactory, huggingface
+from staged_rag.embeddings.configs import BaseEmbedderConfig
 
 
 def test_embedding_engine_returns_vectors() -> None:
@@ -10,16 +27,300 @@ def test_embedding_engine_returns_vectors() -> None:
         dimension=16,
     )
     vectors = engine.encode(["hello", "world"])
-    assert len(vectors) == 2
-    assert all(len(vec) == engine.dimension for vec in vectors)
+    assert vectors.shape == (2, engine.dimension)
+    assert vectors.dtype == np.float32 and vectors.flags.c_contiguous
 
 
 def test_embedding_factory_list_providers() -> None:
     """The factory should list all supported providers."""
-    from staged_rag.embeddings import EmbedderFactory
-
     providers = EmbedderFactory.list_providers()
     assert "gemini" in providers
     assert "openai" in providers
     assert "ollama" in providers
     assert len(providers) >= 5
+
+
+def test_embedding_engine_encodes_in_provider_batches() -> None:
+    """encode() should send at most batch_size texts per provider request."""
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, batch_size=2)
+    provider = LengthProvider()
+    engine.provider = provider
+    vectors = engine.encode(["a", "bb", "ccc", "dddd", "eeeee"])
+    assert provider.requests == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert [vec[0] for vec in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_embedding_cache_serves_repeated_texts(tmp_path) -> None:
+    """Texts embedded before are served from the persistent cache."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, cache=cache)
+    engine.provider = provider = LengthProvider()
+    assert [vec[0] for vec in engine.encode(["a", "bb", "a"])] == [1.0, 2.0, 1.0]
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path / "cache.sqlite3", max_bytes=40)
+    engine.cache = reopened
+    assert [vec[0] for vec in engine.encode(["bb", "ccc"])] == [2.0, 3.0]
+    assert provider.requests == [["a", "bb"], ["ccc"]]
+    stats = reopened.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    # Three 16-byte vectors exceed the 40-byte budget: the LRU entry goes.
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+
+def test_query_vector_cache_shares_in_flight_requests() -> None:
+    """Concurrent identical queries share one provider call; repeats hit the LRU."""
+    release = threading.Event()
+
+    class SlowProvider(LengthProvider):
+        def embed_batch(self, texts: list[str]) -> list[list[float]]:
+            release.wait(5)
+            return super().embed_batch(texts)
+
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, query_cache=QueryVectorCache(8))
+    engine.provider = provider = SlowProvider()
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(engine.encode_query, "same query") for _ in range(4)]
+        while engine.query_cache.stats()["shared_in_flight"] < 3:
+            time.sleep(0.001)
+        release.set()
+        assert all(future.result().tolist() == [10.0] * 4 for future in futures)
+    assert engine.encode_query("same query").tolist() == [10.0] * 4
+    assert provider.requests == [["same query"]]
+    assert engine.query_cache.stats()["hits"] == 1
+
+
+def test_embedding_engine_backs_off_then_opens_circuit(monkeypatch) -> None:
+    """Failed batches retry with backoff, fall back flagged, and trip the breaker."""
+    delays: list[float] = []
+    monkeypatch.setattr(engine_module.time, "sleep", delays.append)
+
+    class DownProvider(LengthProvider):
+        def embed_batch(self, texts: list[str]) -> list[list[float]]:
+            self.requests.append(list(texts))
+            raise RuntimeError("429 Too Many Requests, retry in 3s")
+
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, max_retries=4, circuit_breaker=breaker)
+    engine.provider = provider = DownProvider()
+    vectors, fallback = engine.encode_with_fallback(["a", "bb"])
+    assert fallback == [True, True] and len(vectors) == 2
+    # Three failures open the circuit; the Retry-After hint sets the floor.
+    assert len(provider.requests) == 3 and breaker.state == CircuitBreaker.OPEN
+    assert all(delay >= 3.0 for delay in delays)
+
+    engine.encode_with_fallback(["ccc"])
+    assert len(provider.requests) == 3
+
+    engine.provider = LengthProvider()
+    breaker.reset_timeout = 0.0
+    vectors, fallback = engine.encode_with_fallback(["ccc"])
+    assert (vectors.tolist(), fallback) == ([[3.0] * 4], [False])
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_encode_bounds_concurrency_and_keeps_order() -> None:
+    """Batches run up to max_in_flight at a time; results keep input order."""
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, batch_size=1, max_in_flight=3)
+    engine.provider = provider = LengthProvider(delay=0.02)
+    texts = ["x" * length for length in range(1, 10)]
+    vectors = engine.encode(texts)
+    assert [vec[0] for vec in vectors] == [float(length) for length in range(1, 10)]
+    assert len(provider.requests) == 9 and provider.peak == 3
+
+
+def test_max_in_flight_bounds_concurrent_callers() -> None:
+    """Single-batch encodes from separate threads share the max_in_flight bound."""
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, batch_size=8, max_in_flight=2)
+    engine.provider = provider = LengthProvider(delay=0.02)
+    with ThreadPoolExecutor(8) as pool:
+        vectors = list(pool.map(lambda length: engine.encode(["x" * length]), range(1, 9)))
+    assert [batch[0][0] for batch in vectors] == [float(length) for length in range(1, 9)]
+    assert len(provider.requests) == 8 and provider.peak == 2
+
+
+def test_interactive_query_passes_bulk_batches_waiting_for_rate_limit() -> None:
+    """Bulk batches waiting on the rate limiter do not hold max_in_flight slots."""
+    limiter = RateLimiter(600, 0, interactive_reserve=0.0)
+    for _ in range(600):
+        limiter.acquire()
+    engine = EmbeddingEngine(
+        provider="gemini", api_key=None, dimension=4, batch_size=8, max_in_flight=1, rate_limiter=limiter
+    )
+    engine.provider = provider = LengthProvider()
+    bulk = [threading.Thread(target=engine.encode, args=(["b" * length],)) for length in range(2, 10)]
+    for thread in bulk:
+        thread.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    assert engine.encode(["q"], INTERACTIVE)[0][0] == 1.0
+    elapsed = time.perf_counter() - started
+    for thread in bulk:
+        thread.join()
+    # One token every 0.1s: the query is served next, not after the 8 bulk batches.
+    assert elapsed < 0.4 and provider.requests.index(["q"]) <= 1
+
+
+def test_micro_batcher_coalesces_concurrent_queries() -> None:
+    """Concurrent single-text interactive requests share one provider call."""
+    engine = EmbeddingEngine(provider="gemini", api_key=None, dimension=4, batch_size=8, micro_batch_window=0.2)
+    engine.provider = provider = LengthProvider()
+    texts = ["q" * length for length in range(1, 9)]
+    with ThreadPoolExecutor(8) as pool:
+        vectors = list(pool.map(engine.encode_query, texts))
+    assert [vec[0] for vec in vectors] == [float(length) for length in range(1, 9)]
+    # The batch fills before the window expires.
+    assert sorted(map(len, provider.requests)) == [8]
+    assert engine.micro_batcher.stats()["batches"] == 1
+
+
+def test_micro_batches_are_in_flight_concurrently() -> None:
+    """A slow batch does not hold up the next one."""
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow_batch(texts: list[str]) -> tuple[np.ndarray, bool]:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.2)
+        with lock:
+            state["active"] -= 1
+        return np.array([[float(len(text))] for text in texts]), True
+
+    batcher = MicroBatcher(slow_batch, max_batch=2, window=0.01)
+    texts = ["q" * length for length in range(1, 5)]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(batcher.submit, texts))
+    assert [vector[0] for vector, _ in results] == [1.0, 2.0, 3.0, 4.0]
+    assert state["peak"] >= 2
+
+
+def test_hashing_provider_gives_lexical_similarity() -> None:
+    """The offline provider is deterministic and ranks shared vocabulary higher."""
+    provider = EmbedderFactory.create("hashing", {"embedding_dims": 64})
+    texts = ["Vector databases store dense embeddings", "Dense embedding vectors in a database", "The cat sat on the mat"]
+    vectors = np.array(provider.embed_batch(texts))
+    assert vectors.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2] + 0.2
+    assert np.allclose(provider.embed(texts[0]), vectors[0])
+
+
+def test_huggingface_local_batches_and_pool(monkeypatch) -> None:
+    calls: list[tuple[str, int, int]] = []
+
+    class _FakeModel:
+        def __init__(self, name: str, **kwargs) -> None:
+            pass
+
+        def encode(self, texts, batch_size=32, convert_to_numpy=True):
+            calls.append(("encode", len(texts), batch_size))
+            return np.zeros((len(texts), 4), dtype=np.float32)
+
+        def start_multi_process_pool(self, target_devices):
+            calls.append(("start", len(target_devices), int(os.environ["OMP_NUM_THREADS"])))
+            return {"devices": target_devices}
+
+        def encode_multi_process(self, texts, pool, batch_size=32):
+            calls.append(("pool", len(texts), batch_size))
+            return np.zeros((len(texts), 4), dtype=np.float32)
+
+        def stop_multi_process_pool(self, pool):
+            calls.append(("stop", 0, 0))
+
+    exit_handlers: list = []
+    monkeypatch.setattr(huggingface, "SentenceTransformer", _FakeModel)
+    monkeypatch.setattr(huggingface.atexit, "register", exit_handlers.append)
+    monkeypatch.setenv("OMP_NUM_THREADS", "16")
+    provider = huggingface.HuggingFaceEmbedding(
+        BaseEmbedderConfig(
+            model="fake", embedding_dims=4, huggingface_batch_size=8, huggingface_workers=3,
+            huggingface_threads_per_worker=2,
+        )
+    )
+
+    assert provider.embed_batch(["a"] * 5).shape == (5, 4)
+    assert provider.embed_batch(["a"] * 20).shape == (20, 4)
+    provider.embed_batch(["a"] * 20)
+    provider.close()
+    assert calls == [("encode", 5, 8), ("start", 3, 2), ("pool", 20, 8), ("pool", 20, 8), ("stop", 0, 0)]
+    # Workers get their thread limit; the parent's environment is restored.
+    assert os.environ["OMP_NUM_THREADS"] == "16"
+    # Restarting the pool after close does not stack exit handlers.
+    provider.embed_batch(["a"] * 20)
+    provider.close()
+    assert len(exit_handlers) == 1
+
+
+def test_provider_is_built_on_first_use_or_warm_up() -> None:
+    engine = EmbeddingEngine(provider="hashing", dimension=32)
+    assert engine.status()["state"] == EmbeddingEngine.PENDING
+
+    engine.warm_up().join()
+    status = engine.status()
+    assert (status["state"], status["model"]) == (EmbeddingEngine.READY, "hashing-ngram-v1")
+    assert engine.warm_up() is None
+    assert engine.encode(["hello"]).shape == (1, 32)
+
+
+def test_failover_serves_requests_when_the_primary_fails_to_construct() -> None:
+    engine = EmbeddingEngine(
+        provider="gemini", model_name="m", dimension=4, model_family="f",
+        failover=[{"provider": "hashing", "model_family": "f"}],
+    )
+    key = engine._cache_key("text")
+    engine.provider = None
+    assert engine.available and engine._cache_key("text") == key
+    vectors, fallback = engine.encode_with_fallback(["text"])
+    expected = EmbedderFactory.create("hashing", {"embedding_dims": 4}).embed_batch(["text"])
+    assert fallback == [False] and np.allclose(vectors[0], expected[0])
+
+
+def test_failover_chain_and_hedged_queries() -> None:
+    """A failing primary fails over; a slow one is hedged; mixed families are rejected."""
+    with pytest.raises(ValueError, match="model family"):
+        EmbeddingEngine(provider="gemini", model_name="a", dimension=4, failover=[{"provider": "hashing", "model": "b"}])
+    with pytest.raises(ValueError, match="dimensions"):
+        EmbeddingEngine(
+            provider="gemini", dimension=4, model_family="f",
+            failover=[{"provider": "hashing", "model_family": "f", "dimensions": 8}],
+        )
+
+    # A backup of the same provider gets its own budget.
+    primary_limiter = get_rate_limiter("hashing", 3000, 1_000_000)
+    chained = EmbeddingEngine(
+        provider="hashing", dimension=4, rate_limiter=primary_limiter,
+        failover=[{"provider": "hashing"}],
+    )
+    assert chained._backends[1].rate_limiter is not primary_limiter
+    assert (primary_limiter.requests_per_minute, primary_limiter.tokens_per_minute) == (3000, 1_000_000)
+
+    class FlakyProvider(LengthProvider):
+        down = False
+
+        def embed_batch(self, texts: list[str]) -> list[list[float]]:
+            if self.down:
+                raise RuntimeError("connection refused")
+            return super().embed_batch(texts)
+
+    engine = EmbeddingEngine(
+        provider="gemini", dimension=4, model_family="f", hedge_percentile=50,
+        failover=[{"provider": "hashing", "model_family": "f"}],
+    )
+    engine.provider = primary = FlakyProvider()
+    expected = EmbedderFactory.create("hashing", {"embedding_dims": 4}).embed_batch(["down", "slow"])
+
+    primary.down = True
+    vectors, fallback = engine.encode_with_fallback(["down"])
+    assert fallback == [False] and np.allclose(vectors[0], expected[0])
+
+    primary.down = False
+    for i in range(20):
+        engine.encode_query(f"warm {i}")
+    primary.delay = 0.5
+    started = time.perf_counter()
+    assert np.allclose(engine.encode_query("slow"), expected[1])
+    assert time.perf_counter() - started < 0.4
+    hedging = engine.status()["hedging"]
+    assert (hedging["hedged_requests"], hedging["hedge_wins"]) == (1, 1)
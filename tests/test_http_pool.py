@@ -0,0 +1,20 @@
+from staged_rag import http_pool
+from staged_rag.embeddings import EmbedderFactory
+
+
+def test_providers_share_one_pooled_client() -> None:
+    http_pool.configure_http_pool(http_pool.HttpPoolConfig(max_connections=7, http2=False))
+    try:
+        client = http_pool.get_http_client()
+        assert client is http_pool.get_http_client()
+        assert client._transport._pool._max_connections == 7
+
+        first = EmbedderFactory.create("gemini", {"api_key": "test"})
+        second = EmbedderFactory.create("gemini", {"api_key": "test"})
+        assert first.client._api_client._httpx_client is client
+        assert second.client._api_client._httpx_client is client
+
+        http_pool.configure_http_pool(http_pool.HttpPoolConfig(enabled=False))
+        assert http_pool.get_http_client() is None
+    finally:
+        http_pool.configure_http_pool(http_pool.HttpPoolConfig())
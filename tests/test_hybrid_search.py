@@ -0,0 +1,39 @@
+import shutil
+
+from staged_rag.config import load_settings
+from staged_rag.service import RAGService
+
+
+def test_hybrid_search_chunk_granularity_returns_matching_passage(tmp_path) -> None:
+    service = RAGService(load_settings(root=tmp_path))
+    filler = "Vector indexes store dense embeddings for cosine similarity search. " * 30
+    text = filler + "BM25 postings lists enable keyword retrieval of exact passages. " + filler
+    doc_id = service.ingest_document("Guide", text, "test", "c", None, None, "A guide.")["doc_id"]
+
+    chunks = service.hybrid_search("postings keyword", 3, "c", 0.0, 1.0, "chunk")["results"]
+    assert chunks[0]["doc_id"] == doc_id
+    assert "postings" in chunks[0]["text"]
+    documents = service.hybrid_search("postings keyword", 3, "c", 0.0, 1.0)["results"]
+    assert documents[0]["best_chunk_index"] == chunks[0]["chunk_index"]
+
+    service.update_document(doc_id, "c", "Short replacement text.", None, None, None, None)
+    assert RAGService(load_settings(root=tmp_path))._bm25_for("c", "chunk").doc_ids() == {f"{doc_id}#0"}
+
+
+def test_bm25_reconcile_reindexes_documents_changed_after_a_lost_delta_log(tmp_path) -> None:
+    settings = load_settings(root=tmp_path)
+    doc_id = RAGService(settings).ingest_document("Guide", "Alpha content.", "test", "c", None, None, "A guide.")[
+        "doc_id"
+    ]
+    # Rebuild so the original text lives in the base segment, then lose the
+    # delta log that recorded the update.
+    shutil.rmtree(settings.storage.index_dir / "c.bm25")
+    service = RAGService(load_settings(root=tmp_path))
+    assert service._bm25_for("c").is_current(doc_id, "Guide A guide. Alpha content.")
+    service.update_document(doc_id, "c", "Zebra crossings.", None, None, None, None)
+    for log in (settings.storage.index_dir / "c.bm25").glob("delta-*.log"):
+        log.unlink()
+
+    bm25 = RAGService(load_settings(root=tmp_path))._bm25_for("c")
+    assert bm25.score_documents("zebra", [doc_id])[doc_id] > 0
+    assert bm25.score_documents("alpha", [doc_id])[doc_id] == 0
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+
+def test_server_import_defers_optional_modules() -> None:
+    code = (
+        "import sys, staged_rag.server, staged_rag.core; "
+        "print(' '.join(m for m in ('google.genai', 'staged_rag.core.kb_manager') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
+
+
+def test_core_exports_resolve_on_access() -> None:
+    import staged_rag.core as core
+    from staged_rag.core.vector_index import VectorIndex
+
+    assert core.VectorIndex is VectorIndex
+    assert "KnowledgeBaseManager" in dir(core)
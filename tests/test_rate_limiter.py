@@ -0,0 +1,25 @@
+from staged_rag.core.rate_limiter import BULK, INTERACTIVE, RateLimiter, get_rate_limiter
+
+
+def test_bulk_lane_leaves_reserve_for_interactive_requests() -> None:
+    limiter = RateLimiter(requests_per_minute=60, interactive_reserve=0.5)
+    for _ in range(30):
+        assert limiter.acquire(priority=BULK) < 0.05
+    # Bulk has used everything above the reserve; interactive is not delayed.
+    for _ in range(20):
+        assert limiter.acquire(priority=INTERACTIVE) < 0.05
+
+
+def test_token_budget_delays_requests() -> None:
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=6000, interactive_reserve=0.0)
+    assert limiter.acquire(tokens=6000, priority=INTERACTIVE) < 0.05
+    waited = limiter.acquire(tokens=50, priority=INTERACTIVE)
+    assert 0.4 < waited < 2.0
+
+
+def test_shared_limiter_keeps_limits_unless_given() -> None:
+    limiter = get_rate_limiter("test-provider", 3000, 1_000_000)
+    assert get_rate_limiter("test-provider") is limiter
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (3000, 1_000_000)
+    get_rate_limiter("test-provider", tokens_per_minute=500)
+    assert (limiter.requests_per_minute, limiter.tokens_per_minute) == (3000, 500)
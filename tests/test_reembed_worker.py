@@ -0,0 +1,40 @@
+from conftest import LengthProvider
+
+from staged_rag.config import load_settings
+from staged_rag.service import RAGService
+
+
+def test_fallback_vectors_are_reembedded_once_provider_is_back(tmp_path) -> None:
+    service = RAGService(load_settings(root=tmp_path))
+    service.embedding.provider = None
+    doc_id = service.ingest_document("Guide", "Some text to index.", "test", "c", None, None, "A guide.")["doc_id"]
+    assert service.collection_stats("c")["fallback_vectors"]["pending"] == 1
+    # Nothing to do while there is no provider.
+    assert service.reembed_worker.run_once() == 0
+
+    service.embedding.provider = LengthProvider(service.embedding.dimension)
+    assert service.reembed_worker.run_once() == 1
+    assert service.reembed_worker.run_once() == 0
+    progress = service.collection_stats("c")["fallback_vectors"]
+    assert (progress["pending"], progress["reembedded"]) == (0, 1)
+    assert RAGService(load_settings(root=tmp_path))._index_for("c").fallback_doc_ids() == []
+    assert service._index_for("c").search([1.0] * service.embedding.dimension, 1)[0][0] == doc_id
+
+
+def test_failing_collection_does_not_starve_the_others(tmp_path) -> None:
+    class _PickyProvider(LengthProvider):
+        def embed_batch(self, texts: list[str]) -> list[list[float]]:
+            if any("Broken" in text for text in texts):
+                raise RuntimeError("400 invalid input")
+            return super().embed_batch(texts)
+
+    (tmp_path / "config.yaml").write_text("embedding:\n  max_retries: 0\n")
+    service = RAGService(load_settings(root=tmp_path))
+    service.embedding.provider = None
+    service.ingest_document("Broken", "Some text.", "test", "a", None, None, "Broken summary.")
+    service.ingest_document("Guide", "Some text.", "test", "b", None, None, "A guide.")
+
+    service.embedding.provider = _PickyProvider(service.embedding.dimension)
+    assert service.reembed_fallbacks() == 1
+    assert service.collection_stats("a")["fallback_vectors"]["pending"] == 1
+    assert service.collection_stats("b")["fallback_vectors"]["pending"] == 0
@@ -0,0 +1,24 @@
+from staged_rag.core.resilience import backoff_delay, is_rate_limit_error, retry_after_seconds
+
+
+def test_retry_after_is_read_from_headers_and_messages() -> None:
+    class Response:
+        headers = {"retry-after": "7"}
+
+    class HTTPError(Exception):
+        status_code = 429
+        response = Response()
+
+    assert is_rate_limit_error(HTTPError("slow down"))
+    assert retry_after_seconds(HTTPError("slow down")) == 7.0
+    assert retry_after_seconds(RuntimeError("RESOURCE_EXHAUSTED {'retryDelay': '12s'}")) == 12.0
+    assert retry_after_seconds(RuntimeError("Please retry in 250ms")) == 0.25
+    assert retry_after_seconds(RuntimeError("connection reset")) is None
+    assert not is_rate_limit_error(RuntimeError("connection reset"))
+
+
+def test_backoff_delay_is_jittered_and_capped() -> None:
+    delays = [backoff_delay(attempt, 0.5, 4.0) for attempt in range(10) for _ in range(20)]
+    assert all(0.0 <= delay <= 4.0 for delay in delays)
+    assert backoff_delay(0, 0.5, 4.0, retry_after=3.0) >= 3.0
+    assert backoff_delay(0, 0.5, 4.0, retry_after=60.0) == 4.0
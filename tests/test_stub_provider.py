@@ -0,0 +1,29 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from staged_rag.bench.stub_provider import StubConfig, StubEmbeddingServer
+from staged_rag.utils import deterministic_vector
+
+
+def _post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_stub_provider_serves_deterministic_embeddings() -> None:
+    with StubEmbeddingServer() as server:
+        body = _post(f"{server.base_url}/embeddings", {"input": ["a", "b"], "model": "m", "dimensions": 8})
+        assert [item["embedding"] for item in body["data"]] == [deterministic_vector(t, 8).tolist() for t in "ab"]
+        assert server.stats.snapshot()["texts"] == 2
+
+
+def test_stub_provider_injects_rate_limits() -> None:
+    with StubEmbeddingServer(config=StubConfig(rate_limit_rate=1.0, retry_after=3)) as server:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _post(f"{server.base_url}/embeddings", {"input": "a"})
+        assert excinfo.value.code == 429
+        assert excinfo.value.headers["Retry-After"] == "3"
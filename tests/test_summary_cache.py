@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from staged_rag.core import embeddings as engine_module
+from staged_rag.core.summary_cache import SummaryCache
+from staged_rag.core.summary_generator import SummaryGenerator
+
+
+def test_generated_summaries_are_cached_by_content(tmp_path, monkeypatch) -> None:
+    prompts: list[str] = []
+    failing = False
+
+    def generate_content(model: str, contents: str) -> SimpleNamespace:
+        prompts.append(contents)
+        if failing:
+            raise RuntimeError("503 unavailable")
+        return SimpleNamespace(text=f" Summary {len(prompts)}. ")
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    monkeypatch.setattr(engine_module, "_get_genai_client", lambda api_key: client)
+
+    summarizer = SummaryGenerator("key", "model-a", 4, cache=SummaryCache(tmp_path / "summaries.sqlite3"))
+    assert summarizer.summarize("Alpha text.") == "Summary 1."
+    assert summarizer.summarize("  Alpha text.\n") == "Summary 1."
+    assert len(prompts) == 1
+
+    # Fallback summaries are not cached: the LLM is asked again later.
+    failing = True
+    assert not summarizer.summarize("Beta text.").startswith("Summary")
+    failing = False
+    assert summarizer.summarize("Beta text.") == "Summary 3."
+
+    # A blocked response has no text and is neither returned nor cached.
+    client.models.generate_content = lambda model, contents: SimpleNamespace(text=None)
+    assert summarizer.generate("Delta text.") is None
+    assert summarizer.summarize("Delta text.") != "None"
+    assert summarizer.cached("Delta text.") is None
+    client.models.generate_content = generate_content
+
+    # Persistent across restarts; the model is part of the key.
+    reopened = SummaryCache(tmp_path / "summaries.sqlite3")
+    assert SummaryGenerator("key", "model-a", 4, cache=reopened).summarize("Alpha text.") == "Summary 1."
+    assert SummaryGenerator("key", "model-b", 4, cache=reopened).summarize("Alpha text.") == "Summary 4."
+    assert reopened.stats()["hits"] == 1
@@ -1,6 +1,16 @@
+import pytest
+
+from staged_rag import service as service_module
+from staged_rag.config import load_settings
 from staged_rag.tools import ingest_document, list_collections, search_summaries
 
 
+@pytest.fixture(autouse=True)
+def _isolated_service(tmp_path, monkeypatch) -> None:
+    # Keep caches, stores and the audit log out of the repository's data/.
+    monkeypatch.setattr(service_module, "_service", service_module.RAGService(load_settings(root=tmp_path)))
+
+
 def test_tools_can_be_imported() -> None:
     response = search_summaries("query")
     assert isinstance(response, dict)
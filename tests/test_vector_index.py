@@ -1,3 +1,5 @@
+import numpy as np
+
 from staged_rag.core.vector_index import VectorIndex
 
 
@@ -8,3 +10,16 @@ def test_vector_index_upsert_and_search(tmp_path) -> None:
     index.upsert("doc-2", [0.3, 0.4])
     results = index.search([0.0, 0.0], top_k=1)
     assert results
+
+
+def test_vector_index_persists_fallback_flags(tmp_path) -> None:
+    index_path = tmp_path / "index.npz"
+    index = VectorIndex(index_path)
+    index.upsert("doc-1", [0.1, 0.2], fallback=True)
+    index.upsert("doc-2", [0.3, 0.4], fallback=True)
+    index.upsert("doc-2", [0.5, 0.6])
+    assert VectorIndex(index_path).fallback_doc_ids() == ["doc-1"]
+
+    # Indexes saved before fallback tracking load with no flags.
+    np.savez_compressed(index_path, doc_ids=np.array(["doc-1"]), vectors=np.array([[0.1, 0.2]]))
+    assert VectorIndex(index_path).fallback_doc_ids() == []